@@ -135,6 +135,7 @@ public function store(Request $request)
                     'success' => true,
                     'operation' => 'skipped',
                     'message' => 'Order already fully processed',
+                    'pending_location' => false,
                 ]);
             }
 
@@ -168,6 +169,7 @@ public function store(Request $request)
                         'success' => true,
                         'operation' => 'skipped',
                         'message' => 'Order already exists: ' . $duplicateOrder->order_number,
+                        'pending_location' => false,
                     ]);
                 }
             }
@@ -217,10 +219,17 @@ public function store(Request $request)
                     'total_amount' => $validated['total_amount'] ?? 0,
                 ]);
 
+                // Until the order is converted (location found), the scraper keeps re-posting it so
+                // saveScrapedOrder() retries the WhatsApp/webhook location lookup
+                $convertedOrderId = DB::table('zyda_orders')
+                    ->where('zyda_order_key', $normalizedKey)
+                    ->value('order_id');
+
                 return response()->json([
                     'success' => true,
                     'operation' => 'created',
                     'message' => 'Order saved successfully',
+                    'pending_location' => empty($convertedOrderId),
                 ]);
             } catch (\Exception $serviceException) {
                 Log::error('❌ Exception in OrderSyncService::saveScrapedOrder', [
@@ -257,6 +266,116 @@ public function store(Request $request)
         }
     }
 
+    /**
+     * Store several scraped orders in one request (used by the scraper's --batch-size mode).
+     * Every order goes through store() unchanged; results are returned in request order.
+     */
+    public function storeBatch(Request $request)
+    {
+        $validated = $request->validate([
+            'orders' => 'required|array|min:1|max:100',
+            'orders.*' => 'required|array',
+        ]);
+
+        Log::info('📥 Zyda order batch received via API', [
+            'ip' => $request->ip(),
+            'count' => count($validated['orders']),
+        ]);
+
+        $results = [];
+        foreach ($validated['orders'] as $order) {
+            $zydaOrderKey = $order['zyda_order_key'] ?? null;
+
+            try {
+                $response = $this->store(new Request($order));
+                $data = $response->getData(true);
+                $results[] = [
+                    'zyda_order_key' => $zydaOrderKey,
+                    'operation' => $response->isSuccessful() ? ($data['operation'] ?? 'created') : 'failed',
+                    'message' => $data['message'] ?? ($data['error'] ?? null),
+                    'pending_location' => $data['pending_location'] ?? true,
+                ];
+            } catch (ValidationException $e) {
+                $results[] = [
+                    'zyda_order_key' => $zydaOrderKey,
+                    'operation' => 'failed',
+                    'message' => collect($e->errors())->flatten()->first(),
+                ];
+            }
+        }
+
+        return response()->json([
+            'success' => true,
+            'results' => $results,
+        ]);
+    }
+
+    /**
+     * Apply the fields that changed since the scraper's last delivery of an order.
+     * Only the columns present in the request are written, then OrderSyncService runs the same
+     * location lookup and push to Orders as a full POST. Orders already converted to an Order
+     * are skipped like in store(). Answers 404 when the order is unknown so the scraper falls
+     * back to a full POST.
+     */
+    public function updateDelta(Request $request, string $zydaOrderKey)
+    {
+        $validated = $request->validate([
+            'name' => 'sometimes|nullable|string|max:255',
+            'phone' => 'sometimes|required|string|max:50',
+            'address' => 'sometimes|nullable|string|max:500',
+            'location' => 'sometimes|nullable|string|max:2048',
+            'total_amount' => 'sometimes|nullable|numeric|min:0',
+            'items' => 'sometimes|nullable|array',
+        ]);
+
+        $normalizedKey = ltrim($zydaOrderKey, "# \t\n\r\0\x0B");
+
+        $existingOrder = DB::table('zyda_orders')
+            ->where('zyda_order_key', $normalizedKey)
+            ->first();
+
+        if (!$existingOrder) {
+            return response()->json([
+                'success' => false,
+                'operation' => 'failed',
+                'message' => 'Zyda order not found',
+            ], 404);
+        }
+
+        if (!empty($existingOrder->order_id)) {
+            return response()->json([
+                'success' => true,
+                'operation' => 'skipped',
+                'message' => 'Order already fully processed',
+                'pending_location' => false,
+            ]);
+        }
+
+        if (!$this->orderSyncService->updateScrapedOrder($normalizedKey, $validated)) {
+            return response()->json([
+                'success' => false,
+                'operation' => 'failed',
+                'message' => 'Failed to update Zyda order',
+            ], 500);
+        }
+
+        Log::info('🔄 Zyda order delta applied', [
+            'zyda_order_key' => $normalizedKey,
+            'fields' => array_keys($validated),
+        ]);
+
+        $convertedOrderId = DB::table('zyda_orders')
+            ->where('zyda_order_key', $normalizedKey)
+            ->value('order_id');
+
+        return response()->json([
+            'success' => true,
+            'operation' => 'updated',
+            'message' => 'Order updated successfully',
+            'pending_location' => empty($convertedOrderId),
+        ]);
+    }
+
     public function updateLocation(Request $request, $id)
     {
         // CRITICAL: Log entry point to verify function is called
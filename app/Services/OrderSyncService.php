@@ -163,6 +163,50 @@ public function saveScrapedOrder(array $orderData): bool
         return $result;
     }
 
+    /**
+     * Apply the fields of an existing scraped order that changed since the scraper last sent it,
+     * then run the same location lookup and push to Orders as saveScrapedOrder().
+     * Returns false when the order does not exist.
+     */
+    public function updateScrapedOrder(string $zydaOrderKey, array $changes): bool
+    {
+        $zydaOrderKey = ltrim($zydaOrderKey, "# \t\n\r\0\x0B");
+
+        $existingOrder = DB::table('zyda_orders')
+            ->where('zyda_order_key', $zydaOrderKey)
+            ->first();
+
+        if (!$existingOrder) {
+            return false;
+        }
+
+        $columns = array_intersect_key(
+            $changes,
+            array_flip(['name', 'phone', 'address', 'location', 'total_amount', 'items'])
+        );
+        if (array_key_exists('items', $columns)) {
+            $columns['items'] = json_encode($columns['items'] ?? []);
+        }
+        if (array_key_exists('total_amount', $columns)) {
+            $columns['total_amount'] = (float) ($columns['total_amount'] ?? 0);
+        }
+
+        if (!empty($columns)) {
+            $columns['updated_at'] = Carbon::now();
+            DB::table('zyda_orders')
+                ->where('id', $existingOrder->id)
+                ->update($columns);
+        }
+
+        // Same existing-record flow as a full POST: WhatsApp location, webhook fallback, push to Orders
+        return $this->saveScrapedOrder([
+            'name' => $changes['name'] ?? $existingOrder->name,
+            'phone' => $changes['phone'] ?? $existingOrder->phone,
+            'location' => $changes['location'] ?? $existingOrder->location,
+            'zyda_order_key' => $zydaOrderKey,
+        ]);
+    }
+
     /**
      * Fetch location data from webhook and update zyda_orders table
      */
@@ -303,7 +303,7 @@ protected function isCommandNotFound(ProcessFailedException $e): bool
     protected function parseSummary(string $output): ?array
     {
         if (preg_match_all(
-            '/SUMMARY\\s+created=(\\d+)\\s+updated=(\\d+)\\s+skipped=(\\d+)\\s+failed=(\\d+)/i',
+            '/SUMMARY\\s+created=(\\d+)\\s+updated=(\\d+)\\s+skipped=(\\d+)\\s+failed=(\\d+)(?:\\s+suppressed=(\\d+))?/i',
             $output,
             $matches,
             PREG_SET_ORDER
@@ -315,6 +315,7 @@ protected function parseSummary(string $output): ?array
                 'updated' => (int) $last[2],
                 'skipped' => (int) $last[3],
                 'failed' => (int) $last[4],
+                'suppressed' => (int) ($last[5] ?? 0),
             ];
         }
 
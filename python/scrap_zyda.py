@@ -1,25 +1,50 @@
 import argparse
+import base64
+import fnmatch
+import hashlib
 import json
+import multiprocessing
 import os
+import queue
 import re
+import shutil
+import signal
+import sqlite3
+import subprocess
 import sys
+import threading
 import time
-from typing import Dict, List, Optional
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from email.utils import parsedate_to_datetime
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import quote
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.common.by import By
+from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.common.exceptions import (
     ElementClickInterceptedException,
     StaleElementReferenceException,
     TimeoutException,
+    WebDriverException,
 )
 from webdriver_manager.chrome import ChromeDriverManager
 
+try:
+    # Only needed for the "html" extraction mode
+    from lxml import html as lxml_html
+    from lxml.cssselect import CSSSelector
+except ImportError:
+    lxml_html = None
+
 SITE_URL = "https://dash.zyda.com/sign-in"
 ORDERS_URL = (
     "https://dash.zyda.com/5617/orders/current"
@@ -29,7 +54,76 @@ ORDERS_URL = (
 # API endpoint - use environment variable or default to local URL for development
 # For production, set ZYDA_API_ENDPOINT environment variable
 API_ENDPOINT = os.getenv("ZYDA_API_ENDPOINT", "https://advfoodapp.clarastars.com/api/zyda/orders")
+# Bulk endpoint for --batch-size > 1; sync_orders() falls back to one POST per order without it
+API_BATCH_ENDPOINT = os.getenv("ZYDA_API_BATCH_ENDPOINT", API_ENDPOINT.rstrip("/") + "/batch")
+BATCH_SIZE = int(os.getenv("ZYDA_BATCH_SIZE", "1"))
+# PATCH only the fields that changed since an order's last delivery to API_ENDPOINT/{key}
+# (falls back to the full POST when there is no snapshot or the server rejects the delta)
+DELTA_UPDATES = os.getenv("ZYDA_DELTA_UPDATES", "1") == "1"
+# Orders queued between scraping and a background API sender (0 = deliver inline)
+DELIVERY_QUEUE_SIZE = int(os.getenv("ZYDA_DELIVERY_QUEUE", "0"))
+# Orders POSTed at the same time by the delivery senders and sync_orders() (1 = one after another)
+SYNC_CONCURRENCY = int(os.getenv("ZYDA_SYNC_CONCURRENCY", "1"))
+# Shared keep-alive connection pool for Laravel API calls
+API_POOL_SIZE = int(os.getenv("ZYDA_API_POOL_SIZE", "4"))
+API_TIMEOUT_SECONDS = 30
+# Retries for connection failures; the endpoint upserts by zyda_order_key, so re-sending a POST
+# is safe. Error responses (5xx, 429) are not retried in place: the circuit breaker and the
+# outbox own the backoff for those
+API_RETRIES = 2
+# Circuit breaker around the API: it opens after this many consecutive failed (or slower than
+# API_SLOW_SECONDS) requests, fails deliveries fast into the outbox while open, and lets a single
+# probe through after the cooldown, which doubles on every failed probe up to the maximum
+BREAKER_FAILURE_THRESHOLD = int(os.getenv("ZYDA_BREAKER_FAILURES", "5"))
+API_SLOW_SECONDS = float(os.getenv("ZYDA_API_SLOW_SECONDS", "10"))
+BREAKER_COOLDOWN_SECONDS = float(os.getenv("ZYDA_BREAKER_COOLDOWN_SECONDS", "30"))
+BREAKER_COOLDOWN_MAX_SECONDS = 5 * 60
 LOOP_INTERVAL_SECONDS = 60
+# In --loop mode, watch the orders tab between sweeps and sync new orders as soon as they appear;
+# the sweep every LOOP_INTERVAL_SECONDS then only reconciles what the watcher missed.
+PUSH_DETECTION = os.getenv("ZYDA_PUSH_DETECTION", "0") == "1"
+# Longest single in-page wait; keeps each WebDriver call well under its HTTP read timeout
+PUSH_WAIT_CHUNK_SECONDS = 30
+# Warm browser (--loop mode): recycle Chrome after this many cycles or when its JS heap grows too large
+BROWSER_MAX_CYCLES = int(os.getenv("ZYDA_BROWSER_MAX_CYCLES", "240"))
+BROWSER_MAX_HEAP_MB = int(os.getenv("ZYDA_BROWSER_MAX_HEAP_MB", "512"))
+# Number of parallel browser workers used to open order details (1 = sequential, as before)
+DETAIL_CONCURRENCY = int(os.getenv("ZYDA_DETAIL_CONCURRENCY", "1"))
+# Number of worker processes (each with its own Chrome) to shard order extraction across (--workers)
+SHARD_WORKERS = int(os.getenv("ZYDA_SHARD_WORKERS", "1"))
+SHARD_TIMEOUT_SECONDS = 480  # Must stay below ZydaScriptRunner's 600s process timeout
+# How to get back to the orders list after reading an order: "in-place" closes the details in the
+# app (drawer close / history back) and only reloads on failure; "reload" reloads the list every time
+NAVIGATION_MODE = os.getenv("ZYDA_NAVIGATION_MODE", "in-place")
+SEEN_ORDERS_FILE = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)),
+    "zyda_seen_orders.json",
+)
+SEEN_ORDERS_TTL_SECONDS = 2 * 24 * 60 * 60
+# Deliveries update the seen-order index in memory; the file is rewritten at most this often
+# (and at the end of every cycle)
+SEEN_ORDERS_SAVE_INTERVAL_SECONDS = int(os.getenv("ZYDA_SEEN_ORDERS_SAVE_INTERVAL", "30"))
+# Orders Laravel has not converted yet (still waiting for a WhatsApp/webhook location) are
+# re-opened and re-posted at most this often, since each POST retries the location lookup
+PENDING_REPOST_SECONDS = int(os.getenv("ZYDA_PENDING_REPOST_SECONDS", "300"))
+# A POST is suppressed while the order's canonical payload hash matches its last successful
+# delivery and that delivery is younger than this
+DIGEST_TTL_SECONDS = int(os.getenv("ZYDA_DIGEST_TTL_SECONDS", str(6 * 60 * 60)))
+# Set ZYDA_FULL_SWEEP=1 (or --full-sweep) to open every card regardless of the seen-order index
+# (payload digests are still checked before posting)
+FULL_SWEEP = os.getenv("ZYDA_FULL_SWEEP", "0") == "1"
+# Durable outbox: every order payload is stored before it is POSTed and retried with backoff
+# (also across restarts) until Laravel accepts it. ZYDA_OUTBOX=0 turns it off.
+OUTBOX_ENABLED = os.getenv("ZYDA_OUTBOX", "1") == "1"
+OUTBOX_FILE = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)),
+    "zyda_outbox.sqlite3",
+)
+OUTBOX_MAX_ATTEMPTS = 10
+OUTBOX_BACKOFF_SECONDS = 30
+OUTBOX_BACKOFF_MAX_SECONDS = 60 * 60
+OUTBOX_DRAIN_LIMIT = 50
+OUTBOX_RETENTION_SECONDS = 7 * 24 * 60 * 60
 PROCESSED_PHONES_FILE = os.path.join(
     os.path.dirname(os.path.abspath(__file__)),
     "processed_zyda_phones.json",
@@ -38,6 +132,18 @@ SESSION_COOKIES_FILE = os.path.join(
     os.path.dirname(os.path.abspath(__file__)),
     "zyda_session_cookies.json",
 )
+# Pinned chromedriver path + the Chrome version it was resolved for (avoids a network lookup per start)
+DRIVER_CACHE_FILE = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)),
+    "chromedriver_cache.json",
+)
+CHROME_BINARY_CANDIDATES = [
+    "google-chrome",
+    "google-chrome-stable",
+    "chromium",
+    "chromium-browser",
+    "/Applications/Google Chrome.app/Contents/MacOS/Google Chrome",
+]
 
 INTERACTION_DELAY = 0.01  # Minimal delay for fastest execution
 
@@ -68,11 +174,351 @@ TOTAL_VALUE_SELECTOR = (
     ".//p[contains(@class,'heading16_')][contains(text(),'SAR')]"
 )
 ORDER_ITEM_SELECTOR = ".flex.gap-2"
+# Reads label, order key and a text fingerprint of every card in a single round trip.
+# Mirrors _get_card_label() / _get_zyda_order_key(); arguments[0] is a selector or a list of cards.
+CARD_LIST_SCRIPT = """
+var source = arguments[0];
+var cards = typeof source === 'string'
+    ? Array.prototype.slice.call(document.querySelectorAll(source))
+    : Array.prototype.slice.call(source);
+function clean(text) { return (text || '').replace(/\\s+/g, ' ').trim(); }
+function fingerprint(text) {
+    var hash = 0x811c9dc5;
+    for (var i = 0; i < text.length; i++) {
+        hash ^= text.charCodeAt(i);
+        hash = Math.imul(hash, 0x01000193) >>> 0;
+    }
+    return ('0000000' + hash.toString(16)).slice(-8);
+}
+// Elapsed-time labels ("5 mins", "1 hour") change every minute and must not affect the fingerprint
+var volatile = /\\b\\d+\\s*(secs?|seconds?|mins?|minutes?|hrs?|hours?|days?)(\\s+ago)?\\b|\\d+\\s*(ثانية|ثواني|دقيقة|دقائق|ساعة|ساعات|يوم|أيام)|just now|الآن/gi;
+return cards.map(function (card, index) {
+    var text = card.innerText || '';
+    var label = null;
+    var header = card.querySelector("p[class*='heading16_'], p[class*='heading14_']");
+    if (header && clean(header.innerText)) {
+        label = clean(header.innerText);
+    }
+    if (!label) {
+        var lines = text.split('\\n').map(clean).filter(Boolean);
+        label = lines.length ? lines[0] : null;
+    }
+    if (!label && card.parentElement) {
+        var headings = card.parentElement.querySelectorAll("p[class*='heading']");
+        for (var h = 0; h < headings.length && !label; h++) {
+            label = clean(headings[h].innerText) || null;
+        }
+    }
+    var key = null;
+    var keyElements = card.querySelectorAll("[class*='element14_']");
+    for (var k = 0; k < keyElements.length; k++) {
+        var keyText = clean(keyElements[k].innerText);
+        if (keyText.charAt(0) === '#') {
+            key = keyText;
+            break;
+        }
+    }
+    if (!key) {
+        key = card.id || card.getAttribute('data-order-id') || card.getAttribute('data-id') || null;
+    }
+    return {index: index, label: label, key: key, fingerprint: fingerprint(clean(text.replace(volatile, ''))), element: card};
+});
+"""
+# Reads an opened order in one round trip; mirrors _safe_text(), _collect_total() and _collect_items().
+# Bump DETAIL_SCRIPT_VERSION whenever the returned shape changes.
+DETAIL_SCRIPT_VERSION = 1
+DETAIL_SCRIPT = """
+var phoneXPath = arguments[0], addressXPath = arguments[1], itemSelector = arguments[2];
+function clean(text) { return (text || '').trim(); }
+function visible(el) { return !!el && el.getClientRects().length > 0; }
+function xpathAll(path, context) {
+    var result = document.evaluate(path, context || document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+    var nodes = [];
+    for (var i = 0; i < result.snapshotLength; i++) { nodes.push(result.snapshotItem(i)); }
+    return nodes;
+}
+function firstVisibleText(path) {
+    var nodes = xpathAll(path);
+    for (var i = 0; i < nodes.length; i++) {
+        if (visible(nodes[i])) { return clean(nodes[i].innerText) || null; }
+    }
+    return null;
+}
+function isAmount(text) { return text.indexOf('SAR') !== -1 && /\\d/.test(text); }
+function total() {
+    var exact = xpathAll("//p[contains(@class, 'heading16_2tUu6') and contains(text(), 'SAR')]");
+    if (exact.length && isAmount(clean(exact[0].innerText))) { return clean(exact[0].innerText); }
+    var headings = xpathAll("//p[contains(@class, 'heading16_') and contains(text(), 'SAR')]");
+    if (headings.length && isAmount(clean(headings[headings.length - 1].innerText))) {
+        return clean(headings[headings.length - 1].innerText);
+    }
+    var containers = xpathAll("//div[contains(@class,'w-full') and contains(@style,'direction: ltr')]").reverse();
+    for (var c = 0; c < containers.length; c++) {
+        var rows = xpathAll(".//div[contains(@class,'flex') and contains(@class,'justify-between')]", containers[c]);
+        for (var r = 0; r < rows.length; r++) {
+            var labels = xpathAll(".//p[contains(@class,'heading16_') or contains(text(),'Total')]", rows[r]);
+            var values = xpathAll(".//p[contains(@class,'heading16_')][contains(text(),'SAR')]", rows[r]);
+            if (labels.length && values.length) {
+                var label = clean(labels[0].innerText).toLowerCase();
+                var value = clean(values[values.length - 1].innerText);
+                if (label && label.indexOf('subtotal') === -1 && label.indexOf('total') !== -1 && value) { return value; }
+            }
+        }
+    }
+    var totalLabel = xpathAll("//p[text()[contains(.,'Total')] and not(contains(.,'Subtotal'))]")[0];
+    if (totalLabel) {
+        var sibling = xpathAll("following::p[contains(text(),'SAR')][1]", totalLabel)[0];
+        if (sibling) { return clean(sibling.innerText); }
+    }
+    return null;
+}
+var itemRows = Array.prototype.map.call(document.querySelectorAll(itemSelector), function (row) {
+    return row.innerText || '';
+});
+return {
+    version: %d,
+    phone: firstVisibleText(phoneXPath),
+    address: firstVisibleText(addressXPath),
+    total: total(),
+    item_rows: itemRows
+};
+""" % DETAIL_SCRIPT_VERSION
+ORDER_DETAILS_CLOSE_SELECTORS = [
+    "div[role='presentation'] button[aria-label='Close']",
+    "div[role='presentation'] [data-testid='close-button']",
+    ".ant-drawer-close",
+    ".ant-modal-close",
+]
+# Event-driven waits: a MutationObserver resolves as soon as one of the selectors matches, then
+# waits until the DOM has been quiet for WAIT_SETTLE_MS so a half-rendered list is not read.
+WAIT_SETTLE_MS = int(os.getenv("ZYDA_WAIT_SETTLE_MS", "150"))
+# An empty-state text (antd also shows "No data" while the list is loading) only counts once
+# no card has rendered for this long after it
+EMPTY_CONFIRM_SECONDS = float(os.getenv("ZYDA_EMPTY_CONFIRM_SECONDS", "2"))
+DOM_WAIT_SCRIPT = """
+var selectors = arguments[0], timeoutMs = arguments[1], settleMs = arguments[2];
+var emptyTexts = arguments[3] || [];
+var done = arguments[arguments.length - 1];
+var started = Date.now(), finished = false, settleTimer = null, observer = null;
+function count(selector) {
+    if (selector.charAt(0) === '/' || selector.charAt(0) === '(') {
+        return document.evaluate(selector, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null).snapshotLength;
+    }
+    return document.querySelectorAll(selector).length;
+}
+function match() {
+    for (var i = 0; i < selectors.length; i++) {
+        try {
+            var n = count(selectors[i]);
+            if (n > 0) { return {selector: selectors[i], count: n}; }
+        } catch (e) {}
+    }
+    return null;
+}
+function emptyState() {
+    var text = ((document.body && document.body.innerText) || '').toLowerCase();
+    for (var i = 0; i < emptyTexts.length; i++) {
+        if (text.indexOf(emptyTexts[i]) !== -1) { return {selector: null, count: 0, empty: emptyTexts[i]}; }
+    }
+    return null;
+}
+function settled() { return match() || emptyState(); }
+function finish(result) {
+    if (finished) { return; }
+    finished = true;
+    if (observer) { observer.disconnect(); }
+    clearTimeout(settleTimer);
+    result = result || {selector: null, count: 0};
+    result.ms = Date.now() - started;
+    done(result);
+}
+function check() {
+    if (!settled()) { return; }
+    clearTimeout(settleTimer);
+    settleTimer = setTimeout(function () { finish(settled()); }, settleMs);
+}
+observer = new MutationObserver(check);
+observer.observe(document.documentElement, {childList: true, subtree: true, attributes: true});
+setTimeout(function () { finish(settled()); }, timeoutMs);
+check();
+"""
+# Tags that start a new line in innerText; used to approximate it when parsing saved HTML
+HTML_BLOCK_TAGS = {
+    "address", "article", "br", "div", "footer", "h1", "h2", "h3", "h4", "h5", "h6",
+    "header", "li", "ol", "p", "section", "table", "tr", "ul",
+}
+HTML_SKIP_TAGS = {"script", "style", "noscript", "template"}
+# Same pattern as the one in CARD_LIST_SCRIPT
+VOLATILE_TEXT_PATTERN = re.compile(
+    r"\b\d+\s*(secs?|seconds?|mins?|minutes?|hrs?|hours?|days?)(\s+ago)?\b"
+    r"|\d+\s*(ثانية|ثواني|دقيقة|دقائق|ساعة|ساعات|يوم|أيام)|just now|الآن",
+    re.IGNORECASE,
+)
+# Installs a MutationObserver on the orders tab that queues order keys not seen at install time.
+# Idempotent per page load; ORDER_WATCH_WAIT_SCRIPT hands the queued keys to Python.
+ORDER_WATCH_VERSION = 1
+ORDER_WATCH_INSTALL_SCRIPT = """
+var cardSelector = arguments[0], keySelector = arguments[1], version = arguments[2];
+if (window.__zydaOrderWatch && window.__zydaOrderWatch.version === version) { return false; }
+function keys() {
+    var found = [];
+    var cards = document.querySelectorAll(cardSelector);
+    for (var c = 0; c < cards.length; c++) {
+        var elements = cards[c].querySelectorAll(keySelector);
+        for (var k = 0; k < elements.length; k++) {
+            var text = (elements[k].innerText || '').trim();
+            if (text.charAt(0) === '#') { found.push(text); break; }
+        }
+    }
+    return found;
+}
+var watch = window.__zydaOrderWatch = {version: version, known: {}, pending: [], notify: null};
+keys().forEach(function (key) { watch.known[key] = true; });
+var scheduled = false;
+watch.observer = new MutationObserver(function () {
+    // Coalesce a burst of mutations (one re-render) into a single scan
+    if (scheduled) { return; }
+    scheduled = true;
+    setTimeout(function () {
+        scheduled = false;
+        keys().forEach(function (key) {
+            if (!watch.known[key]) {
+                watch.known[key] = true;
+                watch.pending.push({key: key, at: Date.now()});
+            }
+        });
+        if (watch.pending.length && watch.notify) { watch.notify(); }
+    }, 100);
+});
+watch.observer.observe(document.body, {childList: true, subtree: true, characterData: true});
+return true;
+"""
+ORDER_WATCH_WAIT_SCRIPT = """
+var timeoutMs = arguments[0], done = arguments[arguments.length - 1];
+var watch = window.__zydaOrderWatch;
+if (!watch) { done(null); return; }
+var timer = null;
+function flush() {
+    clearTimeout(timer);
+    watch.notify = null;
+    var events = watch.pending;
+    watch.pending = [];
+    done(events);
+}
+if (watch.pending.length) { flush(); return; }
+watch.notify = flush;
+timer = setTimeout(flush, timeoutMs);
+"""
+# Scrolls the orders list (its nearest scrollable ancestor, else the window) down by most of a
+# viewport so the next chunk of a lazily rendered list is mounted.
+LIST_SCROLL_SCRIPT = """
+var cards = document.querySelectorAll(arguments[0]);
+if (!cards.length) { return false; }
+var node = cards[cards.length - 1].parentElement;
+while (node && node !== document.body) {
+    var overflow = getComputedStyle(node).overflowY;
+    if ((overflow === 'auto' || overflow === 'scroll') && node.scrollHeight > node.clientHeight) { break; }
+    node = node.parentElement;
+}
+var scroller = node && node !== document.body ? node : (document.scrollingElement || document.documentElement);
+var before = scroller.scrollTop;
+scroller.scrollTop = before + Math.max(scroller.clientHeight * 0.8, 200);
+return scroller.scrollTop > before;
+"""
+# Scrolls in a row that cannot move the list any further (and reveal no new order key) before
+# the list counts as fully walked; scrolls past already visited cards do not count
+LIST_MAX_IDLE_SCROLLS = 2
+# Order card selectors raced together by wait_for_cards(); the one that last matched is moved first
+CARD_SELECTORS = [
+    ORDERS_CONTAINER_SELECTOR,
+    ".mb-4.rounded-md",  # More flexible selector
+    "[class*='mb-4'][class*='rounded']",  # Even more flexible
+    ".order-card",  # Alternative selector
+    "div[class*='rounded'][class*='mb-4']",  # Another variation
+]
+# Page texts (lower-case) that mean the orders list is legitimately empty
+NO_ORDERS_INDICATORS = [
+    "no orders",
+    "لا توجد طلبات",
+    "لا يوجد طلبات",
+    "no data",
+]
 # Unique order identifier class pattern (the unique part changes for each order)
 # e.g., element14_McQXd, element14_ABC123, etc.
 ZYDA_ORDER_KEY_SELECTOR = "[class*='element14_']"  # Search for any element with element14_ in class
 
+# Extraction mode: "dom" scrapes the rendered page, "network" reads the dashboard's own API JSON
+# (captured from Chrome's performance log) and falls back to the DOM per order, "html" grabs
+# driver.page_source once and parses it in-process with lxml (falls back to the DOM per order).
+EXTRACTION_MODE = os.getenv("ZYDA_EXTRACTION_MODE", "dom")
+# Fetch mode: "browser" always drives Chrome; "http" replays the dashboard API requests recorded in
+# network mode with the saved session cookies, and only falls back to Chrome when that fails.
+FETCH_MODE = os.getenv("ZYDA_FETCH_MODE", "browser")
+# Request blocking via CDP Network.setBlockedURLs ("*" wildcards). ZYDA_BLOCK_URLS adds patterns,
+# ZYDA_ALLOW_URLS removes any blocklist pattern it matches; ZYDA_REQUEST_BLOCKING=0 turns it off.
+REQUEST_BLOCKING = os.getenv("ZYDA_REQUEST_BLOCKING", "1") == "1"
+BLOCKED_URL_PATTERNS = [
+    # Fonts and media
+    "*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot",
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.ico", "*.mp4", "*.webm",
+    "*images.zyda.co*",
+    # Analytics, tracking pixels and chat/announcement widgets
+    "*googletagmanager.com*", "*google-analytics.com*", "*doubleclick.net*",
+    "*connect.facebook.net*", "*facebook.com/tr*", "*analytics.tiktok.com*", "*snap.licdn.com*",
+    "*hotjar.com*", "*clarity.ms*", "*fullstory.com*", "*mixpanel.com*", "*amplitude.com*",
+    "*segment.io*", "*segment.com*", "*sentry.io*", "*getbeamer.com*", "*intercom.io*",
+    "*intercomcdn.com*", "*widget.freshworks.com*", "*zdassets.com*",
+] + [p.strip() for p in os.getenv("ZYDA_BLOCK_URLS", "").split(",") if p.strip()]
+ALLOWED_URL_PATTERNS = [p.strip() for p in os.getenv("ZYDA_ALLOW_URLS", "").split(",") if p.strip()]
+BLOCKED_BYTES_ESTIMATES = {
+    "Font": 40_000,
+    "Image": 20_000,
+    "Media": 200_000,
+    "Script": 60_000,
+    "Stylesheet": 20_000,
+    "XHR": 2_000,
+    "Fetch": 2_000,
+    "Ping": 500,
+}
+API_REQUESTS_FILE = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)),
+    "zyda_api_requests.json",
+)
+CAPTURE_URL_PATTERNS = ("graphql", "/orders", "/order/")
+ORDER_KEY_PATTERN = re.compile(r"^#?[A-Z0-9]{4}-[A-Z0-9]{4}$", re.IGNORECASE)
+# An order number embedded in a recorded request (URL or GraphQL variables)
+ORDER_KEY_IN_TEXT_PATTERN = re.compile(r"(?<![A-Z0-9-])[A-Z0-9]{4}-[A-Z0-9]{4}(?![A-Z0-9-])", re.IGNORECASE)
+# Stands in for the order number in the recorded detail request
+ORDER_KEY_PLACEHOLDER = "{order_key}"
+ORDER_NUMBER_FIELDS = ("number", "orderNumber", "order_number", "code")
+JSON_NAME_FIELDS = ("customerName", "userName", "name")
+JSON_PHONE_FIELDS = ("phoneNumber", "phone_number", "phone", "customerPhoneNumber", "mobile")
+JSON_ADDRESS_FIELDS = ("deliveryAddress", "userAddress", "address")
+JSON_ADDRESS_PARTS = ("area", "areaName", "block", "street", "avenue", "building", "floor", "unitNo", "notes")
+JSON_TOTAL_FIELDS = ("total", "totalAmount", "total_amount", "grandTotal")
+JSON_ITEM_LIST_FIELDS = ("items", "cartItems", "orderItems", "order_items")
+JSON_ITEM_NAME_FIELDS = ("titleEn", "title", "name", "itemName", "menuItem")
+JSON_ITEM_PRICE_FIELDS = ("totalPrice", "total_price", "price", "unitPrice")
+
 processed_phones: set[str] = set()
+# Serialises writes of PROCESSED_PHONES_FILE from concurrent delivery threads
+_processed_phones_lock = threading.Lock()
+# Extra key=value pairs appended to the SUMMARY line for the current cycle
+summary_extras: Dict[str, str] = {}
+# Deliveries made by the order watcher between sweeps; added to the next SUMMARY line
+pushed_order_stats: Dict[str, int] = {}
+# Per-wait latencies for the current cycle, keyed by wait name (seconds)
+wait_latencies: Dict[str, List[float]] = {}
+# Set once the bulk endpoint answers 404/405 so later cycles go straight to single POSTs
+_batch_endpoint_missing = False
+# Set once the delta endpoint answers 405 so later orders go straight to the full POST
+_delta_endpoint_missing = False
+# Durable delivery outbox (None when disabled or the database could not be opened)
+outbox: Optional["OrderOutbox"] = None
+# Orders already synced in earlier runs, with the hash of their last delivered payload
+seen_orders: Optional["SeenOrderIndex"] = None
+# Captured API responses per live driver (network extraction mode)
+_network_captures: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
 
 
 def load_processed_phones() -> set[str]:
@@ -90,7 +536,7 @@ def load_processed_phones() -> set[str]:
 
 def save_processed_phones() -> None:
     try:
-        with open(PROCESSED_PHONES_FILE, "w", encoding="utf-8") as fp:
+        with _processed_phones_lock, open(PROCESSED_PHONES_FILE, "w", encoding="utf-8") as fp:
             json.dump(sorted(processed_phones), fp, ensure_ascii=False, indent=2)
     except Exception as exc:  # pragma: no cover - logging only
         print(f"[WARN] Failed to save processed phones: {exc}")
@@ -140,33 +586,27 @@ def is_session_valid(driver, wait: WebDriverWait) -> bool:
         print("[INFO] Checking if session is still valid...", flush=True)
         driver.get(ORDERS_URL)
 
-        # Wait a bit for page to load
-        time.sleep(0.5)  # Reduced from 2 to 0.5 seconds
+        # Wait until either the order cards or the login form shows up
+        found = wait_for_cards(driver, timeout=10)
 
         # Check if we're redirected to login page
         if "/sign-in" in driver.current_url:
             print("[INFO] Session expired (redirected to login page)", flush=True)
             return False
 
-        # Try to find orders container (indicates we're logged in)
-        try:
-            wait.until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, ORDERS_CONTAINER_SELECTOR)),
-                timeout=10
-            )
+        # Orders container indicates we're logged in
+        if found:
             print("[SUCCESS] Session is valid", flush=True)
             return True
-        except TimeoutException:
-            # If we can't find orders container, session might be invalid
-            print("[INFO] Session might be invalid (orders container not found)", flush=True)
-            return False
+        # If we can't find orders container, session might be invalid
+        print("[INFO] Session might be invalid (orders container not found)", flush=True)
+        return False
     except Exception as exc:
         print(f"[WARN] Error checking session validity: {exc}", flush=True)
         return False
 
 
-def scrape_orders() -> List[Dict[str, object]]:
-    print("[STEP] Initializing browser...", flush=True)
+def _build_chrome_options() -> Options:
     options = Options()
     options.add_argument("--headless=new")
     options.add_argument("--disable-gpu")
@@ -186,24 +626,156 @@ def scrape_orders() -> List[Dict[str, object]]:
         "profile.managed_default_content_settings.images": 2,  # Disable images
     }
     options.add_experimental_option("prefs", prefs)
+    if EXTRACTION_MODE == "network" or REQUEST_BLOCKING:
+        # Record network events so API responses and blocked requests can be read back
+        options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+        options.add_experimental_option("perfLoggingPrefs", {"enableNetwork": True, "enablePage": False})
+    return options
+
+
+def _detect_chrome_version() -> Optional[str]:
+    """Return the installed Chrome/Chromium version (e.g. "142.0.7444.59") without touching the network."""
+    for binary in CHROME_BINARY_CANDIDATES:
+        path = binary if os.path.isabs(binary) else shutil.which(binary)
+        if not path or not os.path.exists(path):
+            continue
+        try:
+            output = subprocess.run(
+                [path, "--version"],
+                capture_output=True,
+                text=True,
+                timeout=5,
+            ).stdout
+        except Exception:
+            continue
+        match = re.search(r"(\d+\.\d+\.\d+(?:\.\d+)?)", output or "")
+        if match:
+            return match.group(1)
+    return None
+
+
+def _load_driver_cache() -> Dict[str, str]:
+    if not os.path.exists(DRIVER_CACHE_FILE):
+        return {}
+    try:
+        with open(DRIVER_CACHE_FILE, "r", encoding="utf-8") as fp:
+            payload = json.load(fp)
+            if isinstance(payload, dict):
+                return payload
+    except Exception as exc:
+        print(f"[WARN] Failed to load ChromeDriver cache: {exc}", flush=True)
+    return {}
+
+
+def _save_driver_cache(driver_path: str, chrome_version: Optional[str]) -> None:
+    try:
+        with open(DRIVER_CACHE_FILE, "w", encoding="utf-8") as fp:
+            json.dump(
+                {
+                    "driver_path": driver_path,
+                    "chrome_version": chrome_version,
+                    "resolved_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+                },
+                fp,
+                indent=2,
+            )
+    except Exception as exc:
+        print(f"[WARN] Failed to save ChromeDriver cache: {exc}", flush=True)
+
+
+def invalidate_driver_cache() -> None:
+    try:
+        if os.path.exists(DRIVER_CACHE_FILE):
+            os.remove(DRIVER_CACHE_FILE)
+            print("[INFO] Invalidated cached ChromeDriver path", flush=True)
+    except Exception as exc:
+        print(f"[WARN] Failed to delete ChromeDriver cache: {exc}", flush=True)
+
+
+def _is_executable(path: Optional[str]) -> bool:
+    return bool(path) and os.path.isfile(path) and os.access(path, os.X_OK)
+
+
+def resolve_chromedriver() -> tuple[Optional[str], str]:
+    """
+    Resolve the chromedriver binary, preferring the pinned on-disk cache.
+
+    The network (ChromeDriverManager) is only used when the local Chrome
+    version differs from the cached one. Offline, a stale cached driver or
+    the system chromedriver is used instead.
+    Returns (driver_path or None, source).
+    """
+    started = time.perf_counter()
+    chrome_version = _detect_chrome_version()
+    cache = _load_driver_cache()
+    cached_path = cache.get("driver_path")
+    cached_version = cache.get("chrome_version")
+
+    def _done(path: Optional[str], source: str) -> tuple[Optional[str], str]:
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        print(
+            f"[INFO] ChromeDriver resolved from {source} in {elapsed_ms:.0f}ms "
+            f"(Chrome {chrome_version or 'unknown'}): {path or 'selenium default'}",
+            flush=True,
+        )
+        return path, source
+
+    if _is_executable(cached_path) and (chrome_version is None or chrome_version == cached_version):
+        return _done(cached_path, "cache")
+
+    if cached_path:
+        print(
+            f"[INFO] Chrome version changed ({cached_version} -> {chrome_version}), refreshing ChromeDriver...",
+            flush=True,
+        )
 
     try:
         print("[INFO] Downloading/Updating ChromeDriver...", flush=True)
+        driver_path = ChromeDriverManager().install()
+        _save_driver_cache(driver_path, chrome_version)
+        return _done(driver_path, "webdriver-manager")
+    except Exception as exc:
+        print(f"[WARN] ChromeDriverManager failed: {exc}", flush=True)
+
+    if _is_executable(cached_path):
+        print("[WARN] Using previously cached ChromeDriver (offline, version may be stale)", flush=True)
+        return _done(cached_path, "stale cache")
+
+    system_path = shutil.which("chromedriver")
+    if _is_executable(system_path):
+        _save_driver_cache(system_path, chrome_version)
+        return _done(system_path, "system")
+
+    return _done(None, "selenium default")
+
+
+def _start_browser():
+    """Launch headless Chrome and return the driver."""
+    print("[STEP] Initializing browser...", flush=True)
+    started = time.perf_counter()
+    options = _build_chrome_options()
+
+    try:
+        driver_path, driver_source = resolve_chromedriver()
         try:
+            if not driver_path:
+                raise RuntimeError("no chromedriver binary resolved")
             driver = webdriver.Chrome(
-                service=Service(ChromeDriverManager().install()),
+                service=Service(driver_path),
                 options=options,
             )
             print("[SUCCESS] Browser initialized successfully", flush=True)
         except Exception as chrome_exc:
-            # Try alternative: use system ChromeDriver if available
-            print(f"[WARN] ChromeDriverManager failed: {chrome_exc}", flush=True)
+            # Cached/downloaded driver did not start: forget it and let Selenium find one
+            print(f"[WARN] ChromeDriver from {driver_source} failed: {chrome_exc}", flush=True)
+            if driver_source in ("cache", "stale cache"):
+                invalidate_driver_cache()
             print("[INFO] Trying to use system ChromeDriver...", flush=True)
             try:
                 driver = webdriver.Chrome(options=options)
                 print("[SUCCESS] Browser initialized using system ChromeDriver", flush=True)
             except Exception as system_exc:
-                error_msg = f"Failed to initialize browser with both methods. ChromeDriverManager: {chrome_exc}, System: {system_exc}"
+                error_msg = f"Failed to initialize browser with both methods. ChromeDriver ({driver_source}): {chrome_exc}, System: {system_exc}"
                 print(f"[ERROR] {error_msg}", flush=True)
                 raise RuntimeError(error_msg) from system_exc
     except Exception as exc:
@@ -213,67 +785,202 @@ def scrape_orders() -> List[Dict[str, object]]:
         print(f"[ERROR] Traceback: {traceback.format_exc()}", flush=True)
         raise RuntimeError(error_msg) from exc
 
-    wait = WebDriverWait(driver, 10)  # Reduced to 10 seconds for faster execution
+    if REQUEST_BLOCKING:
+        _apply_request_blocking(driver)
+
+    print(f"[INFO] Browser startup took {time.perf_counter() - started:.2f}s", flush=True)
+    return driver
 
+
+def _restore_saved_session(driver, wait: WebDriverWait) -> bool:
+    """Try to reuse saved session cookies. Returns True if the session is valid."""
+    saved_cookies = load_session_cookies()
+    if not saved_cookies:
+        return False
+
+    print("[STEP] Attempting to use saved session...", flush=True)
     try:
-        # Try to load saved session cookies first
-        saved_cookies = load_session_cookies()
-        session_used = False
+        # Navigate to the site first (required before adding cookies)
+        driver.get(SITE_URL)
 
-        if saved_cookies:
-            print("[STEP] Attempting to use saved session...", flush=True)
+        # Add saved cookies
+        for cookie in saved_cookies:
             try:
-                # Navigate to the site first (required before adding cookies)
-                driver.get(SITE_URL)
-                time.sleep(0.3)  # Reduced from 1 to 0.3 seconds
-
-                # Add saved cookies
-                for cookie in saved_cookies:
-                    try:
-                        driver.add_cookie(cookie)
-                    except Exception as e:
-                        print(f"[WARN] Failed to add cookie: {e}", flush=True)
-
-                print("[INFO] Loaded saved cookies, verifying session...", flush=True)
-
-                # Check if session is still valid
-                if is_session_valid(driver, wait):
-                    print("[SUCCESS] Using saved session - no login required!", flush=True)
-                    session_used = True
-                else:
-                    print("[INFO] Saved session expired, will login again...", flush=True)
-            except Exception as exc:
-                print(f"[WARN] Failed to use saved session: {exc}", flush=True)
-                print("[INFO] Will login normally...", flush=True)
+                driver.add_cookie(cookie)
+            except Exception as e:
+                print(f"[WARN] Failed to add cookie: {e}", flush=True)
+
+        print("[INFO] Loaded saved cookies, verifying session...", flush=True)
+
+        # Check if session is still valid
+        if is_session_valid(driver, wait):
+            print("[SUCCESS] Using saved session - no login required!", flush=True)
+            return True
+        print("[INFO] Saved session expired, will login again...", flush=True)
+    except Exception as exc:
+        print(f"[WARN] Failed to use saved session: {exc}", flush=True)
+        print("[INFO] Will login normally...", flush=True)
+    return False
+
+
+def _perform_login(driver, wait: WebDriverWait) -> None:
+    print("[STEP] Performing login...", flush=True)
+    print("[STEP] Navigating to Zyda login page...", flush=True)
+    driver.get(SITE_URL)
+    print(f"[INFO] Current URL: {driver.current_url}", flush=True)
+
+    print("[STEP] Waiting for login form to appear...", flush=True)
+    email_input, password_input = _wait_for_inputs(wait)
+    print("[SUCCESS] Login form found", flush=True)
+
+    print("[STEP] Filling email address...", flush=True)
+    _fill_credentials(email_input, password_input)
+    print("[SUCCESS] Credentials filled", flush=True)
+
+    print("[STEP] Clicking login button...", flush=True)
+    _click_login(driver, wait)
+    print("[INFO] Login button clicked, waiting for redirect...", flush=True)
+
+    _wait_for_login_success(driver, wait)
+
+    # Save session cookies after successful login
+    print("[STEP] Saving session cookies for future use...", flush=True)
+    save_session_cookies(driver)
+
+
+def _ensure_logged_in(driver, wait: WebDriverWait) -> None:
+    # Try to load saved session cookies first, login only if they are no longer valid
+    if not _restore_saved_session(driver, wait):
+        _perform_login(driver, wait)
+
+
+def _save_error_screenshot(driver) -> None:
+    try:
+        driver.save_screenshot("scraping_error.png")
+        print("[INFO] Saved screenshot to scraping_error.png for debugging", flush=True)
+    except:
+        pass
+
+
+class BrowserSession:
+    """
+    Long-lived Chrome with a logged-in orders tab, reused across --loop cycles.
+
+    The browser is only re-created when it stops responding, its JS heap grows
+    past BROWSER_MAX_HEAP_MB, or it has served BROWSER_MAX_CYCLES cycles.
+    A lost Zyda session is recovered by logging in again in the same browser.
+    """
 
-        # If no saved session or session invalid, perform login
-        if not session_used:
-            print("[STEP] Performing login...", flush=True)
-            print("[STEP] Navigating to Zyda login page...", flush=True)
-            driver.get(SITE_URL)
-            print(f"[INFO] Current URL: {driver.current_url}", flush=True)
+    def __init__(
+        self,
+        max_cycles: int = BROWSER_MAX_CYCLES,
+        max_heap_mb: int = BROWSER_MAX_HEAP_MB,
+        detail_concurrency: Optional[int] = None,
+    ) -> None:
+        self.driver = None
+        self.wait: Optional[WebDriverWait] = None
+        self.max_cycles = max_cycles
+        self.max_heap_mb = max_heap_mb
+        self.cycles = 0
+        self.launches = 0
+        concurrency = DETAIL_CONCURRENCY if detail_concurrency is None else detail_concurrency
+        self.detail_pool = DetailTabPool(concurrency) if concurrency > 1 else None
+
+    def acquire(self):
+        """Return a healthy (driver, wait) pair, starting or recycling Chrome if needed."""
+        problem = self._health_problem()
+        if problem:
+            if self.driver is not None:
+                print(f"[WARN] Recycling browser: {problem}", flush=True)
+                self.close()
+            self._start()
+        else:
+            print(
+                f"[INFO] Reusing warm browser (cycle {self.cycles + 1}, launches={self.launches})",
+                flush=True,
+            )
+        self.cycles += 1
+        return self.driver, self.wait
+
+    def session_lost(self) -> bool:
+        try:
+            return "/sign-in" in self.driver.current_url
+        except Exception:
+            return True
+
+    def relogin(self) -> None:
+        print("[WARN] Zyda session lost, logging in again in the warm browser...", flush=True)
+        _perform_login(self.driver, self.wait)
+        if self.detail_pool is not None:
+            # Workers hold the old cookies; they are re-seeded on next use
+            self.detail_pool.close()
+
+    def discard(self) -> None:
+        """Drop the browser after an unrecoverable error; next acquire() starts fresh."""
+        _save_error_screenshot(self.driver)
+        self.close()
+
+    def close(self) -> None:
+        if self.detail_pool is not None:
+            self.detail_pool.close()
+        if self.driver is None:
+            return
+        try:
+            self.driver.quit()
+            print("[INFO] Browser closed", flush=True)
+        except:
+            print("[WARN] Error closing browser (non-critical)", flush=True)
+        self.driver = None
+        self.wait = None
+
+    def _start(self) -> None:
+        self.driver = _start_browser()
+        self.wait = WebDriverWait(self.driver, 10)
+        self.cycles = 0
+        self.launches += 1
+        try:
+            _ensure_logged_in(self.driver, self.wait)
+        except Exception:
+            self.discard()
+            raise
+
+    def _health_problem(self) -> Optional[str]:
+        if self.driver is None:
+            return "not started"
+        if self.cycles >= self.max_cycles:
+            return f"reached {self.max_cycles} cycles"
+        try:
+            heap_bytes = self.driver.execute_script(
+                "return (performance.memory && performance.memory.usedJSHeapSize) || 0;"
+            )
+        except WebDriverException as exc:
+            return f"browser not responding ({exc.__class__.__name__})"
+        heap_mb = (heap_bytes or 0) / (1024 * 1024)
+        if heap_mb > self.max_heap_mb:
+            return f"JS heap {heap_mb:.0f}MB exceeds {self.max_heap_mb}MB"
+        return None
 
-            print("[STEP] Waiting for login form to appear...", flush=True)
-            email_input, password_input = _wait_for_inputs(wait)
-            print("[SUCCESS] Login form found", flush=True)
 
-            print("[STEP] Filling email address...", flush=True)
-            _fill_credentials(email_input, password_input)
-            print("[SUCCESS] Credentials filled", flush=True)
+def scrape_orders(browser: Optional[BrowserSession] = None) -> List[Dict[str, object]]:
+    if FETCH_MODE == "http":
+        orders = fetch_orders_browserless()
+        if orders is not None:
+            return orders
+        print("[INFO] Falling back to browser scraping...", flush=True)
 
-            print("[STEP] Clicking login button...", flush=True)
-            _click_login(driver, wait)
-            print("[INFO] Login button clicked, waiting for redirect...", flush=True)
+    if browser is not None:
+        return _scrape_with_warm_browser(browser)
 
-            _wait_for_login_success(driver, wait)
+    driver = _start_browser()
+    wait = WebDriverWait(driver, 10)  # Reduced to 10 seconds for faster execution
+    detail_pool = DetailTabPool(DETAIL_CONCURRENCY) if DETAIL_CONCURRENCY > 1 else None
 
-            # Save session cookies after successful login
-            print("[STEP] Saving session cookies for future use...", flush=True)
-            save_session_cookies(driver)
+    try:
+        _ensure_logged_in(driver, wait)
 
         # Now scrape orders (session is ready)
         print("[STEP] Starting to scrape order cards from dashboard...", flush=True)
-        orders = _scrape_order_cards(driver, wait)
+        orders = _scrape_order_cards(driver, wait, detail_pool)
         print(f"[SUCCESS] Successfully scraped {len(orders)} order(s)", flush=True)
 
         return orders
@@ -283,22 +990,122 @@ def scrape_orders() -> List[Dict[str, object]]:
         import traceback
         print(f"[ERROR] Traceback: {traceback.format_exc()}", flush=True)
         # Try to save screenshot for debugging
-        try:
-            if 'driver' in locals():
-                driver.save_screenshot("scraping_error.png")
-                print("[INFO] Saved screenshot to scraping_error.png for debugging", flush=True)
-        except:
-            pass
+        _save_error_screenshot(driver)
         raise
     finally:
+        if detail_pool is not None:
+            detail_pool.close()
         try:
-            if 'driver' in locals():
-                driver.quit()
-                print("[INFO] Browser closed", flush=True)
+            driver.quit()
+            print("[INFO] Browser closed", flush=True)
         except:
             print("[WARN] Error closing browser (non-critical)", flush=True)
 
 
+def _scrape_with_warm_browser(browser: BrowserSession) -> List[Dict[str, object]]:
+    driver, wait = browser.acquire()
+    try:
+        print("[STEP] Starting to scrape order cards from dashboard...", flush=True)
+        orders = _scrape_order_cards(driver, wait, browser.detail_pool)
+
+        if not orders and browser.session_lost():
+            browser.relogin()
+            orders = _scrape_order_cards(driver, wait, browser.detail_pool)
+
+        print(f"[SUCCESS] Successfully scraped {len(orders)} order(s)", flush=True)
+        return orders
+    except Exception as exc:
+        print(f"[ERROR] Error during scraping: {exc}", flush=True)
+        import traceback
+        print(f"[ERROR] Traceback: {traceback.format_exc()}", flush=True)
+        browser.discard()
+        raise
+
+
+def watch_for_new_orders(browser: BrowserSession, duration: float) -> None:
+    """
+    Block for ``duration`` seconds on the in-page order observer of the warm orders tab, syncing
+    each new order key as soon as it shows up. Falls back to sleeping if the tab is unusable.
+    """
+    driver, wait = browser.driver, browser.wait
+    deadline = time.time() + duration
+    if driver is None:
+        time.sleep(duration)
+        return
+
+    print(f"[INFO] Watching for new orders for {int(duration)} second(s)...", flush=True)
+    pushed = 0
+    while True:
+        remaining = deadline - time.time()
+        if remaining <= 0:
+            break
+        try:
+            if "/orders/current" not in driver.current_url:
+                _reload_orders_list(driver)
+            if driver.execute_script(
+                ORDER_WATCH_INSTALL_SCRIPT, ORDERS_CONTAINER_SELECTOR, ZYDA_ORDER_KEY_SELECTOR, ORDER_WATCH_VERSION
+            ):
+                print("[INFO] Order watcher installed on the orders tab", flush=True)
+            chunk = min(remaining, PUSH_WAIT_CHUNK_SECONDS)
+            driver.set_script_timeout(chunk + 5)
+            events = driver.execute_async_script(ORDER_WATCH_WAIT_SCRIPT, int(chunk * 1000))
+        except WebDriverException as exc:
+            print(f"[WARN] Order watcher failed ({exc.__class__.__name__}), waiting for the next sweep", flush=True)
+            time.sleep(max(0, deadline - time.time()))
+            break
+
+        try:
+            for event in events or []:
+                if _sync_pushed_order(driver, wait, event["key"], event["at"] / 1000.0):
+                    pushed += 1
+        except Exception as exc:
+            print(f"[ERROR] Browser failed while syncing a new order ({exc.__class__.__name__}), recycling it", flush=True)
+            browser.discard()
+            time.sleep(max(0, deadline - time.time()))
+            break
+
+    if pushed:
+        print(f"[INFO] Synced {pushed} order(s) pushed by the order watcher", flush=True)
+
+
+def _sync_pushed_order(driver, wait: WebDriverWait, zyda_order_key: str, detected_at: float) -> bool:
+    """Open, extract and deliver one order reported by the watcher, then return to the list."""
+    if seen_orders is not None and zyda_order_key in seen_orders.entries:
+        return False
+    print(f"[STEP] New order {zyda_order_key} detected, syncing it now...", flush=True)
+
+    card_list = _read_card_list(driver) or []
+    row = next((r for r in card_list if r["key"] == zyda_order_key), None)
+    if row is None:
+        print(f"[WARN] New order {zyda_order_key} no longer on the list, leaving it to the next sweep", flush=True)
+        return False
+    if seen_orders is not None:
+        seen_orders.observe(zyda_order_key, row["fingerprint"])
+
+    list_url = driver.current_url
+    try:
+        details = _captured_details(driver, zyda_order_key)
+        if not details:
+            _open_order_card(driver, wait, row["element"])
+            details = _extract_details(driver, wait, zyda_order_key)
+            if not _return_to_orders_list(driver, list_url, len(card_list)):
+                _reload_orders_list(driver)
+    except Exception as exc:
+        print(f"[ERROR] Failed to extract new order {zyda_order_key}: {exc}", flush=True)
+        _reload_orders_list(driver)
+        return False
+
+    order_stats = {"created": 0, "updated": 0, "skipped": 0, "failed": 0, "suppressed": 0}
+    _deliver_scraped_order(_build_order_payload(row["label"], zyda_order_key, details), 1, 1, order_stats)
+    for operation, count in order_stats.items():
+        pushed_order_stats[operation] = pushed_order_stats.get(operation, 0) + count
+    print(
+        f"[TIMING] Order {zyda_order_key} synced {time.time() - detected_at:.1f}s after it appeared",
+        flush=True,
+    )
+    return order_stats["failed"] == 0
+
+
 def _wait_for_inputs(wait: WebDriverWait):
     print("[INFO] Looking for email input field...", flush=True)
     email_input = wait.until(
@@ -365,9 +1172,6 @@ def _wait_for_login_success(driver, wait: WebDriverWait) -> None:
         wait.until(EC.url_contains("/orders/current"))
         print("[SUCCESS] Orders page URL confirmed", flush=True)
 
-        # Wait a bit for page to start loading
-        time.sleep(1)
-
         print("[SUCCESS] Login successful! Order cards will be fetched in next step.", flush=True)
         # NOTE: We don't wait for order cards container here anymore
         # This will be done in _scrape_order_cards() with better error handling
@@ -384,23 +1188,30 @@ def _wait_for_login_success(driver, wait: WebDriverWait) -> None:
         raise RuntimeError(error_msg) from None
 
 
-def _scrape_order_cards(driver, wait: WebDriverWait) -> List[Dict[str, object]]:
+def _scrape_order_cards(
+    driver, wait: WebDriverWait, detail_pool: Optional["DetailTabPool"] = None
+) -> List[Dict[str, object]]:
     try:
+        _start_capture_cycle(driver)
+
         # Navigate to orders page first (if not already there)
         current_url = driver.current_url
         if "/orders/current" not in current_url:
             print("[STEP] Navigating to Zyda orders page...", flush=True)
             driver.get(ORDERS_URL)
-            time.sleep(2)  # Wait for page to load
         else:
             print("[INFO] Already on orders page, refreshing...", flush=True)
             driver.refresh()
-            time.sleep(2)  # Wait for page to reload
 
-        # Wait for page to be ready
+        # Wait for page to be ready: returns as soon as cards (or the login form) render
         print("[INFO] Waiting for page to be ready...", flush=True)
+        ready = wait_for_cards(driver, timeout=10)
+
+        if "/sign-in" in driver.current_url:
+            print("[WARN] Redirected to login page - session expired", flush=True)
+            return []
+
         wait.until(EC.url_contains("/orders/current"))
-        time.sleep(0.5)  # Reduced from 3 to 0.5 seconds for faster scraping
 
         # Try to close any modals or popups
         try:
@@ -418,7 +1229,9 @@ def _scrape_order_cards(driver, wait: WebDriverWait) -> List[Dict[str, object]]:
                     if close_btn.is_displayed():
                         close_btn.click()
                         print(f"[INFO] Closed modal using selector: {selector}", flush=True)
-                        time.sleep(1)
+                        _timed_wait("modal-close", lambda: WebDriverWait(driver, 2).until(
+                            EC.invisibility_of_element(close_btn)
+                        ))
                         break
                 except:
                     pass
@@ -426,93 +1239,43 @@ def _scrape_order_cards(driver, wait: WebDriverWait) -> List[Dict[str, object]]:
             print(f"[INFO] No modals found or error closing: {e}", flush=True)
 
         print("[STEP] Fetching orders from Zyda dashboard...", flush=True)
-        print("[INFO] Waiting for order cards to appear...", flush=True)
-
-        # Use optimized timeout for waiting
-        extended_wait = WebDriverWait(driver, 10)  # Reduced from 20 to 10 seconds for faster scraping
-
-        # Try multiple selectors with longer timeout
-        cards = None
-        selectors_to_try = [
-            ORDERS_CONTAINER_SELECTOR,
-            ".mb-4.rounded-md",  # More flexible selector
-            "[class*='mb-4'][class*='rounded']",  # Even more flexible
-            ".order-card",  # Alternative selector
-            "div[class*='rounded'][class*='mb-4']",  # Another variation
-        ]
 
-        for selector in selectors_to_try:
-            try:
-                print(f"[INFO] Trying selector: {selector} (timeout: 20s)", flush=True)
-                cards = extended_wait.until(
-                    EC.presence_of_all_elements_located(
-                        (By.CSS_SELECTOR, selector)
-                    )
-                )
-                if cards and len(cards) > 0:
-                    print(f"[SUCCESS] Found {len(cards)} order card(s) using selector: {selector}", flush=True)
-                    break
-                else:
-                    print(f"[WARN] Selector {selector} found but no cards (empty list)", flush=True)
-            except TimeoutException:
-                print(f"[WARN] Selector {selector} did not find cards within 20s, trying next...", flush=True)
-                continue
+        # The readiness wait raced every card selector and the empty-state texts; if it saw
+        # nothing (e.g. a modal was covering a late render) give it one more short race
+        if not ready or ready["selector"] == EMAIL_INPUT_SELECTOR:
+            print("[INFO] Waiting for order cards to appear...", flush=True)
+            ready = wait_for_cards(driver, timeout=3)
 
-        # If still no cards found, try one more time with shorter wait
-        if not cards or len(cards) == 0:
-            print("[INFO] Waiting additional 1 second and trying one more time...", flush=True)
-            time.sleep(1)  # Reduced from 5 to 1 second for faster scraping
+        if ready and ready.get("empty"):
+            print(f"[INFO] No orders found on page (found '{ready['empty']}' in page text)", flush=True)
+            return []
 
-            # Try to find any elements that might be order cards
+        cards = None
+        if ready and ready["selector"] in CARD_SELECTORS:
+            cards = driver.find_elements(By.CSS_SELECTOR, ready["selector"])
+        if cards:
+            print(f"[SUCCESS] Found {len(cards)} order card(s) using selector: {ready['selector']}", flush=True)
+            _remember_card_selector(ready["selector"])
+        else:
+            # Save screenshot and page source for debugging
+            driver.save_screenshot("orders_not_found.png")
             try:
-                # Try to find by looking for common order card patterns
-                all_divs = driver.find_elements(By.TAG_NAME, "div")
-                print(f"[DEBUG] Found {len(all_divs)} div elements on page", flush=True)
-
-                # Try the main selector one more time
-                cards = extended_wait.until(
-                    EC.presence_of_all_elements_located(
-                        (By.CSS_SELECTOR, ORDERS_CONTAINER_SELECTOR)
-                    )
-                )
-                if cards and len(cards) > 0:
-                    print(f"[SUCCESS] Found {len(cards)} order card(s) after extended wait", flush=True)
-            except TimeoutException:
-                # Check if there are no orders (empty state)
-                print("[INFO] Checking if page shows 'no orders' message...", flush=True)
-                page_text = driver.page_source.lower()
-                no_orders_indicators = [
-                    "no orders",
-                    "لا توجد طلبات",
-                    "لا يوجد طلبات",
-                    "empty",
-                    "no data",
-                ]
-
-                for indicator in no_orders_indicators:
-                    if indicator in page_text:
-                        print(f"[INFO] No orders found on page (found '{indicator}' in page text)", flush=True)
-                        return []
-
-                # Save screenshot and page source for debugging
-                driver.save_screenshot("orders_not_found.png")
-                try:
-                    with open("orders_page_source.html", "w", encoding="utf-8") as f:
-                        f.write(driver.page_source)
-                    print("[INFO] Saved page source to orders_page_source.html for debugging", flush=True)
-                except:
-                    pass
+                with open("orders_page_source.html", "w", encoding="utf-8") as f:
+                    f.write(driver.page_source)
+                print("[INFO] Saved page source to orders_page_source.html for debugging", flush=True)
+            except:
+                pass
 
-                error_msg = (
-                    "Could not find any order cards after multiple attempts. "
-                    "Saved screenshot to orders_not_found.png for troubleshooting. "
-                    f"Current URL: {driver.current_url}. "
-                    "This might mean: (1) No orders available, (2) Page structure changed, or (3) Page needs more time to load."
-                )
-                print(f"[ERROR] Failed to fetch orders: {error_msg}", flush=True)
-                # Don't raise error - return empty list instead to allow script to continue
-                print("[INFO] Returning empty list - script will continue without error", flush=True)
-                return []
+            error_msg = (
+                "Could not find any order cards with any known selector. "
+                "Saved screenshot to orders_not_found.png for troubleshooting. "
+                f"Current URL: {driver.current_url}. "
+                "This might mean: (1) No orders available, (2) Page structure changed, or (3) Page needs more time to load."
+            )
+            print(f"[ERROR] Failed to fetch orders: {error_msg}", flush=True)
+            # Don't raise error - return empty list instead to allow script to continue
+            print("[INFO] Returning empty list - script will continue without error", flush=True)
+            return []
     except TimeoutException as e:
         driver.save_screenshot("orders_not_found.png")
         error_msg = (
@@ -534,7 +1297,6 @@ def _scrape_order_cards(driver, wait: WebDriverWait) -> List[Dict[str, object]]:
         print("[INFO] Returning empty list - script will continue", flush=True)
         return []
 
-    scraped_orders: List[Dict[str, object]] = []
     total_cards = len(cards)
 
     # Track stats for summary
@@ -543,173 +1305,1111 @@ def _scrape_order_cards(driver, wait: WebDriverWait) -> List[Dict[str, object]]:
         "updated": 0,
         "skipped": 0,
         "failed": 0,
+        "suppressed": 0,
     }
 
-    for idx in range(total_cards):
+    # With a delivery queue or bulk delivery, a background sender POSTs orders while the browser keeps scraping
+    pipeline = _open_delivery_pipeline()
+    deliver = pipeline.submit if pipeline is not None else _deliver_scraped_order
+    try:
+        if SHARD_WORKERS > 1 and total_cards > 1:
+            scraped_orders = _process_cards_sharded(driver, wait, cards, SHARD_WORKERS, order_stats, deliver)
+        elif detail_pool is not None and total_cards > 1:
+            scraped_orders = _process_cards_parallel(driver, wait, cards, detail_pool, order_stats, deliver)
+        else:
+            scraped_orders = _process_cards_sequential(driver, wait, total_cards, order_stats, deliver)
+    finally:
+        # Also runs on SIGTERM (raised as SystemExit) so queued orders are not lost
+        if pipeline is not None:
+            pipeline.close()
+
+    _report_request_filter(driver)
+    _print_wait_latencies()
+    _print_processing_summary(order_stats)
+
+    return scraped_orders
+
+
+def _print_processing_summary(order_stats: Dict[str, int]) -> None:
+    # Print summary of processed orders
+    print(f"\n[INFO] Processing Summary:", flush=True)
+    print(f"  - Created: {order_stats['created']}", flush=True)
+    print(f"  - Updated: {order_stats['updated']}", flush=True)
+    print(f"  - Skipped: {order_stats['skipped']}", flush=True)
+    print(f"  - Failed: {order_stats['failed']}", flush=True)
+    print(f"  - Suppressed (unchanged): {order_stats['suppressed']}", flush=True)
+
+
+def _process_cards_sequential(
+    driver, wait: WebDriverWait, total_cards: int, order_stats: Dict[str, int], deliver
+) -> List[Dict[str, object]]:
+    scraped_orders: List[Dict[str, object]] = []
+    order_timings: List[tuple] = []
+    # True while the orders list is showing and usable without a reload
+    on_list = True
+    # Walks the list by order key, scrolling for cards rendered lazily further down
+    walker = OrderListWalker(driver)
+    unchanged = 0
+    idx = -1
+
+    while not walker.exhausted:
+        idx += 1
+        order_started = time.perf_counter()
+        navigation = "in-place" if on_list else "reload"
+        row = None
+        # Unchanged cards are never opened; timing them would skew the per-navigation averages
+        timed = True
         try:
             # For first order, we're already on the orders page
-            # For subsequent orders, go back to orders list
-            if idx > 0:
-                driver.get(ORDERS_URL)
-                # Wait for orders to load after page reload (with shorter timeout)
-                try:
-                    short_wait = WebDriverWait(driver, 5)  # Reduced timeout
-                    short_wait.until(
-                        EC.presence_of_all_elements_located(
-                            (By.CSS_SELECTOR, ORDERS_CONTAINER_SELECTOR)
-                        )
-                    )
-                    time.sleep(0.2)  # Minimal wait for stability
-                except TimeoutException:
-                    time.sleep(0.5)  # Reduced fallback wait
-
-            # Get cards again (refresh after reload or use existing)
-            cards = driver.find_elements(By.CSS_SELECTOR, ORDERS_CONTAINER_SELECTOR)
-
-            if idx >= len(cards):
-                print(f"[WARN] Order #{idx + 1} not found (found {len(cards)} cards), skipping...")
+            # For subsequent orders, go back to orders list unless we returned to it in place
+            if not on_list:
+                _reload_orders_list(driver)
+                walker.invalidate()
+            on_list = False
+
+            # Next unvisited card (label and key read in one call for all rendered cards)
+            if not walker.failed:
+                row = walker.next_card()
+            if row is not None:
+                card = row["element"]
+                card_label = row["label"]
+                zyda_order_key = row["key"]
+                total_cards = max(total_cards, len(walker.visited))
+
+                # Skip cards already synced whose list-view text has not changed
+                if _skip_unchanged_card(zyda_order_key, row["fingerprint"]):
+                    unchanged += 1
+                    on_list = True
+                    timed = False
+                    continue
+            elif walker.exhausted:
                 continue
+            else:
+                if idx >= total_cards:
+                    break
+                cards = driver.find_elements(By.CSS_SELECTOR, ORDERS_CONTAINER_SELECTOR)
 
-            card = cards[idx]
+                if idx >= len(cards):
+                    print(f"[WARN] Order #{idx + 1} not found (found {len(cards)} cards), skipping...")
+                    continue
 
-            # Scroll to card to ensure it's visible
-            driver.execute_script("arguments[0].scrollIntoView({block: 'center', behavior: 'auto'});", card)
-            time.sleep(0.1)  # Reduced from 0.5 to 0.1 seconds
+                card = cards[idx]
 
-            card_label = _get_card_label(driver, wait, card)
+                # Scroll to card to ensure it's visible
+                driver.execute_script("arguments[0].scrollIntoView({block: 'center', behavior: 'auto'});", card)
 
-            # Extract unique order key from card BEFORE opening it
-            zyda_order_key = _get_zyda_order_key(driver, wait, card, idx)
+                card_label = _get_card_label(driver, wait, card)
+
+                # Extract unique order key from card BEFORE opening it
+                zyda_order_key = _get_zyda_order_key(driver, wait, card, idx)
 
             if not zyda_order_key or zyda_order_key.startswith("zyda_"):
                 print(f"[WARN] Order #{idx + 1} missing valid order key (got: {zyda_order_key}), continuing anyway...")
 
-            # Click on the card to open order details
-            _open_order_card(driver, wait, card)
+            # In network mode the list response may already hold the full order
+            details = _captured_details(driver, zyda_order_key)
+            if details:
+                on_list = True
+            else:
+                list_url = driver.current_url
+
+                # Click on the card to open order details
+                _open_order_card(driver, wait, card)
+                walker.invalidate()
 
-            # Extract order details from the opened order page
-            details = _extract_order_details(driver, wait)
+                # Extract order details from the opened order page
+                details = _extract_details(driver, wait, zyda_order_key)
 
-            phone = details.get("phone")
-            if not phone:
+                # Close the details in the app instead of reloading the list for the next card
+                if NAVIGATION_MODE == "in-place":
+                    on_list = _return_to_orders_list(driver, list_url, walker.rendered or total_cards)
+
+            if not details.get("phone"):
                 print(f"[WARN] Skipping order #{idx + 1} due to missing phone number.")
-                # No need to reload here - we'll reload at the start of next iteration
                 continue
 
-            # Parse total amount from Zyda platform (exact amount as shown)
-            raw_total = details.get("total")
-            parsed_total = _parse_total_amount(raw_total)
-
-            # Convert items to structured format (JSON) with name, quantity, and actual price from Zyda
-            raw_items = details.get("items") or []
-            structured_items = []
-            for item_data in raw_items:
-                # item_data is now a dict: {"quantity": "2x", "name": "Burger", "price": 37.0}
-                if isinstance(item_data, dict):
-                    quantity_str = item_data.get("quantity", "1x")
-                    name = item_data.get("name", "")
-                    price = item_data.get("price")  # Actual price from Zyda (or None)
-                else:
-                    # Fallback for old format (tuple)
-                    quantity_str, name = item_data
-                    price = None
-
-                # Extract quantity number from string like "2x" -> 2
-                quantity = int(re.sub(r'[^\d]', '', quantity_str)) if quantity_str else 1
-
-                structured_items.append({
-                    "name": name,
-                    "quantity": quantity,
-                    "price": price,  # Actual price from Zyda platform (preserve as is)
-                })
-
-            order_payload = {
-                "name": card_label,
-                "phone": phone,
-                "address": details.get("address"),
-                "total_amount": parsed_total,  # Use exact amount from Zyda platform
-                "items": structured_items,  # Structured items with name, quantity, price
-                "zyda_order_key": zyda_order_key,  # Unique order identifier from Zyda (e.g., "#GD7G-GAWP")
-            }
-
-            # Count unique items (by name) for items_count
-            unique_items = set()
-            for item in structured_items:
-                item_name = item.get("name", "").strip().lower()
-                if item_name:
-                    unique_items.add(item_name)
-            items_count = len(unique_items) if unique_items else len(structured_items)
-
-            # Print order summary in green color
-            _print_order_summary(idx + 1, {
-                "name": card_label,
-                "phone": phone,
-                "address": details.get("address") or "N/A",
-                "items_count": items_count,  # Count of unique items, not total quantities
-                "order_key": zyda_order_key,
-                "total": parsed_total,
-            })
-
-            # Send order to API immediately after extraction
-            print(f"[STEP] Sending order #{idx + 1} to database immediately...", flush=True)
-            operation = _send_order_to_api(order_payload, idx + 1, total_cards)
-
-            # Track stats
-            if operation in order_stats:
-                order_stats[operation] += 1
-
-            # Save processed phones periodically (every order to ensure no data loss)
-            save_processed_phones()
+            order_payload = _build_order_payload(card_label, zyda_order_key, details)
+            deliver(order_payload, idx + 1, total_cards, order_stats)
 
             # Keep track for summary (optional, but useful)
             scraped_orders.append(order_payload)
 
-            # No need to reload here - we'll reload at the start of next iteration if needed
-
         except Exception as exc:
             print(f"[ERROR] Error processing order #{idx + 1}: {exc}")
-            # Try to go back to orders list
-            try:
-                driver.get(ORDERS_URL)
-                time.sleep(0.3)  # Reduced from 1 to 0.3 seconds
-            except:
-                pass
+            on_list = False
             continue
+        finally:
+            if timed and (row is not None or not walker.exhausted):
+                elapsed = time.perf_counter() - order_started
+                order_timings.append((navigation, elapsed))
+                print(f"[TIMING] Order #{idx + 1}: {elapsed:.2f}s (list: {navigation})", flush=True)
+
+    if walker.scrolls:
+        print(f"[INFO] Walked {len(walker.visited)} order(s) with {walker.scrolls} list scroll(s)", flush=True)
+    if unchanged:
+        print(f"[INFO] Skipped {unchanged} unchanged order(s) already synced", flush=True)
+    _print_order_timings(order_timings)
+    return scraped_orders
 
-    # Print summary of processed orders
-    print(f"\n[INFO] Processing Summary:", flush=True)
-    print(f"  - Created: {order_stats['created']}", flush=True)
-    print(f"  - Updated: {order_stats['updated']}", flush=True)
-    print(f"  - Skipped: {order_stats['skipped']}", flush=True)
-    print(f"  - Failed: {order_stats['failed']}", flush=True)
 
-    return scraped_orders
+class OrderListWalker:
+    """
+    Walk the orders list by order key, scrolling it in chunks so lazily rendered or virtualized
+    cards further down are reached too. Every key is yielded once; only the keys are kept, rows
+    are re-read from the page after each scroll or navigation.
+    """
 
+    def __init__(self, driver, max_idle_scrolls: int = LIST_MAX_IDLE_SCROLLS) -> None:
+        self.driver = driver
+        self.max_idle_scrolls = max_idle_scrolls
+        self.visited: set[str] = set()
+        # True once the list cannot scroll further and no new keys appeared
+        self.exhausted = False
+        # True if the bulk card read failed and the caller should use per-card lookups
+        self.failed = False
+        # Number of cards rendered at the last read
+        self.rendered = 0
+        self.scrolls = 0
+        self._rows: Optional[List[Dict]] = None
+
+    def __iter__(self):
+        while True:
+            row = self.next_card()
+            if row is None:
+                return
+            yield row
+
+    def invalidate(self) -> None:
+        """Drop the rendered rows (e.g. after opening a card); the next step re-reads the list."""
+        self._rows = None
+
+    def next_card(self) -> Optional[Dict]:
+        """Return the next unvisited card row, scrolling as needed; None at the end or on failure."""
+        idle = 0
+        while not self.exhausted:
+            if self._rows is None:
+                self._rows = _read_card_list(self.driver)
+                if self._rows is None:
+                    self.failed = True
+                    return None
+                self.rendered = len(self._rows)
+            for row in self._rows:
+                if row["key"] not in self.visited:
+                    self.visited.add(row["key"])
+                    return row
+            if idle >= self.max_idle_scrolls:
+                self.exhausted = True
+                break
+            # Only a scroll that could not move counts as idle: after a reload the list starts at
+            # the top again and has to be scrolled past the cards visited before it
+            idle = 0 if self._scroll() else idle + 1
+        return None
 
-def _get_zyda_order_key(driver, wait: WebDriverWait, card, idx: int = 0) -> str:
+    def _scroll(self) -> bool:
+        """Scroll the list one step; returns True if the scroll position moved."""
+        try:
+            moved = self.driver.execute_script(LIST_SCROLL_SCRIPT, ORDERS_CONTAINER_SELECTOR)
+        except WebDriverException as exc:
+            print(f"[WARN] Scrolling the orders list failed: {exc.__class__.__name__}", flush=True)
+            self.exhausted = True
+            return False
+        self.scrolls += 1
+        _wait_for_dom(self.driver, "list-scroll", [ORDERS_CONTAINER_SELECTOR], 2)
+        self._rows = None
+        return bool(moved)
+
+
+def _skip_unchanged_card(zyda_order_key: str, fingerprint: Optional[str]) -> bool:
+    """Return True if the seen-order index says this card needs no re-opening."""
+    if seen_orders is None:
+        return False
+    if not FULL_SWEEP and seen_orders.is_unchanged(zyda_order_key, fingerprint):
+        return True
+    seen_orders.observe(zyda_order_key, fingerprint)
+    return False
+
+
+class SeenOrderIndex:
     """
-    Extract unique order key from card using element14_* class pattern.
-    The value is the text content inside the <p> element with class element14_*.
-    Example: <p class="element14_McQXd">#GD7G-GAWP</p> -> returns "#GD7G-GAWP"
-    This is the unique identifier for each order from Zyda.
+    Persistent index of orders already synced to Laravel, keyed by zyda_order_key.
 
-    IMPORTANT: We look for text that starts with '#' to identify the order key
-    (not the date/time which also has element14_ class).
+    Each entry stores the fingerprint of the card's list-view text and the hash of the last
+    synced payload, so unchanged cards are not opened again on the next cycle. Orders the API
+    reported as still pending a location are re-opened every PENDING_REPOST_SECONDS.
 
-    Structure example:
-    <div class="flex justify-between">
-        <div class="flex flex-col">
-            <p class="heading20_fe6KU">abdelrahman</p>
-            <p class="element14_McQXd">#GD7G-GAWP</p>  <!-- This is what we need -->
-        </div>
-    </div>
+    prune() runs at load and at the start of every cycle. Changes are written to disk at most
+    every SEEN_ORDERS_SAVE_INTERVAL_SECONDS; flush() writes whatever is left.
     """
-    # Method 1: Search for <p> element with class containing element14_ that starts with '#'
-    try:
-        # Look for <p> elements with element14_ in class within the card
-        # Filter by text starting with '#' (order key) vs date/time
-        key_elements = card.find_elements(By.XPATH, ".//p[contains(@class, 'element14_')]")
-        for key_element in key_elements:
+
+    def __init__(self, path: str = None, ttl_seconds: int = None) -> None:
+        self.path = path or SEEN_ORDERS_FILE
+        self.ttl_seconds = SEEN_ORDERS_TTL_SECONDS if ttl_seconds is None else ttl_seconds
+        self.entries: Dict[str, Dict] = {}
+        self._observed: Dict[str, Optional[str]] = {}
+        self._pending: Dict[str, bool] = {}
+        self._dirty = False
+        self._saved_at = time.monotonic()
+        # Deliveries run on the pipeline and sync threads too
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls) -> "SeenOrderIndex":
+        index = cls()
+        if os.path.exists(index.path):
+            try:
+                with open(index.path, "r", encoding="utf-8") as fp:
+                    payload = json.load(fp)
+                    if isinstance(payload, dict):
+                        index.entries = payload
+            except Exception as exc:
+                print(f"[WARN] Failed to load seen-order index: {exc}", flush=True)
+        index.prune()
+        print(f"[INFO] Loaded {len(index.entries)} seen order(s) from index", flush=True)
+        return index
+
+    def prune(self) -> int:
+        """
+        Forget entries older than the index TTL (orders leave the current-orders page quickly) and
+        drop payload snapshots past DIGEST_TTL_SECONDS, which no longer suppress or diff a delivery.
+        Returns the number of entries evicted.
+        """
+        now = time.time()
+        with self._lock:
+            expired = [key for key, entry in self.entries.items() if now - entry.get("synced_at", 0) > self.ttl_seconds]
+            for key in expired:
+                del self.entries[key]
+            stale_snapshots = [
+                entry for entry in self.entries.values()
+                if "payload" in entry and now - entry.get("synced_at", 0) >= DIGEST_TTL_SECONDS
+            ]
+            for entry in stale_snapshots:
+                del entry["payload"]
+            if expired or stale_snapshots:
+                self._dirty = True
+        return len(expired)
+
+    def observe(self, zyda_order_key: str, fingerprint: Optional[str]) -> None:
+        self._observed[zyda_order_key] = fingerprint
+
+    def note_response(self, zyda_order_key: str, data: Dict[str, object]) -> None:
+        """Remember whether the API still waits for this order's location (unknown = pending)."""
+        self._pending[zyda_order_key] = bool(data.get("pending_location", True))
+
+    def is_unchanged(self, zyda_order_key: str, fingerprint: Optional[str]) -> bool:
+        entry = self.entries.get(zyda_order_key)
+        if not fingerprint or entry is None or entry.get("fingerprint") != fingerprint:
+            return False
+        if entry.get("pending_location", True):
+            return time.time() - entry.get("synced_at", 0) < PENDING_REPOST_SECONDS
+        return True
+
+    def is_delivered(self, order_payload: Dict[str, object]) -> bool:
+        """
+        True if Laravel already has exactly this payload from a recent successful delivery and
+        has converted the order. Pending orders are always re-posted: each POST retries the
+        server's location lookup.
+        """
+        entry = self.entries.get(order_payload.get("zyda_order_key"))
+        return (
+            entry is not None
+            and entry.get("pending_location", True) is False
+            and entry.get("payload_hash") == _payload_hash(_build_api_payload(order_payload))
+            and time.time() - entry.get("synced_at", 0) < DIGEST_TTL_SECONDS
+        )
+
+    def suppress(self, order_payload: Dict[str, object]) -> bool:
+        """
+        is_delivered(), and if so store the card fingerprint observed this cycle so a card whose
+        list text changed without changing the payload is not re-opened every cycle.
+        """
+        if not self.is_delivered(order_payload):
+            return False
+        zyda_order_key = order_payload["zyda_order_key"]
+        with self._lock:
+            fingerprint = self._observed.pop(zyda_order_key, None)
+            entry = self.entries[zyda_order_key]
+            if fingerprint and entry.get("fingerprint") != fingerprint:
+                entry["fingerprint"] = fingerprint
+                self._changed()
+        return True
+
+    def snapshot(self, zyda_order_key: str) -> Optional[Dict[str, object]]:
+        """The payload last delivered for this order, if any."""
+        entry = self.entries.get(zyda_order_key)
+        return entry.get("payload") if entry else None
+
+    def mark_synced(self, zyda_order_key: str, order_payload: Dict[str, object]) -> None:
+        payload = _build_api_payload(order_payload)
+        with self._lock:
+            previous = self.entries.get(zyda_order_key) or {}
+            self.entries[zyda_order_key] = {
+                "fingerprint": self._observed.pop(zyda_order_key, previous.get("fingerprint")),
+                "payload_hash": _payload_hash(payload),
+                "payload": payload,
+                "pending_location": self._pending.pop(zyda_order_key, True),
+                "synced_at": int(time.time()),
+            }
+            self._changed()
+
+    def flush(self) -> None:
+        """Write pending changes to disk."""
+        with self._lock:
+            if self._dirty:
+                self.save()
+
+    def save(self) -> None:
+        """Write the index to disk; callers hold the lock."""
+        try:
+            with open(self.path, "w", encoding="utf-8") as fp:
+                json.dump(self.entries, fp, ensure_ascii=False, indent=2)
+            self._dirty = False
+        except Exception as exc:
+            print(f"[WARN] Failed to save seen-order index: {exc}", flush=True)
+        self._saved_at = time.monotonic()
+
+    def _changed(self) -> None:
+        self._dirty = True
+        if time.monotonic() - self._saved_at >= SEEN_ORDERS_SAVE_INTERVAL_SECONDS:
+            self.save()
+
+
+def _payload_hash(order_payload: Dict[str, object]) -> str:
+    canonical = json.dumps(order_payload, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def _reload_orders_list(driver) -> None:
+    driver.get(ORDERS_URL)
+    # Wait for orders to load after page reload (with shorter timeout)
+    wait_for_cards(driver, timeout=5)
+
+
+def _return_to_orders_list(driver, list_url: str, expected_cards: int) -> bool:
+    """
+    Close the opened order without reloading the SPA: go back in the app's history if opening
+    the card changed the route, otherwise close the details drawer. Returns True when the
+    orders list is usable again, False when the caller should fall back to a reload.
+    """
+    try:
+        if driver.current_url != list_url:
+            driver.back()
+        else:
+            for selector in ORDER_DETAILS_CLOSE_SELECTORS:
+                close_buttons = [b for b in driver.find_elements(By.CSS_SELECTOR, selector) if b.is_displayed()]
+                if close_buttons:
+                    driver.execute_script("arguments[0].click();", close_buttons[0])
+                    break
+            else:
+                driver.find_element(By.TAG_NAME, "body").send_keys(Keys.ESCAPE)
+
+        returned = _timed_wait("list-return", lambda: WebDriverWait(driver, 3).until(
+            lambda d: "/orders/current" in d.current_url
+            and not any(e.is_displayed() for e in d.find_elements(By.XPATH, PHONE_SELECTOR))
+            and len(d.find_elements(By.CSS_SELECTOR, ORDERS_CONTAINER_SELECTOR)) >= expected_cards
+        ))
+        if not returned:
+            print("[INFO] In-app return to orders list timed out, will reload", flush=True)
+        return returned
+    except Exception as exc:
+        print(f"[INFO] In-app return to orders list failed ({exc.__class__.__name__}), will reload", flush=True)
+        return False
+
+
+def _wait_for_dom(
+    driver,
+    name: str,
+    selectors: List[str],
+    timeout: float,
+    settle_ms: int = WAIT_SETTLE_MS,
+    empty_texts: Optional[List[str]] = None,
+):
+    """
+    Block until one of ``selectors`` (CSS, or XPath when it starts with "/" or "(") matches and
+    the DOM has settled, using an in-page MutationObserver. Returns ``{"selector", "count"}`` for
+    the first matching selector, or None on timeout. If none matches but the page text contains
+    one of ``empty_texts``, returns ``{"selector": None, "empty": text}`` instead. The latency is
+    recorded under ``name``.
+    """
+    started = time.perf_counter()
+    try:
+        driver.set_script_timeout(timeout + 2)
+        result = driver.execute_async_script(
+            DOM_WAIT_SCRIPT, selectors, int(timeout * 1000), settle_ms, empty_texts or []
+        )
+    except WebDriverException as exc:
+        print(f"[WARN] {name} wait failed: {exc.__class__.__name__}", flush=True)
+        result = None
+    wait_latencies.setdefault(name, []).append(time.perf_counter() - started)
+    if not isinstance(result, dict) or not (result.get("selector") or result.get("empty")):
+        return None
+    return result
+
+
+def _timed_wait(name: str, condition) -> bool:
+    """Run a WebDriverWait-style ``condition()`` and record its latency; False on timeout."""
+    started = time.perf_counter()
+    try:
+        condition()
+        return True
+    except TimeoutException:
+        return False
+    finally:
+        wait_latencies.setdefault(name, []).append(time.perf_counter() - started)
+
+
+def wait_for_cards(driver, timeout: float = 10):
+    """
+    Race every card selector, the login form and the empty-state texts; returns on the first one
+    seen. The result's "selector" is the card selector that matched (or EMAIL_INPUT_SELECTOR), and
+    "empty" is set instead when the page says there are no orders and no card renders within
+    EMPTY_CONFIRM_SECONDS after that.
+    """
+    result = _wait_for_dom(
+        driver, "cards", CARD_SELECTORS + [EMAIL_INPUT_SELECTOR], timeout, empty_texts=NO_ORDERS_INDICATORS
+    )
+    if result and result.get("empty"):
+        cards = _wait_for_dom(driver, "cards-empty-confirm", CARD_SELECTORS, EMPTY_CONFIRM_SECONDS)
+        if cards:
+            print(f"[INFO] Cards rendered after a transient '{result['empty']}' text", flush=True)
+            return cards
+    return result
+
+
+def _remember_card_selector(selector: str) -> None:
+    """Move the selector that found cards to the front so it wins the next race."""
+    if CARD_SELECTORS[0] != selector:
+        CARD_SELECTORS.remove(selector)
+        CARD_SELECTORS.insert(0, selector)
+        print(f"[INFO] Card selector {selector} will be tried first from now on", flush=True)
+
+
+def wait_for_details(driver, timeout: float = 5):
+    """Wait for an opened order's phone, address or totals block to render."""
+    return _wait_for_dom(
+        driver, "details", [PHONE_SELECTOR, ADDRESS_SELECTOR, TOTAL_CONTAINER_SELECTOR], timeout, settle_ms=50
+    )
+
+
+def _print_wait_latencies() -> None:
+    """Print per-wait latency for this cycle and reset the counters."""
+    if not wait_latencies:
+        return
+    parts = []
+    for name, times in wait_latencies.items():
+        parts.append(f"{name}: {len(times)} x avg {sum(times) / len(times):.2f}s, max {max(times):.2f}s")
+    print(f"[TIMING] Waits: {'; '.join(parts)}", flush=True)
+    wait_latencies.clear()
+
+
+def _print_order_timings(order_timings: List[tuple]) -> None:
+    if not order_timings:
+        return
+    total = sum(elapsed for _, elapsed in order_timings)
+    parts = []
+    for navigation in ("in-place", "reload"):
+        times = [elapsed for nav, elapsed in order_timings if nav == navigation]
+        if times:
+            parts.append(f"{navigation}: {len(times)} x {sum(times) / len(times):.2f}s")
+    print(
+        f"[INFO] Order timing: {len(order_timings)} order(s), avg {total / len(order_timings):.2f}s ({', '.join(parts)})",
+        flush=True,
+    )
+
+
+def _process_cards_parallel(
+    driver, wait: WebDriverWait, cards, detail_pool: "DetailTabPool", order_stats: Dict[str, int], deliver
+) -> List[Dict[str, object]]:
+    """Read every card's label/key from the list once, then extract details on the pool."""
+    total_cards = len(cards)
+    card_refs = _read_card_refs(driver, wait, cards)
+
+    print(
+        f"[STEP] Extracting {len(card_refs)} order(s) on {detail_pool.size} parallel tab(s)...",
+        flush=True,
+    )
+    started = time.perf_counter()
+    results = detail_pool.extract_all(driver, card_refs)
+    print(f"[INFO] Parallel extraction took {time.perf_counter() - started:.2f}s", flush=True)
+
+    scraped_orders: List[Dict[str, object]] = []
+    for (idx, card_label, zyda_order_key), details in zip(card_refs, results):
+        if details is None:
+            continue
+        if not details.get("phone"):
+            print(f"[WARN] Skipping order #{idx + 1} due to missing phone number.")
+            continue
+        order_payload = _build_order_payload(card_label, zyda_order_key, details)
+        deliver(order_payload, idx + 1, total_cards, order_stats)
+        scraped_orders.append(order_payload)
+
+    return scraped_orders
+
+
+def _process_cards_sharded(
+    driver, wait: WebDriverWait, cards, workers: int, order_stats: Dict[str, int], deliver
+) -> List[Dict[str, object]]:
+    """
+    Read the card list once and shard the order keys across worker processes.
+
+    Each worker runs its own Chrome and streams extracted orders back over a
+    queue; orders are delivered to the API as they arrive.
+    """
+    total_cards = len(cards)
+    card_refs = _read_card_refs(driver, wait, cards)
+    shards = [card_refs[i::workers] for i in range(workers)]
+    shards = [shard for shard in shards if shard]
+    cookies = driver.get_cookies()
+
+    print(f"[STEP] Sharding {len(card_refs)} order(s) across {len(shards)} worker process(es)...", flush=True)
+    started = time.perf_counter()
+    context = multiprocessing.get_context("spawn")
+    result_queue = context.Queue()
+    processes = {}
+    for worker_id, shard in enumerate(shards, 1):
+        process = context.Process(
+            target=_shard_worker,
+            args=(worker_id, shard, cookies, result_queue, EXTRACTION_MODE),
+            daemon=True,
+        )
+        process.start()
+        processes[worker_id] = process
+
+    payloads_by_idx: Dict[int, Dict[str, object]] = {}
+    worker_stats: Dict[int, Dict[str, object]] = {}
+    deadline = time.time() + SHARD_TIMEOUT_SECONDS
+    while len(worker_stats) < len(processes) and time.time() < deadline:
+        try:
+            message = result_queue.get(timeout=1)
+        except queue.Empty:
+            if not any(process.is_alive() for process in processes.values()):
+                break
+            continue
+
+        if message[0] == "order":
+            _, worker_id, idx, order_payload = message
+            payloads_by_idx[idx] = order_payload
+            deliver(order_payload, idx + 1, total_cards, order_stats)
+        elif message[0] == "done":
+            _, worker_id, stats = message
+            worker_stats[worker_id] = stats
+
+    for worker_id, process in processes.items():
+        process.join(timeout=5)
+        if process.is_alive():
+            print(f"[WARN] Worker {worker_id} did not finish in time, terminating...", flush=True)
+            process.terminate()
+        if worker_id not in worker_stats:
+            worker_stats[worker_id] = {"orders": 0, "skipped": 0, "failed": len(shards[worker_id - 1]), "seconds": None}
+
+    print(f"[INFO] Sharded extraction took {time.perf_counter() - started:.2f}s", flush=True)
+    summary_extras["workers"] = str(len(processes))
+    for worker_id in sorted(worker_stats):
+        stats = worker_stats[worker_id]
+        seconds = "crashed" if stats["seconds"] is None else f"{stats['seconds']}s"
+        print(
+            f"  - Worker {worker_id}: orders={stats['orders']} skipped={stats['skipped']} "
+            f"failed={stats['failed']} time={seconds}",
+            flush=True,
+        )
+        summary_extras[f"w{worker_id}"] = (
+            f"{stats['orders']}ok/{stats['skipped']}skip/{stats['failed']}fail/{seconds}"
+        )
+
+    return [payloads_by_idx[idx] for idx in sorted(payloads_by_idx)]
+
+
+def _shard_worker(
+    worker_id: int, card_refs, cookies: List[Dict], result_queue, extraction_mode: str = "dom"
+) -> None:
+    """Worker process entry point: extract one shard of orders with a dedicated Chrome."""
+    global EXTRACTION_MODE
+    EXTRACTION_MODE = extraction_mode
+    started = time.perf_counter()
+    stats: Dict[str, object] = {"orders": 0, "skipped": 0, "failed": 0, "seconds": None}
+    driver = None
+    try:
+        driver = _start_seeded_browser(cookies)
+        for card_ref in card_refs:
+            idx, card_label, zyda_order_key = card_ref
+            details = _extract_details_for_ref(driver, card_ref, f"worker {worker_id}")
+            if details is None:
+                stats["failed"] += 1
+                continue
+            if not details.get("phone"):
+                print(f"[WARN] Skipping order #{idx + 1} due to missing phone number.", flush=True)
+                stats["skipped"] += 1
+                continue
+            result_queue.put(("order", worker_id, idx, _build_order_payload(card_label, zyda_order_key, details)))
+            stats["orders"] += 1
+    except Exception as exc:
+        print(f"[ERROR] Worker {worker_id} failed: {exc}", flush=True)
+        stats["failed"] = len(card_refs) - stats["orders"] - stats["skipped"]
+    finally:
+        if driver is not None:
+            try:
+                driver.quit()
+            except Exception:
+                pass
+        stats["seconds"] = round(time.perf_counter() - started, 1)
+        result_queue.put(("done", worker_id, stats))
+
+
+def _read_card_list(driver, source=None) -> Optional[List[Dict]]:
+    """
+    Read every order card in one execute_script round trip.
+
+    `source` is a CSS selector or a list of card elements (defaults to ORDERS_CONTAINER_SELECTOR).
+    Returns [{"index", "label", "key", "fingerprint", "element"}, ...] in list order, or None
+    if the script failed and the caller should fall back to per-card WebDriver calls.
+    """
+    rows = _read_card_list_html(driver) if EXTRACTION_MODE == "html" else None
+    try:
+        if rows is None:
+            rows = driver.execute_script(
+                CARD_LIST_SCRIPT,
+                ORDERS_CONTAINER_SELECTOR if source is None else source,
+            )
+    except WebDriverException as exc:
+        print(f"[WARN] Bulk card extraction failed, using per-card lookups: {exc.__class__.__name__}", flush=True)
+        return None
+    if not isinstance(rows, list):
+        return None
+
+    occurrences: Dict[str, int] = {}
+    for row in rows:
+        row["label"] = row.get("label") or "[Card label not found]"
+        if not row.get("key"):
+            # Derived from the card's text fingerprint (numbered among identical cards) so the key
+            # stays the same on every re-read; a timestamp key would make the list walker see the
+            # card as unvisited again after each navigation
+            base = row.get("fingerprint") or f"i{row['index']}"
+            occurrences[base] = occurrences.get(base, 0) + 1
+            row["key"] = f"zyda_{base}_{occurrences[base]}"
+            print(f"[ERROR] No order key found (element14_* class), generated fallback: {row['key']}")
+    return rows
+
+
+def _read_card_list_html(driver) -> Optional[List[Dict]]:
+    """
+    Parse the card list from one page_source snapshot and pair the rows with the live card
+    elements by position. Returns None when the snapshot and the live list disagree.
+    """
+    try:
+        rows = parse_order_cards_html(driver.page_source)
+        elements = driver.find_elements(By.CSS_SELECTOR, ORDERS_CONTAINER_SELECTOR)
+    except WebDriverException as exc:
+        print(f"[WARN] HTML card parsing failed: {exc.__class__.__name__}", flush=True)
+        return None
+    if len(rows) != len(elements):
+        return None
+    for row, element in zip(rows, elements):
+        row["element"] = element
+    return rows
+
+
+def _read_card_refs(driver, wait: WebDriverWait, cards) -> List[tuple]:
+    """Return (idx, label, order key) for every card on the list page, without opening them."""
+    # Walk the whole list first so cards rendered further down are included
+    walker = OrderListWalker(driver)
+    card_refs = []
+    for position, row in enumerate(walker):
+        if _skip_unchanged_card(row["key"], row["fingerprint"]):
+            continue
+        if row["key"].startswith("zyda_"):
+            print(f"[WARN] Order #{position + 1} missing valid order key (got: {row['key']}), continuing anyway...")
+        card_refs.append((position, row["label"], row["key"]))
+    if walker.visited:
+        return card_refs
+
+    card_list = _read_card_list(driver, cards)
+    if card_list is not None:
+        card_refs = []
+        for row in card_list:
+            if _skip_unchanged_card(row["key"], row["fingerprint"]):
+                continue
+            if row["key"].startswith("zyda_"):
+                print(f"[WARN] Order #{row['index'] + 1} missing valid order key (got: {row['key']}), continuing anyway...")
+            card_refs.append((row["index"], row["label"], row["key"]))
+        return card_refs
+
+    card_refs = []
+    for idx, card in enumerate(cards):
+        try:
+            card_label = _get_card_label(driver, wait, card)
+            zyda_order_key = _get_zyda_order_key(driver, wait, card, idx)
+        except Exception as exc:
+            print(f"[ERROR] Error reading order card #{idx + 1}: {exc}")
+            continue
+        if not zyda_order_key or zyda_order_key.startswith("zyda_"):
+            print(f"[WARN] Order #{idx + 1} missing valid order key (got: {zyda_order_key}), continuing anyway...")
+        card_refs.append((idx, card_label, zyda_order_key))
+    return card_refs
+
+
+def _build_order_payload(card_label: str, zyda_order_key: str, details: dict) -> Dict[str, object]:
+    # Parse total amount from Zyda platform (exact amount as shown)
+    raw_total = details.get("total")
+    parsed_total = _parse_total_amount(raw_total)
+
+    # Convert items to structured format (JSON) with name, quantity, and actual price from Zyda
+    raw_items = details.get("items") or []
+    structured_items = []
+    for item_data in raw_items:
+        # item_data is now a dict: {"quantity": "2x", "name": "Burger", "price": 37.0}
+        if isinstance(item_data, dict):
+            quantity_str = item_data.get("quantity", "1x")
+            name = item_data.get("name", "")
+            price = item_data.get("price")  # Actual price from Zyda (or None)
+        else:
+            # Fallback for old format (tuple)
+            quantity_str, name = item_data
+            price = None
+
+        # Extract quantity number from string like "2x" -> 2
+        quantity = int(re.sub(r'[^\d]', '', quantity_str)) if quantity_str else 1
+
+        structured_items.append({
+            "name": name,
+            "quantity": quantity,
+            "price": price,  # Actual price from Zyda platform (preserve as is)
+        })
+
+    return {
+        "name": card_label,
+        "phone": details.get("phone"),
+        "address": details.get("address"),
+        "total_amount": parsed_total,  # Use exact amount from Zyda platform
+        "items": structured_items,  # Structured items with name, quantity, price
+        "zyda_order_key": zyda_order_key,  # Unique order identifier from Zyda (e.g., "#GD7G-GAWP")
+    }
+
+
+def _print_scraped_order(order_payload: Dict[str, object], order_num: int) -> None:
+    structured_items = order_payload["items"]
+
+    # Count unique items (by name) for items_count
+    unique_items = set()
+    for item in structured_items:
+        item_name = item.get("name", "").strip().lower()
+        if item_name:
+            unique_items.add(item_name)
+    items_count = len(unique_items) if unique_items else len(structured_items)
+
+    # Print order summary in green color
+    _print_order_summary(order_num, {
+        "name": order_payload["name"],
+        "phone": order_payload["phone"],
+        "address": order_payload.get("address") or "N/A",
+        "items_count": items_count,  # Count of unique items, not total quantities
+        "order_key": order_payload["zyda_order_key"],
+        "total": order_payload["total_amount"],
+    })
+
+
+def _deliver_scraped_order(
+    order_payload: Dict[str, object], order_num: int, total_cards: int, order_stats: Dict[str, int]
+) -> None:
+    _print_scraped_order(order_payload, order_num)
+
+    # Send order to API immediately after extraction
+    print(f"[STEP] Sending order #{order_num} to database immediately...", flush=True)
+    operation = _send_order_to_api(order_payload, order_num, total_cards)
+    delivery_coordinator.record(order_payload["zyda_order_key"], operation, order_payload)
+
+    # Track stats
+    if operation in order_stats:
+        order_stats[operation] += 1
+
+    if seen_orders is not None and operation not in ("failed", "suppressed"):
+        seen_orders.mark_synced(order_payload["zyda_order_key"], order_payload)
+
+    # Save processed phones periodically (every order to ensure no data loss)
+    save_processed_phones()
+
+
+def _deliver_scraped_batch(batch: List[tuple]) -> None:
+    """
+    Deliver a chunk of (order_payload, order_num, total_cards, order_stats) items with one
+    request to the bulk endpoint; orders it could not take are sent one by one.
+    """
+    for order_payload, order_num, _, _ in batch:
+        _print_scraped_order(order_payload, order_num)
+    order_stats = batch[0][3]
+    remaining = _sync_orders_batched([item[0] for item in batch], len(batch), order_stats)
+    remaining_ids = {id(order_payload) for order_payload in remaining}
+    for order_payload, order_num, total_cards, _ in batch:
+        if id(order_payload) in remaining_ids:
+            operation = _send_order_to_api(order_payload, order_num, total_cards)
+            delivery_coordinator.record(order_payload["zyda_order_key"], operation, order_payload)
+            order_stats[operation] += 1
+            if seen_orders is not None and operation not in ("failed", "suppressed"):
+                seen_orders.mark_synced(order_payload["zyda_order_key"], order_payload)
+    if remaining:
+        save_processed_phones()
+
+
+class DeliveryCoordinator:
+    """
+    Remembers which orders were already POSTed in the current cycle (by the outbox drain, the
+    scrape or sync_orders()), and with what result and payload, so the same payload is not sent
+    again in that cycle. Thread-safe.
+    """
+
+    def __init__(self) -> None:
+        self._results: Dict[str, tuple] = {}
+        self._lock = threading.Lock()
+
+    def reset(self) -> None:
+        """Forget the previous cycle's deliveries."""
+        with self._lock:
+            self._results.clear()
+
+    def record(self, zyda_order_key: Optional[str], operation: str, order: Optional[Dict[str, object]] = None) -> None:
+        if zyda_order_key:
+            payload_hash = _payload_hash(_build_api_payload(order)) if order is not None else None
+            with self._lock:
+                self._results[zyda_order_key] = (operation, payload_hash)
+
+    def result_for(self, zyda_order_key: Optional[str], order: Optional[Dict[str, object]] = None) -> Optional[str]:
+        """The result recorded for the order this cycle; with ``order``, only if that payload was the one sent."""
+        with self._lock:
+            operation, payload_hash = self._results.get(zyda_order_key or "", (None, None))
+        if operation is not None and order is not None and payload_hash is not None:
+            if payload_hash != _payload_hash(_build_api_payload(order)):
+                return None
+        return operation
+
+
+delivery_coordinator = DeliveryCoordinator()
+
+
+class DeliveryPipeline:
+    """
+    Bounded queue between order extraction and API delivery.
+
+    submit() has the same signature as _deliver_scraped_order() and hands the order to a
+    background sender thread; when the queue is full (API slower than scraping) it blocks,
+    which throttles the browser. With batch_size > 1 the sender collects that many orders and
+    delivers them through the bulk endpoint (the last, partial chunk on close()). With
+    senders > 1 that many threads deliver at once, which caps the requests in flight.
+    close() waits until every queued order is delivered.
+    Stats are only touched by the sender threads until close() returns.
+    """
+
+    _STOP = object()
+
+    def __init__(self, maxsize: int = 8, batch_size: int = 1, senders: int = 1) -> None:
+        self.queue: "queue.Queue" = queue.Queue(maxsize=maxsize)
+        self.batch_size = max(1, batch_size)
+        self.delivered = 0
+        self.blocked_puts = 0
+        self.blocked_seconds = 0.0
+        self._stats_lock = threading.Lock()
+        self._senders = [
+            threading.Thread(target=self._run, name=f"zyda-delivery-{n}", daemon=True)
+            for n in range(max(1, senders))
+        ]
+        for sender in self._senders:
+            sender.start()
+
+    def submit(
+        self, order_payload: Dict[str, object], order_num: int, total_cards: int, order_stats: Dict[str, int]
+    ) -> None:
+        item = (order_payload, order_num, total_cards, order_stats)
+        try:
+            self.queue.put_nowait(item)
+        except queue.Full:
+            started = time.perf_counter()
+            self.queue.put(item)
+            self.blocked_puts += 1
+            self.blocked_seconds += time.perf_counter() - started
+
+    def close(self) -> None:
+        """Flush the queue and stop the sender."""
+        pending = self.queue.qsize()
+        if pending:
+            print(f"[INFO] Waiting for {pending} queued order(s) to be delivered...", flush=True)
+        for _ in self._senders:
+            self.queue.put(self._STOP)
+        for sender in self._senders:
+            sender.join()
+        message = f"[INFO] Delivery pipeline: {self.delivered} order(s) delivered in the background"
+        if self.blocked_puts:
+            message += f", scraping waited {self.blocked_seconds:.1f}s on a full queue ({self.blocked_puts} time(s))"
+        print(message, flush=True)
+
+    def _run(self) -> None:
+        batch: List[tuple] = []
+        while True:
+            item = self.queue.get()
+            if item is not self._STOP:
+                batch.append(item)
+            if batch and (len(batch) >= self.batch_size or item is self._STOP):
+                self._deliver(batch)
+                batch = []
+            if item is self._STOP:
+                return
+
+    def _deliver(self, batch: List[tuple]) -> None:
+        # Each sender counts into its own dict and merges it into the cycle's stats under the lock
+        order_stats = batch[0][3]
+        counts = dict.fromkeys(order_stats, 0)
+        own_batch = [(order_payload, order_num, total, counts) for order_payload, order_num, total, _ in batch]
+        delivered = 0
+        try:
+            if self.batch_size > 1:
+                _deliver_scraped_batch(own_batch)
+            else:
+                _deliver_scraped_order(*own_batch[0])
+            delivered = len(batch)
+        except Exception as exc:
+            for _, order_num, _, _ in batch:
+                counts["failed"] += 1
+                print(f"[ERROR] Background delivery of order #{order_num} failed: {exc}", flush=True)
+        with self._stats_lock:
+            self.delivered += delivered
+            for operation, count in counts.items():
+                order_stats[operation] += count
+
+
+def _open_delivery_pipeline() -> Optional[DeliveryPipeline]:
+    """
+    Sender for a cycle's scraped orders: used with --delivery-queue, with --batch-size > 1 so
+    scraped orders reach the bulk endpoint in chunks, and with --sync-concurrency > 1 so that many
+    deliveries are in flight at once. None means deliver inline.
+    """
+    if DELIVERY_QUEUE_SIZE <= 0 and BATCH_SIZE <= 1 and SYNC_CONCURRENCY <= 1:
+        return None
+    return DeliveryPipeline(
+        max(DELIVERY_QUEUE_SIZE, BATCH_SIZE * SYNC_CONCURRENCY), batch_size=BATCH_SIZE, senders=SYNC_CONCURRENCY
+    )
+
+
+class DetailTabPool:
+    """
+    Pool of extra headless Chrome workers that share the main session's cookies.
+
+    Selenium serialises commands per WebDriver session, so parallel tabs of one
+    driver would still run one at a time; each worker therefore owns its own
+    driver and is used by exactly one thread at a time.
+    """
+
+    def __init__(self, size: int) -> None:
+        self.size = max(1, size)
+        self._drivers: List = []
+        self._idle: "queue.Queue" = queue.Queue()
+
+    def extract_all(self, main_driver, card_refs) -> List[Optional[dict]]:
+        """Extract details for every (idx, label, key) ref; results keep the list order."""
+        if not card_refs:
+            return []
+        self._ensure_workers(main_driver, min(self.size, len(card_refs)))
+        with ThreadPoolExecutor(max_workers=len(self._drivers)) as executor:
+            return list(executor.map(self._extract_one, card_refs))
+
+    def close(self) -> None:
+        for driver in self._drivers:
+            try:
+                driver.quit()
+            except Exception:
+                pass
+        if self._drivers:
+            print(f"[INFO] Closed {len(self._drivers)} detail tab worker(s)", flush=True)
+        self._drivers = []
+        self._idle = queue.Queue()
+
+    def _ensure_workers(self, main_driver, wanted: int) -> None:
+        cookies = main_driver.get_cookies()
+        while len(self._drivers) < wanted:
+            worker = _start_seeded_browser(cookies)
+            self._drivers.append(worker)
+            self._idle.put(worker)
+        print(f"[INFO] {len(self._drivers)} detail tab worker(s) ready", flush=True)
+
+    def _extract_one(self, card_ref) -> Optional[dict]:
+        worker = self._idle.get()
+        try:
+            return _extract_details_for_ref(worker, card_ref, "detail tab")
+        finally:
+            self._idle.put(worker)
+
+
+def _start_seeded_browser(cookies: List[Dict]):
+    """Start an extra Chrome that reuses the main browser's Zyda session cookies."""
+    driver = _start_browser()
+    try:
+        driver.get(SITE_URL)
+        for cookie in cookies:
+            try:
+                driver.add_cookie(cookie)
+            except Exception as e:
+                print(f"[WARN] Failed to add cookie to worker browser: {e}", flush=True)
+    except Exception:
+        driver.quit()
+        raise
+    return driver
+
+
+def _extract_details_for_ref(driver, card_ref, worker_name: str) -> Optional[dict]:
+    """Open the orders list in a worker browser, find the card by its key and extract its details."""
+    idx, _, zyda_order_key = card_ref
+    try:
+        worker_wait = WebDriverWait(driver, 10)
+        driver.get(ORDERS_URL)
+        worker_wait.until(
+            EC.presence_of_all_elements_located((By.CSS_SELECTOR, ORDERS_CONTAINER_SELECTOR))
+        )
+        details = _captured_details(driver, zyda_order_key)
+        if details:
+            return details
+        card = _find_card_by_key(driver, zyda_order_key, idx)
+        if card is None:
+            print(f"[WARN] Order #{idx + 1} ({zyda_order_key}) not found in {worker_name}, skipping...", flush=True)
+            return None
+        _open_order_card(driver, worker_wait, card)
+        return _extract_details(driver, worker_wait, zyda_order_key)
+    except Exception as exc:
+        print(f"[ERROR] Error processing order #{idx + 1} in {worker_name}: {exc}", flush=True)
+        return None
+
+
+def _find_card_by_key(driver, zyda_order_key: str, idx: int):
+    """Locate the list card showing the given order key, falling back to its list position."""
+    if zyda_order_key and zyda_order_key.startswith("#"):
+        # Scrolls down through a lazily rendered list until the key shows up
+        for row in OrderListWalker(driver):
+            if row["key"] == zyda_order_key:
+                return row["element"]
+    cards = driver.find_elements(By.CSS_SELECTOR, ORDERS_CONTAINER_SELECTOR)
+    if idx < len(cards):
+        return cards[idx]
+    return None
+
+
+def _get_zyda_order_key(driver, wait: WebDriverWait, card, idx: int = 0) -> str:
+    """
+    Extract unique order key from card using element14_* class pattern.
+    The value is the text content inside the <p> element with class element14_*.
+    Example: <p class="element14_McQXd">#GD7G-GAWP</p> -> returns "#GD7G-GAWP"
+    This is the unique identifier for each order from Zyda.
+
+    IMPORTANT: We look for text that starts with '#' to identify the order key
+    (not the date/time which also has element14_ class).
+
+    Structure example:
+    <div class="flex justify-between">
+        <div class="flex flex-col">
+            <p class="heading20_fe6KU">abdelrahman</p>
+            <p class="element14_McQXd">#GD7G-GAWP</p>  <!-- This is what we need -->
+        </div>
+    </div>
+    """
+    # Method 1: Search for <p> element with class containing element14_ that starts with '#'
+    try:
+        # Look for <p> elements with element14_ in class within the card
+        # Filter by text starting with '#' (order key) vs date/time
+        key_elements = card.find_elements(By.XPATH, ".//p[contains(@class, 'element14_')]")
+        for key_element in key_elements:
             # Get the text content (e.g., "#GD7G-GAWP")
             text_content = key_element.text.strip()
             # Only return if it starts with '#' (order key), not date/time
@@ -814,23 +2514,711 @@ def _open_order_card(driver, wait: WebDriverWait, card) -> None:
     except (ElementClickInterceptedException, StaleElementReferenceException):
         driver.execute_script("arguments[0].click();", card)
 
-    # Reduced wait time from default to 5 seconds for faster execution
-    short_wait = WebDriverWait(driver, 5)
-    short_wait.until(
-        EC.any_of(
-            EC.visibility_of_element_located((By.XPATH, PHONE_SELECTOR)),
-            EC.visibility_of_element_located((By.XPATH, ADDRESS_SELECTOR)),
-            EC.presence_of_element_located((By.XPATH, TOTAL_CONTAINER_SELECTOR)),
+    if not wait_for_details(driver, timeout=5):
+        raise TimeoutException("Order details did not render within 5s")
+
+
+def _extract_order_details(driver, wait: WebDriverWait) -> dict:
+    phone = _safe_text(wait, By.XPATH, PHONE_SELECTOR)
+    address = _safe_text(wait, By.XPATH, ADDRESS_SELECTOR)
+    total = _collect_total(driver)
+    items = _collect_items(driver)
+
+    return {
+        "phone": phone,
+        "address": address,
+        "total": total,
+        "items": items,
+    }
+
+
+def load_api_requests() -> List[Dict]:
+    """
+    Load the dashboard API requests recorded in network extraction mode: the list queries
+    (kind "list") and one detail request template (kind "detail").
+    """
+    if not os.path.exists(API_REQUESTS_FILE):
+        return []
+    try:
+        with open(API_REQUESTS_FILE, "r", encoding="utf-8") as fp:
+            payload = json.load(fp)
+    except Exception as exc:
+        print(f"[WARN] Failed to load recorded API requests: {exc}", flush=True)
+        return []
+    if not isinstance(payload, list):
+        return []
+    api_requests = []
+    for entry in payload:
+        if not isinstance(entry, dict) or not entry.get("url"):
+            continue
+        if "kind" not in entry:
+            # Files written before list and detail requests were told apart: keep only the list queries
+            if ORDER_KEY_IN_TEXT_PATTERN.search(f"{entry['url']} {entry.get('postData') or ''}"):
+                continue
+            entry = {**entry, "kind": "list"}
+        api_requests.append(entry)
+    return api_requests
+
+
+def save_api_requests(api_requests: List[Dict]) -> None:
+    try:
+        with open(API_REQUESTS_FILE, "w", encoding="utf-8") as fp:
+            json.dump(api_requests, fp, ensure_ascii=False, indent=2)
+        print(f"[INFO] Recorded {len(api_requests)} dashboard API request(s) for browserless mode", flush=True)
+    except Exception as exc:
+        print(f"[WARN] Failed to save recorded API requests: {exc}", flush=True)
+
+
+def fetch_orders_browserless() -> Optional[List[Dict[str, object]]]:
+    """
+    Fetch current orders without Chrome by replaying the dashboard's recorded API
+    requests with the saved session cookies.
+
+    Returns None when this is not possible (nothing recorded yet, session expired,
+    or the responses lack order details) so the caller can fall back to the browser.
+    """
+    started = time.perf_counter()
+    cookies = load_session_cookies()
+    api_requests = load_api_requests()
+    list_requests = [r for r in api_requests if r.get("kind") == "list"]
+    detail_request = next((r for r in api_requests if r.get("kind") == "detail"), None)
+    if not cookies or not list_requests:
+        print("[INFO] Browserless mode needs saved cookies and recorded API requests - using browser", flush=True)
+        return None
+
+    session = requests.Session()
+    for cookie in cookies:
+        session.cookies.set(
+            cookie["name"],
+            cookie["value"],
+            domain=cookie.get("domain"),
+            path=cookie.get("path", "/"),
         )
+
+    # The list queries name the current orders; entries the dashboard no longer answers are dropped
+    capture = NetworkCapture()
+    stale: List[Dict] = []
+    for api_request in list_requests:
+        outcome, data = _replay_api_request(session, api_request)
+        if outcome == "ok":
+            capture.index(data)
+        elif outcome == "stale":
+            stale.append(api_request)
+        else:
+            return None
+    if stale:
+        _forget_api_requests(stale)
+    if len(stale) == len(list_requests):
+        print("[INFO] No recorded order list query still works - using browser", flush=True)
+        return None
+
+    orders: List[Dict[str, object]] = []
+    for key in list(capture.orders):
+        details = _details_from_order_json(capture.orders[key])
+        if not details and detail_request is not None:
+            # The list entry is a summary; fetch this order's details with the recorded detail request
+            outcome, data = _replay_api_request(session, detail_request, key)
+            if outcome == "stale":
+                _forget_api_requests([detail_request])
+            if outcome != "ok":
+                return None
+            capture.index(data)
+            details = _details_from_order_json(capture.orders[key])
+        if not details:
+            print(f"[INFO] Order {key} has no details in the API response - using browser", flush=True)
+            return None
+        order = capture.orders[key]
+        card_label = _json_text(_find_json_value(order, JSON_NAME_FIELDS)) or "[Card label not found]"
+        orders.append(_build_order_payload(card_label, f"#{key}", details))
+
+    _persist_http_cookies(session, cookies)
+    print(
+        f"[SUCCESS] Fetched {len(orders)} order(s) without browser in "
+        f"{(time.perf_counter() - started) * 1000:.0f}ms",
+        flush=True,
     )
-    time.sleep(INTERACTION_DELAY)
 
+    order_stats = {"created": 0, "updated": 0, "skipped": 0, "failed": 0, "suppressed": 0}
+    pipeline = _open_delivery_pipeline()
+    deliver = pipeline.submit if pipeline is not None else _deliver_scraped_order
+    try:
+        for idx, order_payload in enumerate(orders, 1):
+            deliver(order_payload, idx, len(orders), order_stats)
+    finally:
+        if pipeline is not None:
+            pipeline.close()
+    _print_processing_summary(order_stats)
+    return orders
+
+
+def _replay_api_request(
+    session: requests.Session, api_request: Dict, order_key: Optional[str] = None
+) -> Tuple[str, object]:
+    """
+    Replay one recorded dashboard request (the detail template is filled with `order_key`).
+
+    Returns ("ok", json) or, with None, "stale" when the dashboard no longer accepts the request,
+    "session" when the saved login was rejected and "error" for transient failures.
+    """
+    url = api_request["url"]
+    data = api_request.get("postData")
+    if order_key is not None:
+        url = url.replace(ORDER_KEY_PLACEHOLDER, order_key)
+        data = data.replace(ORDER_KEY_PLACEHOLDER, order_key) if data else data
+    try:
+        response = session.request(
+            api_request.get("method", "GET"),
+            url,
+            headers=api_request.get("headers") or {},
+            data=data,
+            timeout=15,
+            allow_redirects=False,
+        )
+    except requests.exceptions.RequestException as exc:
+        print(f"[WARN] Browserless request to {url} failed: {exc}", flush=True)
+        return "error", None
+    if response.status_code in (401, 403) or response.is_redirect:
+        print(f"[INFO] Saved session rejected (HTTP {response.status_code}) - browser login required", flush=True)
+        return "session", None
+    if response.status_code >= 500:
+        print(f"[WARN] Browserless request to {url} answered HTTP {response.status_code}", flush=True)
+        return "error", None
+    try:
+        response.raise_for_status()
+        payload = response.json()
+        if isinstance(payload, dict) and payload.get("errors"):
+            raise ValueError(f"GraphQL errors: {payload['errors']}")
+    except Exception as exc:
+        print(f"[WARN] Dropping recorded request {url}: {exc}", flush=True)
+        return "stale", None
+    return "ok", payload
+
+
+def _forget_api_requests(stale: List[Dict]) -> None:
+    """Remove recorded requests that stopped working; network mode records fresh ones."""
+    stale_ids = {(r.get("kind"), r.get("url"), r.get("postData")) for r in stale}
+    save_api_requests(
+        [r for r in load_api_requests() if (r.get("kind"), r.get("url"), r.get("postData")) not in stale_ids]
+    )
+
+
+def _persist_http_cookies(session: requests.Session, saved_cookies: List[Dict]) -> None:
+    """Write back cookie values the server rotated during a browserless fetch."""
+    changed = False
+    for cookie in saved_cookies:
+        value = session.cookies.get(cookie["name"], domain=cookie.get("domain"))
+        if value and value != cookie["value"]:
+            cookie["value"] = value
+            changed = True
+    if not changed:
+        return
+    try:
+        with open(SESSION_COOKIES_FILE, "w", encoding="utf-8") as fp:
+            json.dump(saved_cookies, fp, indent=2)
+    except Exception as exc:
+        print(f"[WARN] Failed to save session cookies: {exc}", flush=True)
+
+
+def _extract_details(driver, wait: WebDriverWait, zyda_order_key: str) -> dict:
+    """Extract details of the opened order, from captured API JSON or saved HTML when enabled, else from the DOM."""
+    if EXTRACTION_MODE == "network":
+        details = _captured_details(driver, zyda_order_key)
+        if details:
+            return details
+        print(f"[INFO] No captured JSON for {zyda_order_key}, falling back to DOM extraction", flush=True)
+    if EXTRACTION_MODE == "html":
+        details = parse_order_details_html(driver.page_source)
+        if details and details.get("phone"):
+            return details
+        print(f"[INFO] No phone in page HTML for {zyda_order_key}, falling back to DOM extraction", flush=True)
+    details = _extract_order_details_script(driver)
+    if details is None:
+        return _extract_order_details(driver, wait)
+    return details
+
+
+def _extract_order_details_script(driver) -> Optional[dict]:
+    """
+    Extract phone, address, total and raw item rows with one execute_script call
+    (a second one only if the phone had not rendered yet). Items are parsed in Python.
+    Returns None if the script fails so the per-field WebDriver path can be used.
+    """
+    for attempt in range(2):
+        try:
+            result = driver.execute_script(
+                DETAIL_SCRIPT, PHONE_SELECTOR, ADDRESS_SELECTOR, ORDER_ITEM_SELECTOR
+            )
+        except WebDriverException as exc:
+            print(f"[WARN] Detail script failed, using per-field lookups: {exc.__class__.__name__}", flush=True)
+            return None
+        if not isinstance(result, dict) or result.get("version") != DETAIL_SCRIPT_VERSION:
+            print(f"[WARN] Unexpected detail script result, using per-field lookups", flush=True)
+            return None
+        if result.get("phone") or attempt:
+            break
+        if not _wait_for_dom(driver, "phone", [PHONE_SELECTOR], 3):
+            break
+
+    return {
+        "phone": result.get("phone"),
+        "address": result.get("address"),
+        "total": result.get("total"),
+        "items": _parse_item_rows(result.get("item_rows") or []),
+    }
+
+
+def _parse_html(page_html: str):
+    if lxml_html is None:
+        raise RuntimeError("lxml is required for HTML extraction. Please install: pip install lxml cssselect")
+    return lxml_html.document_fromstring(page_html)
+
+
+def _html_hidden(element) -> bool:
+    """True if the element or an ancestor is hidden by attribute or inline style."""
+    while element is not None:
+        style = (element.get("style") or "").replace(" ", "").lower()
+        if (
+            element.get("hidden") is not None
+            or element.get("aria-hidden") == "true"
+            or "display:none" in style
+            or "visibility:hidden" in style
+        ):
+            return True
+        element = element.getparent()
+    return False
+
+
+def _html_text(element) -> str:
+    """Approximate an element's innerText: whitespace-collapsed lines broken at block elements."""
+    parts: List[str] = []
+
+    def walk(node) -> None:
+        if not isinstance(node.tag, str) or node.tag in HTML_SKIP_TAGS:
+            return
+        block = node.tag in HTML_BLOCK_TAGS
+        if block:
+            parts.append("\n")
+        if node.text:
+            parts.append(node.text)
+        for child in node:
+            walk(child)
+            if child.tail:
+                parts.append(child.tail)
+        if block:
+            parts.append("\n")
+
+    walk(element)
+    lines = (" ".join(line.split()) for line in "".join(parts).split("\n"))
+    return "\n".join(line for line in lines if line)
+
+
+def _html_fingerprint(text: str) -> str:
+    """FNV-1a over UTF-16 code units, the same hash CARD_LIST_SCRIPT computes in the browser."""
+    value = 0x811C9DC5
+    data = text.encode("utf-16-le")
+    for i in range(0, len(data), 2):
+        value ^= data[i] | (data[i + 1] << 8)
+        value = (value * 0x01000193) & 0xFFFFFFFF
+    return f"{value:08x}"
+
+
+def parse_order_cards_html(page_html: str) -> List[Dict]:
+    """
+    Parse the orders list out of saved page HTML with lxml; mirrors CARD_LIST_SCRIPT.
+    Returns [{"index", "label", "key", "fingerprint"}, ...] in list order.
+    """
+    tree = _parse_html(page_html)
+    rows: List[Dict] = []
+    for index, card in enumerate(CSSSelector(ORDERS_CONTAINER_SELECTOR)(tree)):
+        text = _html_text(card)
+        label = None
+        for header in CSSSelector("p[class*='heading16_'], p[class*='heading14_']")(card):
+            label = " ".join(_html_text(header).split()) or None
+            break
+        if not label:
+            lines = text.splitlines()
+            label = lines[0] if lines else None
+        if not label and card.getparent() is not None:
+            for heading in CSSSelector("p[class*='heading']")(card.getparent()):
+                label = " ".join(_html_text(heading).split()) or None
+                if label:
+                    break
+
+        key = None
+        for key_element in CSSSelector(ZYDA_ORDER_KEY_SELECTOR)(card):
+            key_text = " ".join(_html_text(key_element).split())
+            if key_text.startswith("#"):
+                key = key_text
+                break
+        if not key:
+            key = card.get("id") or card.get("data-order-id") or card.get("data-id") or None
+
+        stable_text = " ".join(VOLATILE_TEXT_PATTERN.sub("", text).split())
+        rows.append({"index": index, "label": label, "key": key, "fingerprint": _html_fingerprint(stable_text)})
+    return rows
+
+
+def _html_first_visible_text(tree, xpath: str) -> Optional[str]:
+    for node in tree.xpath(xpath):
+        if not _html_hidden(node):
+            return _html_text(node) or None
+    return None
+
+
+def _html_total(tree) -> Optional[str]:
+    """Same lookup order as _collect_total() / DETAIL_SCRIPT, on the parsed tree."""
+
+    def is_amount(text: str) -> bool:
+        return "SAR" in text and any(ch.isdigit() for ch in text)
+
+    exact = tree.xpath("//p[contains(@class, 'heading16_2tUu6') and contains(text(), 'SAR')]")
+    if exact and is_amount(_html_text(exact[0])):
+        return _html_text(exact[0])
+    headings = tree.xpath("//p[contains(@class, 'heading16_') and contains(text(), 'SAR')]")
+    if headings and is_amount(_html_text(headings[-1])):
+        return _html_text(headings[-1])
+    for container in reversed(tree.xpath(TOTAL_CONTAINER_SELECTOR)):
+        for row in container.xpath(TOTAL_ROWS_SELECTOR):
+            labels = row.xpath(TOTAL_LABEL_SELECTOR)
+            values = row.xpath(TOTAL_VALUE_SELECTOR)
+            if labels and values:
+                label = _html_text(labels[0]).lower()
+                value = _html_text(values[-1])
+                if label and "subtotal" not in label and "total" in label and value:
+                    return value
+    total_labels = tree.xpath("//p[text()[contains(.,'Total')] and not(contains(.,'Subtotal'))]")
+    if total_labels:
+        siblings = total_labels[0].xpath("following::p[contains(text(),'SAR')][1]")
+        if siblings:
+            return _html_text(siblings[0])
+    return None
+
+
+def parse_order_details_html(page_html: str) -> dict:
+    """Parse an opened order out of saved page HTML with lxml; mirrors DETAIL_SCRIPT."""
+    tree = _parse_html(page_html)
+    return {
+        "phone": _html_first_visible_text(tree, PHONE_SELECTOR),
+        "address": _html_first_visible_text(tree, ADDRESS_SELECTOR),
+        "total": _html_total(tree),
+        "items": _parse_item_rows([_html_text(row) for row in CSSSelector(ORDER_ITEM_SELECTOR)(tree)]),
+    }
+
+
+def parse_saved_page(path: str) -> None:
+    """Parse a saved page (e.g. orders_page_source.html) offline and print what was found."""
+    with open(path, "r", encoding="utf-8") as fp:
+        page_html = fp.read()
+    started = time.perf_counter()
+    cards = parse_order_cards_html(page_html)
+    cards_elapsed = time.perf_counter() - started
+    started = time.perf_counter()
+    details = parse_order_details_html(page_html)
+    details_elapsed = time.perf_counter() - started
+    print(f"[INFO] Parsed {len(page_html) // 1024} KB from {path}", flush=True)
+    print(f"[TIMING] Cards: {cards_elapsed * 1000:.1f}ms, details: {details_elapsed * 1000:.1f}ms", flush=True)
+    print(f"[INFO] Found {len(cards)} order card(s)", flush=True)
+    for card in cards:
+        print(f"  - {card['key']}: {card['label']} ({card['fingerprint']})", flush=True)
+    print(f"[INFO] Details: {json.dumps(details, ensure_ascii=False)}", flush=True)
+
+
+def _captured_details(driver, zyda_order_key: str) -> Optional[dict]:
+    """Return order details built from the dashboard's captured API responses, if any."""
+    if EXTRACTION_MODE != "network":
+        return None
+    capture = _network_captures.get(driver)
+    if capture is None:
+        capture = NetworkCapture()
+        _network_captures[driver] = capture
+    capture.drain(driver)
+    details = capture.details_for(zyda_order_key)
+    if details:
+        print(f"[INFO] Order {zyda_order_key} extracted from captured API JSON", flush=True)
+    return details
+
+
+def _start_capture_cycle(driver) -> None:
+    """
+    Forget the orders captured in earlier cycles on the warm browser: their details are stale, and
+    serving them would keep changed cards from being re-opened. Events still waiting in the
+    performance log belong to the previous cycle too, so they are read first and dropped.
+    """
+    if EXTRACTION_MODE != "network":
+        return
+    capture = _network_captures.get(driver)
+    if capture is not None:
+        capture.drain(driver)
+    for capture in list(_network_captures.values()):
+        capture.orders.clear()
+
+
+def _pump_performance_log(driver) -> None:
+    """Read Chrome's performance log once and hand every network event to its consumers."""
+    try:
+        entries = driver.get_log("performance")
+    except Exception as exc:
+        print(f"[WARN] Performance log unavailable: {exc}", flush=True)
+        return
+
+    capture = _network_captures.get(driver)
+    for entry in entries:
+        try:
+            message = json.loads(entry["message"])["message"]
+        except Exception:
+            continue
+        method = message.get("method")
+        params = message.get("params") or {}
+        request_filter_stats.observe(method, params)
+        if capture is not None:
+            capture.handle(driver, method, params)
+
+
+class RequestFilterStats:
+    """Counts requests blocked by the URL blocklist versus requests actually loaded."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        self.blocked = 0
+        self.blocked_bytes_estimate = 0
+        self.loaded = 0
+        self.loaded_bytes = 0
+        self._types: Dict[str, str] = {}
+
+    def observe(self, method: str, params: Dict) -> None:
+        request_id = params.get("requestId")
+        with self._lock:
+            if method == "Network.requestWillBeSent":
+                self._types[request_id] = params.get("type") or ""
+            elif method == "Network.loadingFailed":
+                resource_type = params.get("type") or self._types.pop(request_id, "")
+                if params.get("blockedReason"):
+                    # Blocked requests never report a size, so use a typical size per resource type
+                    self.blocked += 1
+                    self.blocked_bytes_estimate += BLOCKED_BYTES_ESTIMATES.get(resource_type, 10_000)
+            elif method == "Network.loadingFinished":
+                self._types.pop(request_id, None)
+                self.loaded += 1
+                self.loaded_bytes += int(params.get("encodedDataLength") or 0)
+
+
+request_filter_stats = RequestFilterStats()
+
+
+def _apply_request_blocking(driver) -> None:
+    patterns = [
+        pattern
+        for pattern in BLOCKED_URL_PATTERNS
+        if not any(fnmatch.fnmatch(pattern, allowed) for allowed in ALLOWED_URL_PATTERNS)
+    ]
+    try:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
+        print(f"[INFO] Blocking {len(patterns)} URL pattern(s) (fonts, media, analytics, widgets)", flush=True)
+    except Exception as exc:
+        print(f"[WARN] Could not enable request blocking: {exc}", flush=True)
+
+
+def _report_request_filter(driver) -> None:
+    """Print how many requests/bytes the blocklist saved during this cycle, then reset the counters."""
+    if not REQUEST_BLOCKING:
+        return
+    _pump_performance_log(driver)
+    stats = request_filter_stats
+    print(
+        f"[INFO] Request filter: blocked {stats.blocked} request(s), ~{stats.blocked_bytes_estimate // 1024}KB saved; "
+        f"loaded {stats.loaded} request(s), {stats.loaded_bytes // 1024}KB",
+        flush=True,
+    )
+    summary_extras["blocked"] = f"{stats.blocked}req/{stats.blocked_bytes_estimate // 1024}KB"
+    stats.reset()
+
+
+class NetworkCapture:
+    """
+    Collects the Zyda dashboard's JSON API responses from Chrome's performance log
+    and indexes every order object found in them by its normalized order number.
+    """
+
+    def __init__(self) -> None:
+        self.orders: Dict[str, dict] = {}
+        self.responses = 0
+        self._pending: Dict[str, str] = {}
+        self._requests: Dict[str, Dict] = {}
+
+    def drain(self, driver) -> None:
+        _network_captures[driver] = self
+        _pump_performance_log(driver)
+
+    def handle(self, driver, method: str, params: Dict) -> None:
+        if method == "Network.requestWillBeSent":
+            request = params.get("request") or {}
+            if any(pattern in request.get("url", "") for pattern in CAPTURE_URL_PATTERNS):
+                self._requests[params.get("requestId")] = request
+        elif method == "Network.responseReceived":
+            response = params.get("response") or {}
+            url = response.get("url", "")
+            if "json" in (response.get("mimeType") or "") and any(
+                pattern in url for pattern in CAPTURE_URL_PATTERNS
+            ):
+                self._pending[params.get("requestId")] = url
+        elif method == "Network.loadingFinished" and params.get("requestId") in self._pending:
+            self._read_body(driver, params["requestId"])
+
+    def details_for(self, zyda_order_key: str) -> Optional[dict]:
+        order = self.orders.get(_normalize_order_key(zyda_order_key))
+        if order is None:
+            return None
+        return _details_from_order_json(order)
+
+    def _read_body(self, driver, request_id: str) -> None:
+        url = self._pending.pop(request_id, "")
+        try:
+            body = driver.execute_cdp_cmd("Network.getResponseBody", {"requestId": request_id})
+            text = body.get("body") or ""
+            if body.get("base64Encoded"):
+                text = base64.b64decode(text).decode("utf-8", errors="replace")
+            found: List[str] = []
+            self._index(json.loads(text), found)
+            self.responses += 1
+        except Exception as exc:
+            print(f"[WARN] Could not read captured response {url}: {exc}", flush=True)
+            return
+        request = self._requests.pop(request_id, None)
+        if found and request:
+            _record_api_request(request, found)
+
+    def index(self, data) -> int:
+        """Index every order object in a JSON response; returns how many orders it held."""
+        seen: List[str] = []
+        self._index(data, seen)
+        return len(seen)
+
+    def _index(self, node, seen: List[str]) -> None:
+        if isinstance(node, dict):
+            for field in ORDER_NUMBER_FIELDS:
+                value = node.get(field)
+                if isinstance(value, str) and ORDER_KEY_PATTERN.match(value.strip()):
+                    key = _normalize_order_key(value)
+                    # The detail response usually carries more fields than the list entry
+                    self.orders[key] = {**self.orders.get(key, {}), **node}
+                    seen.append(key)
+                    break
+            for value in node.values():
+                self._index(value, seen)
+        elif isinstance(node, list):
+            for value in node:
+                self._index(value, seen)
+
+
+def _record_api_request(request: Dict, order_keys: List[str]) -> None:
+    """
+    Remember a dashboard API request that returned orders so browserless mode can replay it.
+
+    A request naming one of the orders it returned is that order's detail request: it is kept
+    once, as a template with the order number replaced by ORDER_KEY_PLACEHOLDER. Any other
+    request is a list query; re-recording one refreshes its headers.
+    """
+    url = request.get("url") or ""
+    post_data = request.get("postData")
+    named = [key for key in set(order_keys) if key in f"{url} {post_data or ''}".upper()]
+    if len(named) > 1 or (named and len(set(order_keys)) > 1):
+        return
+    kind = "list"
+    if named:
+        kind = "detail"
+        key_pattern = re.compile(re.escape(named[0]), re.IGNORECASE)
+        url = key_pattern.sub(ORDER_KEY_PLACEHOLDER, url)
+        post_data = key_pattern.sub(ORDER_KEY_PLACEHOLDER, post_data) if post_data else post_data
+
+    entry = {
+        "kind": kind,
+        "method": request.get("method", "GET"),
+        "url": url,
+        "headers": {
+            name: value
+            for name, value in (request.get("headers") or {}).items()
+            if name.lower() not in ("cookie", "content-length", "host")
+        },
+        "postData": post_data,
+    }
+    recorded = load_api_requests()
+    if kind == "detail":
+        kept = [r for r in recorded if r.get("kind") != "detail"]
+    else:
+        kept = [r for r in recorded if (r.get("kind"), r.get("url"), r.get("postData")) != (kind, url, post_data)]
+    if entry in recorded and len(kept) == len(recorded) - 1:
+        return
+    save_api_requests(kept + [entry])
+
+
+def _normalize_order_key(value: Optional[str]) -> str:
+    return (value or "").strip().lstrip("#").upper()
+
+
+def _find_json_value(node, fields, max_depth: int = 4):
+    """Breadth-first search for the first non-empty value stored under any of `fields`."""
+    level = [node]
+    for _ in range(max_depth):
+        next_level = []
+        for current in level:
+            if isinstance(current, dict):
+                for field in fields:
+                    value = current.get(field)
+                    if value not in (None, "", [], {}):
+                        return value
+                next_level.extend(v for v in current.values() if isinstance(v, (dict, list)))
+            elif isinstance(current, list):
+                next_level.extend(v for v in current if isinstance(v, (dict, list)))
+        level = next_level
+    return None
+
+
+def _json_text(value) -> Optional[str]:
+    if isinstance(value, dict):
+        value = value.get("en") or value.get("ar") or next(iter(value.values()), None)
+    if value is None:
+        return None
+    text = str(value).strip()
+    return text or None
+
+
+def _details_from_order_json(order: dict) -> Optional[dict]:
+    """Map a captured order object onto the same dict shape _extract_order_details() returns."""
+    phone = _json_text(_find_json_value(order, JSON_PHONE_FIELDS))
+    if not phone:
+        return None
+
+    address_value = _find_json_value(order, JSON_ADDRESS_FIELDS)
+    if isinstance(address_value, dict):
+        parts = [_json_text(address_value.get(field)) for field in JSON_ADDRESS_PARTS]
+        address = ", ".join(part for part in parts if part) or None
+    else:
+        address = _json_text(address_value)
 
-def _extract_order_details(driver, wait: WebDriverWait) -> dict:
-    phone = _safe_text(wait, By.XPATH, PHONE_SELECTOR)
-    address = _safe_text(wait, By.XPATH, ADDRESS_SELECTOR)
-    total = _collect_total(driver)
-    items = _collect_items(driver)
+    total_value = _find_json_value(order, JSON_TOTAL_FIELDS)
+    if isinstance(total_value, dict):
+        total_value = total_value.get("amount") or total_value.get("value")
+    total = f"{total_value} SAR" if total_value is not None else None
+
+    items: List[dict] = []
+    raw_items = _find_json_value(order, JSON_ITEM_LIST_FIELDS)
+    for raw_item in raw_items if isinstance(raw_items, list) else []:
+        if not isinstance(raw_item, dict):
+            continue
+        name = _json_text(_find_json_value(raw_item, JSON_ITEM_NAME_FIELDS, max_depth=2))
+        if not name:
+            continue
+        quantity = raw_item.get("quantity") or raw_item.get("qty") or 1
+        price = _find_json_value(raw_item, JSON_ITEM_PRICE_FIELDS, max_depth=1)
+        try:
+            price = float(price) if price is not None else None
+        except (TypeError, ValueError):
+            price = None
+        items.append({"quantity": f"{quantity}x", "name": name, "price": price})
 
     return {
         "phone": phone,
@@ -927,14 +3315,16 @@ def _collect_items(driver) -> List[dict]:
     IMPORTANT: Extract exact prices as shown on Zyda platform.
     """
     rows = driver.find_elements(By.CSS_SELECTOR, ORDER_ITEM_SELECTOR)
+    return _parse_item_rows([row.text for row in rows])
+
+
+def _parse_item_rows(row_texts: List[str]) -> List[dict]:
+    """Parse the raw text of ORDER_ITEM_SELECTOR rows into item dicts."""
     items: List[dict] = []
     seen: set[tuple[str, str]] = set()
 
-    if not rows:
-        return items
-
-    for row_idx, row in enumerate(rows):
-        raw_text = row.text.strip()
+    for raw_text in row_texts:
+        raw_text = (raw_text or "").strip()
         if not raw_text:
             continue
 
@@ -1090,10 +3480,487 @@ def _parse_total_amount(value: Optional[str]) -> float:
         return 0.0
 
 
+class CircuitOpenError(requests.exceptions.RequestException):
+    """Raised instead of sending a request while the API circuit breaker is open."""
+
+    def __init__(self, retry_at: float) -> None:
+        super().__init__(f"API circuit open, next attempt in {max(retry_at - time.time(), 0):.0f}s")
+        self.retry_at = retry_at
+
+
+class OutboxBackoffError(requests.exceptions.RequestException):
+    """Raised instead of sending an order whose outbox row is still waiting out its retry backoff."""
+
+    def __init__(self, retry_at: float) -> None:
+        super().__init__(f"order is backing off in the outbox, next attempt in {max(retry_at - time.time(), 0):.0f}s")
+        self.retry_at = retry_at
+
+
+class CircuitBreaker:
+    """
+    Closed -> open after BREAKER_FAILURE_THRESHOLD consecutive failures (errors, 5xx, or slow
+    responses), or at once on 429. While open every request fails fast with CircuitOpenError.
+    After the cooldown (or the server's Retry-After) one half-open probe is let through: success
+    closes the circuit, failure re-opens it with a doubled cooldown.
+    """
+
+    def __init__(self) -> None:
+        self.state = "closed"
+        self.failures = 0
+        self.retry_at = 0.0
+        self.cooldown = BREAKER_COOLDOWN_SECONDS
+        self.short_circuited = 0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def before_request(self) -> None:
+        with self._lock:
+            if self.state == "closed":
+                return
+            if self.state == "open" and time.time() >= self.retry_at:
+                self.state = "half_open"
+                print("[INFO] API circuit half-open, sending a probe request", flush=True)
+            if self.state == "half_open" and not self._probing:
+                self._probing = True
+                return
+            self.short_circuited += 1
+            raise CircuitOpenError(max(self.retry_at, time.time() + 1))
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self.state != "closed":
+                print("[SUCCESS] API circuit closed, deliveries resumed", flush=True)
+            self.state = "closed"
+            self.failures = 0
+            self.cooldown = BREAKER_COOLDOWN_SECONDS
+            self._probing = False
+
+    def record_failure(self, reason: str, retry_after: Optional[float] = None) -> None:
+        with self._lock:
+            self.failures += 1
+            probe_failed = self.state == "half_open"
+            self._probing = False
+            if retry_after is None and not probe_failed and self.failures < BREAKER_FAILURE_THRESHOLD:
+                return
+            if probe_failed:
+                self.cooldown = min(self.cooldown * 2, BREAKER_COOLDOWN_MAX_SECONDS)
+            delay = retry_after if retry_after is not None else self.cooldown
+            self.retry_at = max(self.retry_at, time.time() + delay)
+            if self.state != "open":
+                print(f"[WARN] API circuit open for {delay:.0f}s after {reason}", flush=True)
+            self.state = "open"
+
+    def describe(self) -> str:
+        """State for the SUMMARY line, with the requests refused since the last call."""
+        with self._lock:
+            refused, self.short_circuited = self.short_circuited, 0
+            return f"{self.state}/{refused}" if refused else self.state
+
+
+def _retry_after_seconds(response: requests.Response) -> float:
+    """Seconds from a Retry-After header (delta-seconds or HTTP date), or the breaker cooldown."""
+    value = response.headers.get("Retry-After")
+    if value:
+        try:
+            return max(float(value), 0.0)
+        except ValueError:
+            pass
+        try:
+            return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+        except (TypeError, ValueError):
+            pass
+    return BREAKER_COOLDOWN_SECONDS
+
+
+class ApiClient:
+    """
+    Shared requests.Session for every Laravel API call: one keep-alive connection pool with
+    retries, so a cycle pays for one TCP+TLS handshake instead of one per order.
+    """
+
+    def __init__(self, pool_size: int = API_POOL_SIZE, retries: int = API_RETRIES) -> None:
+        retry = Retry(
+            total=retries,
+            connect=retries,
+            read=0,
+            status=0,
+            allowed_methods=frozenset({"GET", "POST", "PATCH"}),
+            backoff_factor=0.5,
+            raise_on_status=False,
+            respect_retry_after_header=False,
+        )
+        self.adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=retry)
+        self.session = requests.Session()
+        self.session.headers.update({"Accept": "application/json", "Connection": "keep-alive"})
+        self.session.mount("https://", self.adapter)
+        self.session.mount("http://", self.adapter)
+        self.breaker = CircuitBreaker()
+        self._reported = (0, 0)
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        kwargs.setdefault("timeout", API_TIMEOUT_SECONDS)
+        self.breaker.before_request()
+        started = time.monotonic()
+        failure = "an unexpected error"
+        try:
+            response = self.session.request(method, url, **kwargs)
+            failure = None
+        except requests.exceptions.RequestException as exc:
+            failure = type(exc).__name__
+            raise
+        finally:
+            # Every request that got past before_request() must report back, or a half-open
+            # probe would stay in flight forever
+            if failure is not None:
+                self.breaker.record_failure(failure)
+        elapsed = time.monotonic() - started
+        if response.status_code == 429:
+            self.breaker.record_failure("HTTP 429", retry_after=_retry_after_seconds(response))
+        elif response.status_code >= 500:
+            self.breaker.record_failure(f"HTTP {response.status_code}")
+        elif elapsed > API_SLOW_SECONDS:
+            self.breaker.record_failure(f"a {elapsed:.1f}s response")
+        else:
+            self.breaker.record_success()
+        return response
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request("POST", url, **kwargs)
+
+    def connection_counts(self) -> tuple:
+        """Return (connections opened, requests sent) over all pools since start-up."""
+        opened = sent = 0
+        pools = self.adapter.poolmanager.pools
+        for key in pools.keys():
+            pool = pools.get(key)
+            if pool is not None:
+                opened += pool.num_connections
+                sent += pool.num_requests
+        return opened, sent
+
+    def report_connections(self) -> None:
+        """Print connections opened vs reused since the last report."""
+        opened, sent = self.connection_counts()
+        new_opened = opened - self._reported[0]
+        new_sent = sent - self._reported[1]
+        self._reported = (opened, sent)
+        if new_sent:
+            print(
+                f"[INFO] API connections: {new_opened} opened, {max(new_sent - new_opened, 0)} reused "
+                f"for {new_sent} request(s)",
+                flush=True,
+            )
+
+    def close(self) -> None:
+        self.session.close()
+
+
+api_client = ApiClient(pool_size=max(API_POOL_SIZE, SYNC_CONCURRENCY))
+
+
+class OrderOutbox:
+    """
+    SQLite (WAL) outbox of order payloads sent to the Laravel API.
+
+    Rows are keyed by the hash of their payload (the endpoint upserts by zyda_order_key, so a
+    re-sent payload is harmless). A row stays "pending" until a 2xx response marks it "delivered";
+    failures are retried with exponential backoff, and rows that keep failing or get a 4xx become
+    "dead".
+    Enqueueing a new payload for an order marks its older pending rows "superseded".
+    Safe to share between the scrape, the delivery pipeline and sync threads.
+    """
+
+    def __init__(self, path: str = None) -> None:
+        self.path = path or OUTBOX_FILE
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, timeout=10, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS outbox (
+                payload_hash TEXT PRIMARY KEY,
+                zyda_order_key TEXT,
+                payload TEXT NOT NULL,
+                status TEXT NOT NULL DEFAULT 'pending',
+                attempts INTEGER NOT NULL DEFAULT 0,
+                next_attempt_at REAL NOT NULL,
+                last_error TEXT,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL
+            )
+            """
+        )
+        columns = [row[1] for row in self._db.execute("PRAGMA table_info(outbox)")]
+        if "idempotency_key" in columns:
+            # Outboxes created before the key column was renamed
+            self._db.execute("ALTER TABLE outbox RENAME COLUMN idempotency_key TO payload_hash")
+        self._db.execute("CREATE INDEX IF NOT EXISTS outbox_due ON outbox (status, next_attempt_at)")
+        self._db.execute(
+            "DELETE FROM outbox WHERE status != 'pending' AND updated_at < ?",
+            (time.time() - OUTBOX_RETENTION_SECONDS,),
+        )
+        self._db.commit()
+
+    @classmethod
+    def open(cls) -> Optional["OrderOutbox"]:
+        try:
+            instance = cls()
+        except sqlite3.Error as exc:
+            print(f"[WARN] Failed to open delivery outbox, sending without it: {exc}", flush=True)
+            return None
+        pending = instance.pending_count()
+        if pending:
+            print(f"[INFO] Outbox has {pending} undelivered order(s)", flush=True)
+        return instance
+
+    def enqueue(self, payload: Dict[str, object]) -> str:
+        """Store the payload (once per distinct payload) and return its key, the payload hash."""
+        key = _payload_hash(payload)
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT OR IGNORE INTO outbox "
+                "(payload_hash, zyda_order_key, payload, next_attempt_at, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, payload.get("zyda_order_key"), json.dumps(payload, ensure_ascii=False), now, now, now),
+            )
+            # Only the newest payload of an order may be retried; older pending versions are stale
+            self._db.execute(
+                "UPDATE outbox SET status = 'pending', updated_at = ? "
+                "WHERE payload_hash = ? AND status = 'superseded'",
+                (now, key),
+            )
+            self._db.execute(
+                "UPDATE outbox SET status = 'superseded', updated_at = ? "
+                "WHERE zyda_order_key = ? AND status = 'pending' AND payload_hash != ?",
+                (now, payload.get("zyda_order_key"), key),
+            )
+            self._db.commit()
+        return key
+
+    def record_response(self, key: str, response: requests.Response) -> str:
+        """Mark a row from the API response; returns "delivered", "failed" or "dead"."""
+        if response.ok:
+            self._update(key, "delivered", None, attempts_delta=1, next_attempt_at=0)
+            return "delivered"
+        error = f"HTTP {response.status_code}"
+        if 400 <= response.status_code < 500 and response.status_code not in (408, 429):
+            # The request itself is rejected; resending the same payload cannot succeed
+            self._update(key, "dead", error, attempts_delta=1, next_attempt_at=0)
+            return "dead"
+        return self.mark_failed(key, error)
+
+    def mark_failed(self, key: str, error: str) -> str:
+        """Schedule a retry with exponential backoff; returns "failed", or "dead" when out of attempts."""
+        with self._lock:
+            row = self._db.execute("SELECT attempts FROM outbox WHERE payload_hash = ?", (key,)).fetchone()
+        attempts = (row[0] if row else 0) + 1
+        if attempts >= OUTBOX_MAX_ATTEMPTS:
+            self._update(key, "dead", error, attempts_delta=1, next_attempt_at=0)
+            return "dead"
+        delay = min(OUTBOX_BACKOFF_SECONDS * 2 ** (attempts - 1), OUTBOX_BACKOFF_MAX_SECONDS)
+        self._update(key, "pending", error, attempts_delta=1, next_attempt_at=time.time() + delay)
+        return "failed"
+
+    def defer(self, key: str, retry_at: float, reason: str) -> None:
+        """Keep the row pending until ``retry_at`` without using up one of its attempts."""
+        self._update(key, "pending", reason, attempts_delta=0, next_attempt_at=retry_at)
+
+    def due(self, limit: Optional[int] = OUTBOX_DRAIN_LIMIT, force: bool = False) -> List[tuple]:
+        """Pending (key, payload) rows whose backoff has expired (all pending rows with force)."""
+        query = "SELECT payload_hash, payload FROM outbox WHERE status = 'pending'"
+        params: List[object] = []
+        if not force:
+            query += " AND next_attempt_at <= ?"
+            params.append(time.time())
+        query += " ORDER BY created_at"
+        if limit:
+            query += " LIMIT ?"
+            params.append(limit)
+        with self._lock:
+            return self._db.execute(query, params).fetchall()
+
+    def backoff_until(self, key: str) -> Optional[float]:
+        """Time of the next attempt while the pending row ``key`` waits out a retry backoff, else None."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT next_attempt_at FROM outbox "
+                "WHERE payload_hash = ? AND status = 'pending' AND next_attempt_at > ?",
+                (key, time.time()),
+            ).fetchone()
+        return row[0] if row else None
+
+    def pending_count(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM outbox WHERE status = 'pending'").fetchone()[0]
+
+    def drain(self, limit: Optional[int] = OUTBOX_DRAIN_LIMIT, force: bool = False) -> Dict[str, int]:
+        """
+        Re-send due rows; stops early if the API is unreachable. Results are recorded like
+        scraped deliveries, so the scrape and sync_orders() do not send those payloads again.
+        """
+        counts = {"delivered": 0, "failed": 0, "dead": 0}
+        rows = self.due(limit, force)
+        if not rows:
+            return counts
+        print(f"[STEP] Retrying {len(rows)} undelivered order(s) from the outbox...", flush=True)
+        for key, payload_json in rows:
+            payload = json.loads(payload_json)
+            try:
+                response = api_client.post(API_ENDPOINT, json=payload)
+            except CircuitOpenError as exc:
+                self.defer(key, exc.retry_at, str(exc))
+                print("[WARN] API circuit open, leaving the rest of the outbox for later", flush=True)
+                break
+            except requests.exceptions.RequestException as exc:
+                counts[self.mark_failed(key, str(exc))] += 1
+                _note_delivery(payload, None)
+                if isinstance(exc, (requests.exceptions.ConnectionError, requests.exceptions.Timeout)):
+                    print("[WARN] API still unreachable, leaving the rest of the outbox for later", flush=True)
+                    break
+                continue
+            if response.status_code == 429:
+                self.defer(key, api_client.breaker.retry_at, "HTTP 429")
+                counts["failed"] += 1
+            else:
+                counts[self.record_response(key, response)] += 1
+            _note_delivery(payload, response)
+        print(
+            f"[INFO] Outbox: {counts['delivered']} delivered, {counts['failed']} failed, "
+            f"{counts['dead']} given up, {self.pending_count()} still pending",
+            flush=True,
+        )
+        return counts
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+    def _update(self, key: str, status: str, error: Optional[str], attempts_delta: int, next_attempt_at: float) -> None:
+        with self._lock:
+            self._db.execute(
+                "UPDATE outbox SET status = ?, last_error = ?, attempts = attempts + ?, "
+                "next_attempt_at = ?, updated_at = ? WHERE payload_hash = ?",
+                (status, error, attempts_delta, next_attempt_at, time.time(), key),
+            )
+            self._db.commit()
+
+
+def _payload_delta(previous: Dict[str, object], payload: Dict[str, object]) -> Dict[str, object]:
+    """Fields of ``payload`` that differ from the previously delivered ``previous`` payload."""
+    return {
+        field: value
+        for field, value in payload.items()
+        if field != "zyda_order_key" and previous.get(field) != value
+    }
+
+
+def _patch_order(payload: Dict[str, object]) -> Optional[requests.Response]:
+    """
+    PATCH only the changed fields of an already delivered order to API_ENDPOINT/{key}.
+    Returns None when the full POST has to be sent instead (no snapshot, nothing to diff,
+    or the server rejected the delta).
+    """
+    global _delta_endpoint_missing
+
+    if not DELTA_UPDATES or _delta_endpoint_missing or seen_orders is None:
+        return None
+    zyda_order_key = str(payload["zyda_order_key"])
+    previous = seen_orders.snapshot(zyda_order_key)
+    if not previous:
+        return None
+    delta = _payload_delta(previous, payload)
+    if not delta:
+        return None
+
+    url = f"{API_ENDPOINT.rstrip('/')}/{quote(zyda_order_key, safe='')}"
+    response = api_client.request("PATCH", url, json=delta)
+    if response.status_code == 405:
+        print("[WARN] Delta endpoint not available (HTTP 405), sending full payloads", flush=True)
+        _delta_endpoint_missing = True
+        return None
+    if 400 <= response.status_code < 500 and response.status_code != 429:
+        print(
+            f"[INFO] Delta for {zyda_order_key} rejected (HTTP {response.status_code}), sending full payload",
+            flush=True,
+        )
+        return None
+    print(f"[INFO] Sent delta for {zyda_order_key}: {', '.join(sorted(delta))}", flush=True)
+    return response
+
+
+def _post_order(payload: Dict[str, object]) -> requests.Response:
+    """
+    Deliver one order payload, recording it in the outbox first when one is open. Orders that
+    were delivered before are PATCHed with their changed fields; everything else is POSTed
+    to API_ENDPOINT in full. A payload whose outbox row is waiting out a retry backoff is not
+    sent (OutboxBackoffError); the outbox drain re-sends it when it is due.
+    """
+    key = outbox.enqueue(payload) if outbox is not None else None
+    retry_at = outbox.backoff_until(key) if key else None
+    if retry_at is not None:
+        raise OutboxBackoffError(retry_at)
+    try:
+        response = _patch_order(payload)
+        if response is None:
+            response = api_client.post(API_ENDPOINT, json=payload)
+    except CircuitOpenError as exc:
+        if key:
+            outbox.defer(key, exc.retry_at, str(exc))
+        raise
+    except requests.exceptions.RequestException as exc:
+        if key:
+            outbox.mark_failed(key, str(exc))
+        raise
+    if key and response.status_code == 429:
+        outbox.defer(key, api_client.breaker.retry_at, "HTTP 429")
+    elif key:
+        outbox.record_response(key, response)
+    if seen_orders is not None and response.ok:
+        try:
+            data = response.json()
+        except ValueError:
+            data = {}
+        seen_orders.note_response(str(payload["zyda_order_key"]), data if isinstance(data, dict) else {})
+    return response
+
+
+def _sent_this_cycle(order: Dict[str, object], order_num: int) -> Optional[str]:
+    """Result of this exact payload if it was already sent this cycle (e.g. by the outbox drain)."""
+    operation = delivery_coordinator.result_for(order.get("zyda_order_key"), order)
+    if operation is not None:
+        print(
+            f"[INFO] Order #{order_num} already sent this cycle ({operation}), not sending again: "
+            f"{order.get('zyda_order_key')}",
+            flush=True,
+        )
+    return operation
+
+
+def _note_delivery(payload: Dict[str, object], response: Optional[requests.Response]) -> str:
+    """Record an outbox re-send in the cycle's delivery results and the seen-order index."""
+    data: Dict = {}
+    operation = "failed"
+    if response is not None and response.ok:
+        try:
+            data = response.json()
+        except ValueError:
+            data = {}
+        data = data if isinstance(data, dict) else {}
+        operation = _operation_from_response(data)
+    zyda_order_key = str(payload.get("zyda_order_key"))
+    delivery_coordinator.record(zyda_order_key, operation, payload)
+    if seen_orders is not None and operation != "failed":
+        seen_orders.note_response(zyda_order_key, data)
+        seen_orders.mark_synced(zyda_order_key, payload)
+    return operation
+
+
 def _send_order_to_api(order: Dict[str, object], order_num: int, total_orders: int) -> str:
     """
     Send a single order to the API immediately after extraction.
-    Returns: operation type ("created", "updated", "skipped", "failed")
+    Returns: operation type ("created", "updated", "skipped", "failed", "suppressed")
     """
     global processed_phones
 
@@ -1109,20 +3976,21 @@ def _send_order_to_api(order: Dict[str, object], order_num: int, total_orders: i
 
     was_processed = phone in processed_phones
 
-    payload = {
-        "name": order.get("name") or None,
-        "phone": phone,
-        "address": order.get("address") or None,
-        "items": order.get("items", []) or [],
-        "total_amount": order.get("total_amount", 0) or 0,
-        "zyda_order_key": zyda_order_key,
-    }
+    sent = _sent_this_cycle(order, order_num)
+    if sent is not None:
+        return sent
+
+    if seen_orders is not None and seen_orders.suppress(order):
+        print(f"[INFO] Order #{order_num} unchanged since its last delivery, not sending: {zyda_order_key}", flush=True)
+        return "suppressed"
+
+    payload = _build_api_payload(order)
 
     print(f"[STEP] Sending order #{order_num}/{total_orders} to API: Key={zyda_order_key}, Phone={phone}", flush=True)
 
     try:
         print(f"[DEBUG] Sending POST request to: {API_ENDPOINT}", flush=True)
-        response = requests.post(API_ENDPOINT, json=payload, timeout=30)
+        response = _post_order(payload)
         print(f"[INFO] Response Status: {response.status_code}", flush=True)
 
         # Log response content for debugging
@@ -1134,25 +4002,23 @@ def _send_order_to_api(order: Dict[str, object], order_num: int, total_orders: i
 
         response.raise_for_status()
         data = response.json()
-        operation = (data.get("operation") or data.get("message", "created")).lower()
+        operation = _operation_from_response(data)
         print(f"[DEBUG] Operation from API: {operation}", flush=True)
 
-        if operation == "created" or "created" in operation or "نجاح" in str(data.get("message", "")):
+        if operation == "created":
             print(f"[SUCCESS] Order #{order_num} created: {zyda_order_key}", flush=True)
             if not was_processed:
                 processed_phones.add(phone)
-            return "created"
-        elif operation == "skipped" or "exists" in operation or "موجود" in str(data.get("message", "")):
+        elif operation == "skipped":
             print(f"[INFO] Order #{order_num} already exists (skipped): {zyda_order_key}", flush=True)
-            return "skipped"
-        elif operation == "updated" or "updated" in operation:
+        elif operation == "updated":
             print(f"[INFO] Order #{order_num} updated: {zyda_order_key}", flush=True)
-            return "updated"
         else:
-            print(f"[INFO] Order #{order_num} processed (assumed created): {zyda_order_key}", flush=True)
-            if not was_processed:
-                processed_phones.add(phone)
-            return "created"
+            print(f"[ERROR] API reported order #{order_num} as failed: {zyda_order_key}", flush=True)
+        return operation
+    except OutboxBackoffError as exc:
+        print(f"[INFO] Order #{order_num} not sent: {exc}", flush=True)
+        return "failed"
     except requests.exceptions.Timeout:
         error_msg = f"Timeout while syncing order {phone} (Key: {zyda_order_key})"
         print(f"[ERROR] {error_msg}", flush=True)
@@ -1191,125 +4057,256 @@ def _send_order_to_api(order: Dict[str, object], order_num: int, total_orders: i
         return "failed"
 
 
-def sync_orders(orders: List[Dict[str, object]]) -> Dict[str, int]:
-    global processed_phones
+def _operation_from_response(data: Dict[str, object]) -> str:
+    """Map an API response body (or one batch result) to created/updated/skipped/failed."""
+    operation = str(data.get("operation") or data.get("message", "created")).lower()
+    message = str(data.get("message", ""))
+    if operation == "created" or "created" in operation or "نجاح" in message:
+        return "created"
+    if operation == "skipped" or "exists" in operation or "موجود" in message:
+        return "skipped"
+    if operation == "updated" or "updated" in operation:
+        return "updated"
+    if operation == "failed":
+        return "failed"
+    # Default to created if operation is unclear but response is successful
+    return "created"
 
-    print(f"[STEP] Starting to sync {len(orders)} order(s) to Laravel API...", flush=True)
-    print(f"[INFO] API Endpoint: {API_ENDPOINT}", flush=True)
 
-    stats = {
-        "total": len(orders),
-        "created": 0,
-        "updated": 0,
-        "skipped": 0,
-        "failed": 0,
+def _build_api_payload(order: Dict[str, object]) -> Dict[str, object]:
+    return {
+        "name": order.get("name") or None,
+        "phone": order.get("phone"),
+        "address": order.get("address") or None,
+        "items": order.get("items", []) or [],
+        "total_amount": order.get("total_amount", 0) or 0,
+        "zyda_order_key": order.get("zyda_order_key"),
     }
 
-    changed = False
 
+def _sync_orders_batched(
+    orders: List[Dict[str, object]], batch_size: int, stats: Dict[str, int]
+) -> List[Dict[str, object]]:
+    """
+    Post orders to API_BATCH_ENDPOINT in chunks of ``batch_size`` and count the per-order results.
+    Returns the orders that still need single POSTs (a failed chunk, or all remaining orders
+    when the bulk endpoint does not exist).
+    """
+    global _batch_endpoint_missing
+
+    sendable = []
     for idx, order in enumerate(orders, 1):
-        phone = order.get("phone")
-        if not phone:
+        if not order.get("phone") or not order.get("zyda_order_key"):
             stats["skipped"] += 1
-            print(f"[WARN] Skipping order #{idx} - No phone number", flush=True)
+            print(f"[WARN] Skipping order #{idx} - No phone number or zyda_order_key", flush=True)
             continue
+        sent = _sent_this_cycle(order, idx)
+        if sent is not None:
+            stats[sent] += 1
+        elif seen_orders is not None and seen_orders.suppress(order):
+            stats["suppressed"] += 1
+            delivery_coordinator.record(order["zyda_order_key"], "suppressed", order)
+        elif outbox is not None and outbox.backoff_until(_payload_hash(_build_api_payload(order))):
+            stats["failed"] += 1
+            delivery_coordinator.record(order["zyda_order_key"], "failed", order)
+            print(f"[INFO] Order {order['zyda_order_key']} is waiting out its outbox backoff, not sending", flush=True)
+        else:
+            sendable.append(order)
 
-        zyda_order_key = order.get("zyda_order_key")
-        if not zyda_order_key:
-            stats["skipped"] += 1
-            print(f"[WARN] Skipping order #{idx} - No zyda_order_key: Phone={phone}", flush=True)
-            continue
+    for start in range(0, len(sendable), batch_size):
+        chunk = sendable[start:start + batch_size]
+        if _batch_endpoint_missing:
+            return sendable[start:]
 
-        # Check if phone was processed before, but still send to allow updates
-        was_processed = phone in processed_phones
+        print(f"[STEP] Sending batch of {len(chunk)} order(s) to {API_BATCH_ENDPOINT}...", flush=True)
+        payloads = [_build_api_payload(order) for order in chunk]
+        keys = [outbox.enqueue(payload) for payload in payloads] if outbox is not None else []
+        try:
+            response = api_client.post(API_BATCH_ENDPOINT, json={"orders": payloads})
+            if response.status_code in (404, 405):
+                print(
+                    f"[WARN] Bulk endpoint not available (HTTP {response.status_code}), using single POSTs",
+                    flush=True,
+                )
+                _batch_endpoint_missing = True
+                return sendable[start:]
+            response.raise_for_status()
+            results = response.json().get("results")
+            if not isinstance(results, list) or len(results) != len(chunk):
+                raise ValueError("batch response does not hold one result per order")
+        except (requests.exceptions.RequestException, ValueError) as exc:
+            print(f"[WARN] Batch request failed ({exc}), retrying its orders one by one", flush=True)
+            return sendable[start:]
+
+        for position, (order, result) in enumerate(zip(chunk, results)):
+            operation = _operation_from_response(result if isinstance(result, dict) else {})
+            if keys and operation == "failed":
+                message = result.get("message") if isinstance(result, dict) else None
+                outbox.mark_failed(keys[position], str(message or "batch result failed"))
+            elif keys:
+                outbox.record_response(keys[position], response)
+            stats[operation] += 1
+            delivery_coordinator.record(order["zyda_order_key"], operation, order)
+            print(f"[INFO] Order {order['zyda_order_key']}: {operation}", flush=True)
+            if operation == "created" and order["phone"] not in processed_phones:
+                processed_phones.add(order["phone"])
+            if seen_orders is not None and operation != "failed":
+                seen_orders.note_response(order["zyda_order_key"], result if isinstance(result, dict) else {})
+                seen_orders.mark_synced(order["zyda_order_key"], order)
+
+    save_processed_phones()
+    return []
+
+
+def _sync_single_order(idx: int, total_orders: int, order: Dict[str, object]) -> tuple:
+    """
+    POST one order to the API. Returns (operation, responded): operation is created/updated/
+    skipped/failed/suppressed, responded is True when the API accepted the order.
+    Safe to run from worker threads; stats and processed_phones are updated by the caller.
+    """
+    phone = order.get("phone")
+    if not phone:
+        print(f"[WARN] Skipping order #{idx} - No phone number", flush=True)
+        return "skipped", False
 
-        payload = {
-            "name": order.get("name") or None,
-            "phone": phone,
-            "address": order.get("address") or None,
-            "items": order.get("items", []) or [],
-            "total_amount": order.get("total_amount", 0) or 0,
-            "zyda_order_key": zyda_order_key,
-        }
+    zyda_order_key = order.get("zyda_order_key")
+    if not zyda_order_key:
+        print(f"[WARN] Skipping order #{idx} - No zyda_order_key: Phone={phone}", flush=True)
+        return "skipped", False
 
-        # Debug: Print payload (without sensitive data)
-        print(f"[DEBUG] Payload for order #{idx}: Key={zyda_order_key}, Phone={phone}, Total={payload['total_amount']}, Items={len(payload['items'])}", flush=True)
+    if seen_orders is not None and seen_orders.suppress(order):
+        print(f"[INFO] Order #{idx} unchanged since its last delivery, not sending: {zyda_order_key}", flush=True)
+        return "suppressed", False
 
-        print(f"[STEP] Sending order #{idx}/{len(orders)}: Key={zyda_order_key}, Phone={phone}", flush=True)
-        print(f"[DEBUG] API Endpoint: {API_ENDPOINT}", flush=True)
-        print(f"[DEBUG] Payload keys: {list(payload.keys())}", flush=True)
+    payload = _build_api_payload(order)
 
-        try:
-            print(f"[INFO] Making POST request to {API_ENDPOINT}...", flush=True)
-            response = requests.post(API_ENDPOINT, json=payload, timeout=30)  # Reduced from 60 to 30 seconds
-            print(f"[INFO] Response received: Status {response.status_code}", flush=True)
+    # Debug: Print payload (without sensitive data)
+    print(f"[DEBUG] Payload for order #{idx}: Key={zyda_order_key}, Phone={phone}, Total={payload['total_amount']}, Items={len(payload['items'])}", flush=True)
 
-            print(f"[INFO] Response Status: {response.status_code}", flush=True)
+    print(f"[STEP] Sending order #{idx}/{total_orders}: Key={zyda_order_key}, Phone={phone}", flush=True)
+    print(f"[DEBUG] API Endpoint: {API_ENDPOINT}", flush=True)
+    print(f"[DEBUG] Payload keys: {list(payload.keys())}", flush=True)
 
-            response.raise_for_status()
-            data = response.json()
-            operation = (data.get("operation") or data.get("message", "created")).lower()
+    try:
+        print(f"[INFO] Making POST request to {API_ENDPOINT}...", flush=True)
+        response = _post_order(payload)
+        print(f"[INFO] Response received: Status {response.status_code}", flush=True)
 
-            print(f"[INFO] Operation: {operation}, Response: {data}", flush=True)
+        print(f"[INFO] Response Status: {response.status_code}", flush=True)
 
-            if operation == "created" or "created" in operation or "نجاح" in str(data.get("message", "")):
-                stats["created"] += 1
-                print(f"[SUCCESS] Order #{idx} created: {zyda_order_key}", flush=True)
-            elif operation == "skipped" or "exists" in operation or "موجود" in str(data.get("message", "")):
-                stats["skipped"] += 1
-                print(f"[INFO] Order #{idx} already exists (skipped): {zyda_order_key}", flush=True)
-            elif operation == "updated" or "updated" in operation:
-                stats["updated"] += 1
-                print(f"[INFO] Order #{idx} updated: {zyda_order_key}", flush=True)
-            else:
-                # Default to created if operation is unclear but response is successful
-                stats["created"] += 1
-                print(f"[INFO] Order #{idx} processed (assumed created): {zyda_order_key}", flush=True)
+        response.raise_for_status()
+        data = response.json()
+        operation = _operation_from_response(data)
 
-            # Only mark as processed if it was a new order (created)
-            # This allows updates for existing orders on subsequent runs
-            if not was_processed:
-                processed_phones.add(phone)
-                changed = True
-            elif operation == "updated" or "updated" in operation:
-                # If order was updated, also save the processed phones to track changes
-                changed = True
-        except requests.exceptions.Timeout:
-            stats["failed"] += 1
-            error_msg = f"Timeout while syncing order {phone} (Key: {zyda_order_key})"
-            print(f"[ERROR] {error_msg}", flush=True)
-        except requests.exceptions.ConnectionError as exc:
-            stats["failed"] += 1
-            error_msg = f"Connection error while syncing order {phone} (Key: {zyda_order_key}): {exc}"
-            print(f"[ERROR] {error_msg}", flush=True)
-        except requests.exceptions.HTTPError as exc:
-            stats["failed"] += 1
-            error_msg = f"HTTP error while syncing order {phone} (Key: {zyda_order_key}): {exc}"
-            if hasattr(exc, 'response') and exc.response is not None:
-                try:
-                    error_text = exc.response.text[:500]
-                    error_msg += f" (HTTP {exc.response.status_code}: {error_text})"
-                    print(f"[ERROR] Response text: {error_text}", flush=True)
-                    print(f"[ERROR] Response headers: {dict(exc.response.headers)}", flush=True)
-                except:
-                    pass
-            print(f"[ERROR] {error_msg}", flush=True)
-        except requests.exceptions.RequestException as exc:
-            stats["failed"] += 1
-            error_msg = f"Failed to sync order {phone} (Key: {zyda_order_key}): {exc}"
-            if hasattr(exc, 'response') and exc.response is not None:
-                try:
-                    error_text = exc.response.text[:500]
-                    error_msg += f" (HTTP {exc.response.status_code}: {error_text})"
-                    print(f"[ERROR] Response text: {error_text}", flush=True)
-                except:
-                    pass
-            print(f"[ERROR] {error_msg}", flush=True)
-        except Exception as exc:
-            stats["failed"] += 1
-            import traceback
-            print(f"[ERROR] Unexpected error syncing order {phone} (Key: {zyda_order_key}): {exc}", flush=True)
-            print(f"[ERROR] Traceback: {traceback.format_exc()}", flush=True)
+        print(f"[INFO] Operation: {operation}, Response: {data}", flush=True)
+
+        if operation == "created":
+            print(f"[SUCCESS] Order #{idx} created: {zyda_order_key}", flush=True)
+        elif operation == "skipped":
+            print(f"[INFO] Order #{idx} already exists (skipped): {zyda_order_key}", flush=True)
+        elif operation == "updated":
+            print(f"[INFO] Order #{idx} updated: {zyda_order_key}", flush=True)
+        else:
+            print(f"[ERROR] API reported order #{idx} as failed: {zyda_order_key}", flush=True)
+        return operation, operation != "failed"
+    except OutboxBackoffError as exc:
+        print(f"[INFO] Order #{idx} not sent: {exc}", flush=True)
+    except requests.exceptions.Timeout:
+        error_msg = f"Timeout while syncing order {phone} (Key: {zyda_order_key})"
+        print(f"[ERROR] {error_msg}", flush=True)
+    except requests.exceptions.ConnectionError as exc:
+        error_msg = f"Connection error while syncing order {phone} (Key: {zyda_order_key}): {exc}"
+        print(f"[ERROR] {error_msg}", flush=True)
+    except requests.exceptions.HTTPError as exc:
+        error_msg = f"HTTP error while syncing order {phone} (Key: {zyda_order_key}): {exc}"
+        if hasattr(exc, 'response') and exc.response is not None:
+            try:
+                error_text = exc.response.text[:500]
+                error_msg += f" (HTTP {exc.response.status_code}: {error_text})"
+                print(f"[ERROR] Response text: {error_text}", flush=True)
+                print(f"[ERROR] Response headers: {dict(exc.response.headers)}", flush=True)
+            except:
+                pass
+        print(f"[ERROR] {error_msg}", flush=True)
+    except requests.exceptions.RequestException as exc:
+        error_msg = f"Failed to sync order {phone} (Key: {zyda_order_key}): {exc}"
+        if hasattr(exc, 'response') and exc.response is not None:
+            try:
+                error_text = exc.response.text[:500]
+                error_msg += f" (HTTP {exc.response.status_code}: {error_text})"
+                print(f"[ERROR] Response text: {error_text}", flush=True)
+            except:
+                pass
+        print(f"[ERROR] {error_msg}", flush=True)
+    except Exception as exc:
+        import traceback
+        print(f"[ERROR] Unexpected error syncing order {phone} (Key: {zyda_order_key}): {exc}", flush=True)
+        print(f"[ERROR] Traceback: {traceback.format_exc()}", flush=True)
+    return "failed", False
+
+
+def sync_orders(
+    orders: List[Dict[str, object]], batch_size: Optional[int] = None, concurrency: Optional[int] = None
+) -> Dict[str, int]:
+    global processed_phones
+
+    print(f"[STEP] Starting to sync {len(orders)} order(s) to Laravel API...", flush=True)
+    print(f"[INFO] API Endpoint: {API_ENDPOINT}", flush=True)
+
+    stats = {
+        "total": len(orders),
+        "created": 0,
+        "updated": 0,
+        "skipped": 0,
+        "failed": 0,
+        "suppressed": 0,
+    }
+
+    changed = False
+
+    # Orders already sent during scraping only count their recorded result; failed ones are
+    # retried by the outbox with backoff, not re-sent in this cycle
+    pending = []
+    for order in orders:
+        operation = delivery_coordinator.result_for(order.get("zyda_order_key"), order)
+        if operation is not None:
+            stats[operation] += 1
+        else:
+            pending.append(order)
+    if len(pending) < len(orders):
+        print(f"[INFO] {len(orders) - len(pending)} order(s) already sent this cycle, not sending again", flush=True)
+    orders = pending
+
+    batch_size = BATCH_SIZE if batch_size is None else batch_size
+    if batch_size > 1:
+        orders = _sync_orders_batched(orders, batch_size, stats)
+
+    concurrency = SYNC_CONCURRENCY if concurrency is None else concurrency
+    jobs = [(idx, len(orders), order) for idx, order in enumerate(orders, 1)]
+    if concurrency > 1 and len(jobs) > 1:
+        # Up to `concurrency` POSTs in flight; results come back in order for the accounting below
+        print(f"[INFO] Syncing with up to {concurrency} request(s) in flight", flush=True)
+        with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="sync") as executor:
+            outcomes = list(executor.map(lambda job: _sync_single_order(*job), jobs))
+    else:
+        outcomes = (_sync_single_order(*job) for job in jobs)
+
+    for order, (operation, responded) in zip(orders, outcomes):
+        stats[operation] += 1
+        delivery_coordinator.record(order.get("zyda_order_key"), operation, order)
+        if not responded:
+            continue
+        if seen_orders is not None and operation != "failed":
+            seen_orders.mark_synced(order["zyda_order_key"], order)
+        # Only mark as processed if it was a new order (created)
+        # This allows updates for existing orders on subsequent runs
+        phone = order.get("phone")
+        if phone not in processed_phones:
+            processed_phones.add(phone)
+            changed = True
+        elif operation == "updated":
+            # If order was updated, also save the processed phones to track changes
+            changed = True
 
     if changed:
         save_processed_phones()
@@ -1322,60 +4319,104 @@ def sync_orders(orders: List[Dict[str, object]]) -> Dict[str, int]:
     print(f"  - Updated: {stats['updated']}", flush=True)
     print(f"  - Skipped: {stats['skipped']}", flush=True)
     print(f"  - Failed: {stats['failed']}", flush=True)
+    print(f"  - Suppressed (unchanged): {stats['suppressed']}", flush=True)
+    api_client.report_connections()
 
-    print(
-        "SUMMARY created={created} updated={updated} skipped={skipped} failed={failed}".format(
-            created=stats["created"],
-            updated=stats["updated"],
-            skipped=stats["skipped"],
-            failed=stats["failed"],
-        ),
-        flush=True
-    )
+    _print_summary_line(stats)
 
     return stats
 
 
+def _print_summary_line(stats: Dict[str, int]) -> None:
+    """
+    Print the machine-readable SUMMARY line parsed by ZydaScriptRunner::parseSummary().
+    Extra fields from summary_extras are appended after `failed=` so the PHP regex keeps matching.
+    Orders delivered by the order watcher since the previous SUMMARY line are counted here too.
+    """
+    stats = dict(stats)
+    for operation, count in pushed_order_stats.items():
+        stats[operation] = stats.get(operation, 0) + count
+    pushed_order_stats.clear()
+    line = "SUMMARY created={created} updated={updated} skipped={skipped} failed={failed} suppressed={suppressed}".format(
+        created=stats.get("created", 0),
+        updated=stats.get("updated", 0),
+        skipped=stats.get("skipped", 0),
+        failed=stats.get("failed", 0),
+        suppressed=stats.get("suppressed", 0),
+    )
+    for key, value in summary_extras.items():
+        line += f" {key}={value}"
+    line += f" breaker={api_client.breaker.describe()}"
+    print(line, flush=True)
+
+
+def _handle_sigterm(signum, frame) -> None:
+    """Turn SIGTERM into SystemExit so finally blocks flush queued orders and close Chrome."""
+    print("[INFO] SIGTERM received, finishing queued deliveries and shutting down...", flush=True)
+    raise SystemExit(128 + signum)
+
+
 def main_loop() -> None:
-    global processed_phones
+    global processed_phones, seen_orders, outbox
     print("[INFO] Starting Zyda scraper (continuous loop mode)...")
     processed_phones = load_processed_phones()
+    seen_orders = SeenOrderIndex.load()
+    outbox = OrderOutbox.open() if OUTBOX_ENABLED else None
 
     print(f"[INFO] Loaded {len(processed_phones)} processed phone(s).")
 
+    # Keep one Chrome and one logged-in orders tab alive across cycles
+    browser = BrowserSession()
+
     cycle_count = 0
-    while True:
-        cycle_count += 1
-        start_time = time.time()
-        print(f"\n{'='*60}")
-        print(f"[CYCLE] Starting cycle #{cycle_count}")
-        print(f"{'='*60}")
-        try:
-            orders = scrape_orders()
-            if orders:
-                sync_orders(orders)
+    try:
+        while True:
+            cycle_count += 1
+            start_time = time.time()
+            summary_extras.clear()
+            delivery_coordinator.reset()
+            if seen_orders is not None:
+                seen_orders.prune()
+            print(f"\n{'='*60}")
+            print(f"[CYCLE] Starting cycle #{cycle_count}")
+            print(f"{'='*60}")
+            try:
+                if outbox is not None:
+                    outbox.drain()
+                orders = scrape_orders(browser)
+                if orders:
+                    sync_orders(orders)
+                else:
+                    print("[WARN] No orders found in this cycle.")
+                    _print_summary_line({"created": 0, "updated": 0, "skipped": 0, "failed": 0})
+            except KeyboardInterrupt:
+                print("[INFO] Scraper stopped by user.")
+                break
+            except Exception as exc:
+                error_msg = f"Scraper cycle failed: {exc}"
+                print(f"[ERROR] {error_msg}")
+                import traceback
+                print(f"[ERROR] Traceback: {traceback.format_exc()}")
+                _print_summary_line({"created": 0, "updated": 0, "skipped": 0, "failed": 1})
+            if seen_orders is not None:
+                seen_orders.flush()
+
+            elapsed = time.time() - start_time
+            sleep_for = max(LOOP_INTERVAL_SECONDS - elapsed, min(LOOP_INTERVAL_SECONDS, 10))
+            print(f"[INFO] Cycle #{cycle_count} completed in {int(elapsed)} second(s).")
+            if PUSH_DETECTION:
+                watch_for_new_orders(browser, sleep_for)
             else:
-                print("[WARN] No orders found in this cycle.")
-                print("SUMMARY created=0 updated=0 skipped=0 failed=0")
-        except KeyboardInterrupt:
-            print("[INFO] Scraper stopped by user.")
-            break
-        except Exception as exc:
-            error_msg = f"Scraper cycle failed: {exc}"
-            print(f"[ERROR] {error_msg}")
-            import traceback
-            print(f"[ERROR] Traceback: {traceback.format_exc()}")
-            print("SUMMARY created=0 updated=0 skipped=0 failed=1")
-
-        elapsed = time.time() - start_time
-        sleep_for = max(LOOP_INTERVAL_SECONDS - elapsed, 10)
-        print(f"[INFO] Cycle #{cycle_count} completed in {int(elapsed)} second(s).")
-        print(f"[INFO] Sleeping for {int(sleep_for)} second(s) before next cycle.")
-        time.sleep(sleep_for)
+                print(f"[INFO] Sleeping for {int(sleep_for)} second(s) before next cycle.")
+                time.sleep(sleep_for)
+    finally:
+        if seen_orders is not None:
+            seen_orders.flush()
+        browser.close()
 
 
 def run_once() -> Dict[str, int]:
-    global processed_phones
+    global processed_phones, seen_orders, outbox
     print("[INFO] Starting Zyda scraper (single run)...", flush=True)
     print(f"[INFO] API Endpoint: {API_ENDPOINT}", flush=True)
     print(f"[INFO] Python version: {sys.version}", flush=True)
@@ -1390,7 +4431,7 @@ def run_once() -> Dict[str, int]:
         print(f"[INFO] Selenium version: {selenium.__version__}", flush=True)
     except ImportError:
         print("[ERROR] Selenium module not found. Please install: pip install selenium", flush=True)
-        print("SUMMARY created=0 updated=0 skipped=0 failed=1", flush=True)
+        _print_summary_line({"created": 0, "updated": 0, "skipped": 0, "failed": 1})
         return {"total": 0, "created": 0, "updated": 0, "skipped": 0, "failed": 1}
 
     try:
@@ -1398,13 +4439,18 @@ def run_once() -> Dict[str, int]:
         print(f"[INFO] Requests version: {requests.__version__}", flush=True)
     except ImportError:
         print("[ERROR] Requests module not found. Please install: pip install requests", flush=True)
-        print("SUMMARY created=0 updated=0 skipped=0 failed=1", flush=True)
+        _print_summary_line({"created": 0, "updated": 0, "skipped": 0, "failed": 1})
         return {"total": 0, "created": 0, "updated": 0, "skipped": 0, "failed": 1}
 
     processed_phones = load_processed_phones()
+    seen_orders = SeenOrderIndex.load()
+    outbox = OrderOutbox.open() if OUTBOX_ENABLED else None
     print(f"[INFO] Loaded {len(processed_phones)} processed phone(s).", flush=True)
 
     try:
+        delivery_coordinator.reset()
+        if outbox is not None:
+            outbox.drain()
         print("[STEP] Starting to scrape orders from Zyda dashboard...", flush=True)
         orders = scrape_orders()
         print(f"[INFO] Scraped {len(orders) if orders else 0} order(s) from Zyda", flush=True)
@@ -1414,7 +4460,7 @@ def run_once() -> Dict[str, int]:
             return sync_orders(orders)
         else:
             print("[WARN] No orders found in this run.", flush=True)
-            print("SUMMARY created=0 updated=0 skipped=0 failed=0", flush=True)
+            _print_summary_line({"created": 0, "updated": 0, "skipped": 0, "failed": 0})
             return {"total": 0, "created": 0, "updated": 0, "skipped": 0, "failed": 0}
     except KeyboardInterrupt:
         print("[INFO] Scraper interrupted by user.", flush=True)
@@ -1438,14 +4484,123 @@ def run_once() -> Dict[str, int]:
         elif "login" in str(exc).lower() or "authentication" in str(exc).lower():
             print("[ERROR] Login/Authentication error detected. Check Zyda credentials.", flush=True)
 
-        print("SUMMARY created=0 updated=0 skipped=0 failed=1", flush=True)
+        _print_summary_line({"created": 0, "updated": 0, "skipped": 0, "failed": 1})
         return {"total": 0, "created": 0, "updated": 0, "skipped": 0, "failed": 1}
+    finally:
+        if seen_orders is not None:
+            seen_orders.flush()
 
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Sync Zyda orders into Laravel")
     parser.add_argument("--loop", action="store_true", help="Run continuously every minute")
+    parser.add_argument(
+        "--detail-concurrency",
+        type=int,
+        default=DETAIL_CONCURRENCY,
+        help="Open order details on N parallel browser workers (default: 1, sequential)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=SHARD_WORKERS,
+        help="Shard order extraction across K worker processes, each with its own Chrome (default: 1)",
+    )
+    parser.add_argument(
+        "--extraction",
+        choices=("dom", "network", "html"),
+        default=EXTRACTION_MODE,
+        help=(
+            "Read orders from the rendered page (dom), from the dashboard's captured API JSON (network), "
+            "or by parsing the page HTML in-process with lxml (html)"
+        ),
+    )
+    parser.add_argument(
+        "--parse-html",
+        metavar="FILE",
+        help="Parse a saved page (e.g. orders_page_source.html) offline, print the result and exit",
+    )
+    parser.add_argument(
+        "--fetch",
+        choices=("browser", "http"),
+        default=FETCH_MODE,
+        help="Use Chrome for every cycle (browser) or replay recorded dashboard API calls without Chrome (http)",
+    )
+    parser.add_argument(
+        "--interval",
+        type=int,
+        default=LOOP_INTERVAL_SECONDS,
+        help="Seconds between cycles in --loop mode (default: 60)",
+    )
+    parser.add_argument(
+        "--navigation",
+        choices=("in-place", "reload"),
+        default=NAVIGATION_MODE,
+        help="Return to the orders list by closing the order in the app (in-place) or by reloading it",
+    )
+    parser.add_argument(
+        "--full-sweep",
+        action="store_true",
+        default=FULL_SWEEP,
+        help="Open every order card, ignoring the index of orders already synced",
+    )
+    parser.add_argument(
+        "--push",
+        action="store_true",
+        default=PUSH_DETECTION,
+        help="With --loop, watch the orders tab between sweeps and sync new orders immediately",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=BATCH_SIZE,
+        help="Deliver scraped orders in chunks of this size through the bulk endpoint (1 = one POST per order)",
+    )
+    parser.add_argument(
+        "--sync-concurrency",
+        type=int,
+        default=SYNC_CONCURRENCY,
+        help="Maximum number of order POSTs in flight at once (default: 1)",
+    )
+    parser.add_argument(
+        "--delivery-queue",
+        type=int,
+        default=DELIVERY_QUEUE_SIZE,
+        help="Deliver scraped orders from a background sender through a queue of this size (0 = inline)",
+    )
+    parser.add_argument(
+        "--drain-outbox",
+        action="store_true",
+        help="Re-send every undelivered order in the outbox (ignoring backoff) and exit",
+    )
     args = parser.parse_args()
+    DELIVERY_QUEUE_SIZE = max(0, args.delivery_queue)
+    BATCH_SIZE = max(1, args.batch_size)
+    SYNC_CONCURRENCY = max(1, args.sync_concurrency)
+    if SYNC_CONCURRENCY > API_POOL_SIZE:
+        api_client = ApiClient(pool_size=SYNC_CONCURRENCY)
+    PUSH_DETECTION = args.push
+    FULL_SWEEP = args.full_sweep
+    EXTRACTION_MODE = args.extraction
+    NAVIGATION_MODE = args.navigation
+    FETCH_MODE = args.fetch
+    if FETCH_MODE == "http":
+        # Browser fallback cycles record the API requests that browserless cycles replay
+        EXTRACTION_MODE = "network"
+    LOOP_INTERVAL_SECONDS = max(1, args.interval)
+    DETAIL_CONCURRENCY = max(1, args.detail_concurrency)
+    SHARD_WORKERS = max(1, args.workers)
+
+    signal.signal(signal.SIGTERM, _handle_sigterm)
+
+    if args.drain_outbox:
+        drain_outbox = OrderOutbox.open()
+        counts = drain_outbox.drain(limit=None, force=True) if drain_outbox is not None else {"failed": 1}
+        sys.exit(1 if counts["failed"] else 0)
+
+    if args.parse_html:
+        parse_saved_page(args.parse_html)
+        sys.exit(0)
 
     try:
         if args.loop:
@@ -0,0 +1,35 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import scrap_zyda  # noqa: E402
+from stub_api import StubApi  # noqa: E402
+
+
+@pytest.fixture
+def api(monkeypatch, tmp_path):
+    """Point the scraper's delivery code at a local StubApi, with no files outside tmp_path."""
+    stub = StubApi().start()
+    monkeypatch.setattr(scrap_zyda, "API_ENDPOINT", stub.endpoint)
+    monkeypatch.setattr(scrap_zyda, "API_BATCH_ENDPOINT", stub.endpoint + "/batch")
+    monkeypatch.setattr(scrap_zyda, "api_client", scrap_zyda.ApiClient(retries=0))
+    monkeypatch.setattr(scrap_zyda, "PROCESSED_PHONES_FILE", str(tmp_path / "processed.json"))
+    monkeypatch.setattr(scrap_zyda, "processed_phones", set())
+    monkeypatch.setattr(scrap_zyda, "seen_orders", None)
+    monkeypatch.setattr(scrap_zyda, "outbox", None)
+    monkeypatch.setattr(scrap_zyda, "_batch_endpoint_missing", False)
+    monkeypatch.setattr(scrap_zyda, "delivery_coordinator", scrap_zyda.DeliveryCoordinator())
+    yield stub
+    scrap_zyda.api_client.close()
+    stub.stop()
+
+
+def make_orders(count, prefix="K"):
+    return [
+        {"zyda_order_key": f"#{prefix}{i}", "phone": f"05000000{i:02d}", "name": f"Customer {i}", "total_amount": 10 + i}
+        for i in range(count)
+    ]
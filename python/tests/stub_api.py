@@ -0,0 +1,109 @@
+"""
+Local stand-in for the Laravel Zyda orders API, for tests that exercise the scraper's delivery code.
+
+Mimics POST /api/zyda/orders, POST /api/zyda/orders/batch and PATCH /api/zyda/orders/{key}:
+every new zyda_order_key is "created", a key seen before is "skipped". Set ``batch_status`` to
+404/405 to simulate a server without the bulk endpoint (or 500 for a failing one), and
+``responses`` to queue raw (status, headers, body) answers for the next requests. ``delay`` holds
+every answer back that many seconds; ``max_in_flight`` records how many requests overlapped.
+"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+
+
+class StubApi:
+    def __init__(self) -> None:
+        self.requests: List[Tuple[str, str, object]] = []
+        self.orders: Dict[str, Dict] = {}
+        self.batch_status: Optional[int] = None
+        self.responses: List[Tuple[int, Dict[str, str], Dict]] = []
+        self.delay = 0.0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def endpoint(self) -> str:
+        return f"http://127.0.0.1:{self._server.server_port}/api/zyda/orders"
+
+    def start(self) -> "StubApi":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def calls(self, method: str, path_suffix: str = "") -> List[object]:
+        """Bodies of the requests made with ``method`` to a path ending in ``path_suffix``."""
+        return [body for m, path, body in self.requests if m == method and path.endswith(path_suffix)]
+
+    def _store(self, order: Dict) -> Dict:
+        key = str(order.get("zyda_order_key"))
+        if key in self.orders:
+            return {"success": True, "operation": "skipped", "pending_location": False}
+        self.orders[key] = dict(order)
+        return {"success": True, "operation": "created", "pending_location": True}
+
+    def _answer(self, method: str, path: str, body: Dict) -> Tuple[int, Dict[str, str], Dict]:
+        with self._lock:
+            self.requests.append((method, path, body))
+            if self.responses:
+                return self.responses.pop(0)
+            if method == "POST" and path.endswith("/batch"):
+                if self.batch_status:
+                    return self.batch_status, {}, {"message": "stub batch status"}
+                results = []
+                for order in body.get("orders", []):
+                    result = self._store(order)
+                    result["zyda_order_key"] = order.get("zyda_order_key")
+                    results.append(result)
+                return 200, {}, {"success": True, "results": results}
+            if method == "POST":
+                return 200, {}, self._store(body)
+            if method == "PATCH":
+                key = path.rsplit("/", 1)[-1].replace("%23", "#")
+                if key not in self.orders:
+                    return 404, {}, {"success": False, "operation": "failed"}
+                self.orders[key].update(body)
+                return 200, {}, {"success": True, "operation": "updated", "pending_location": True}
+            return 405, {}, {}
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def _handle(self) -> None:
+                length = int(self.headers.get("Content-Length") or 0)
+                raw = self.rfile.read(length) if length else b""
+                body = json.loads(raw) if raw else {}
+                with stub._lock:
+                    stub.in_flight += 1
+                    stub.max_in_flight = max(stub.max_in_flight, stub.in_flight)
+                try:
+                    time.sleep(stub.delay)
+                    status, headers, payload = stub._answer(self.command, self.path, body)
+                finally:
+                    with stub._lock:
+                        stub.in_flight -= 1
+                data = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+            do_POST = do_PATCH = _handle
+
+            def log_message(self, *args) -> None:
+                pass
+
+        return Handler
@@ -0,0 +1,82 @@
+import scrap_zyda
+from conftest import make_orders
+
+
+def test_batches_are_posted_in_chunks(api):
+    stats = scrap_zyda.sync_orders(make_orders(5), batch_size=2)
+
+    assert [len(body["orders"]) for body in api.calls("POST", "/batch")] == [2, 2, 1]
+    assert api.calls("POST", "/orders") == []
+    assert stats["created"] == 5
+    assert stats["failed"] == 0
+
+
+def test_batch_results_are_counted_per_order(api):
+    api.orders["#K1"] = {}
+
+    stats = scrap_zyda.sync_orders(make_orders(3), batch_size=3)
+
+    assert (stats["created"], stats["skipped"]) == (2, 1)
+
+
+def test_missing_bulk_endpoint_falls_back_to_single_posts(api):
+    api.batch_status = 404
+
+    stats = scrap_zyda.sync_orders(make_orders(3), batch_size=2)
+
+    assert len(api.calls("POST", "/batch")) == 1
+    assert [body["zyda_order_key"] for body in api.calls("POST", "/orders")] == ["#K0", "#K1", "#K2"]
+    assert stats["created"] == 3
+    assert scrap_zyda._batch_endpoint_missing is True
+
+    # Later syncs go straight to single POSTs
+    scrap_zyda.sync_orders(make_orders(1, prefix="L"), batch_size=2)
+    assert len(api.calls("POST", "/batch")) == 1
+
+
+def test_failed_batch_is_resent_one_by_one(api):
+    api.batch_status = 500
+
+    stats = scrap_zyda.sync_orders(make_orders(2), batch_size=2)
+
+    assert len(api.calls("POST", "/orders")) == 2
+    assert stats["created"] == 2
+    assert scrap_zyda._batch_endpoint_missing is False
+
+
+def test_scraped_orders_reach_the_bulk_endpoint(api, monkeypatch):
+    monkeypatch.setattr(scrap_zyda, "BATCH_SIZE", 2)
+    monkeypatch.setattr(scrap_zyda, "DELIVERY_QUEUE_SIZE", 0)
+    orders = [dict(order, items=[]) for order in make_orders(5)]
+    order_stats = {"created": 0, "updated": 0, "skipped": 0, "failed": 0, "suppressed": 0}
+
+    # What _scrape_order_cards does with each extracted card
+    pipeline = scrap_zyda._open_delivery_pipeline()
+    assert pipeline is not None
+    try:
+        for idx, order in enumerate(orders, 1):
+            pipeline.submit(order, idx, len(orders), order_stats)
+    finally:
+        pipeline.close()
+    stats = scrap_zyda.sync_orders(orders)
+
+    assert [len(body["orders"]) for body in api.calls("POST", "/batch")] == [2, 2, 1]
+    assert api.calls("POST", "/orders") == []
+    assert order_stats["created"] == 5
+    assert (stats["created"], stats["failed"]) == (5, 0)
+
+
+def test_scraped_orders_fall_back_to_single_posts(api, monkeypatch):
+    monkeypatch.setattr(scrap_zyda, "BATCH_SIZE", 3)
+    api.batch_status = 404
+    orders = [dict(order, items=[]) for order in make_orders(3)]
+    order_stats = {"created": 0, "updated": 0, "skipped": 0, "failed": 0, "suppressed": 0}
+
+    pipeline = scrap_zyda._open_delivery_pipeline()
+    for idx, order in enumerate(orders, 1):
+        pipeline.submit(order, idx, len(orders), order_stats)
+    pipeline.close()
+    scrap_zyda.sync_orders(orders)
+
+    assert [body["zyda_order_key"] for body in api.calls("POST", "/orders")] == ["#K0", "#K1", "#K2"]
+    assert order_stats["created"] == 3
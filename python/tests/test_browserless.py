@@ -0,0 +1,79 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import scrap_zyda
+
+DASHBOARD_ORDERS = {
+    "AB12-CD34": {"number": "AB12-CD34", "customerName": "Customer A", "phone": "0500000001", "total": 10},
+    "EF56-GH78": {"number": "EF56-GH78", "customerName": "Customer B", "phone": "0500000002", "total": 12},
+}
+
+
+@pytest.fixture
+def dashboard(api, monkeypatch, tmp_path):
+    """A fake Zyda dashboard API: a summary list at /orders and full orders at /order/<number>."""
+    requested = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            requested.append(self.path)
+            if self.path == "/orders":
+                status, body = 200, {"data": [{"number": n} for n in DASHBOARD_ORDERS]}
+            elif self.path.startswith("/order/") and self.path[7:] in DASHBOARD_ORDERS:
+                status, body = 200, {"order": DASHBOARD_ORDERS[self.path[7:]]}
+            else:
+                status, body = 404, {"message": "not found"}
+            data = json.dumps(body).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    monkeypatch.setattr(scrap_zyda, "API_REQUESTS_FILE", str(tmp_path / "api_requests.json"))
+    monkeypatch.setattr(scrap_zyda, "load_session_cookies", lambda: [{"name": "s", "value": "v", "domain": "127.0.0.1"}])
+    yield f"http://127.0.0.1:{server.server_port}", requested
+    server.shutdown()
+    server.server_close()
+
+
+def test_detail_requests_are_recorded_as_one_template(dashboard):
+    base, _ = dashboard
+    scrap_zyda._record_api_request({"url": base + "/orders"}, ["AB12-CD34", "EF56-GH78"])
+    scrap_zyda._record_api_request({"url": base + "/order/AB12-CD34"}, ["AB12-CD34"])
+    scrap_zyda._record_api_request({"url": base + "/order/EF56-GH78"}, ["EF56-GH78"])
+
+    recorded = scrap_zyda.load_api_requests()
+
+    assert [(r["kind"], r["url"]) for r in recorded] == [
+        ("list", base + "/orders"),
+        ("detail", base + "/order/{order_key}"),
+    ]
+
+
+def test_browserless_fetches_details_for_listed_orders_only(dashboard):
+    base, requested = dashboard
+    with open(scrap_zyda.API_REQUESTS_FILE, "w", encoding="utf-8") as fp:
+        json.dump(
+            [
+                {"method": "GET", "url": base + "/orders"},
+                {"method": "GET", "url": base + "/order/ZZ99-ZZ99"},
+                {"method": "GET", "url": base + "/gone"},
+            ],
+            fp,
+        )
+    scrap_zyda._record_api_request({"url": base + "/order/AB12-CD34"}, ["AB12-CD34"])
+
+    orders = scrap_zyda.fetch_orders_browserless()
+
+    assert sorted(order["zyda_order_key"] for order in orders) == ["#AB12-CD34", "#EF56-GH78"]
+    assert "/order/ZZ99-ZZ99" not in requested
+    assert [r["url"] for r in scrap_zyda.load_api_requests()] == [base + "/orders", base + "/order/{order_key}"]
@@ -0,0 +1,77 @@
+import time
+
+import pytest
+
+import scrap_zyda
+from conftest import make_orders
+
+
+@pytest.fixture
+def breaker(api, monkeypatch):
+    monkeypatch.setattr(scrap_zyda, "BREAKER_FAILURE_THRESHOLD", 2)
+    monkeypatch.setattr(scrap_zyda, "BREAKER_COOLDOWN_SECONDS", 0.2)
+    client = scrap_zyda.ApiClient()
+    monkeypatch.setattr(scrap_zyda, "api_client", client)
+    yield client.breaker
+    client.close()
+
+
+def test_gateway_error_is_not_retried_in_place(api, breaker):
+    api.responses.append((503, {"Retry-After": "3"}, {}))
+
+    started = time.monotonic()
+    response = scrap_zyda.api_client.post(api.endpoint, json={})
+
+    assert response.status_code == 503
+    assert time.monotonic() - started < 1
+    assert len(api.requests) == 1
+    assert breaker.failures == 1
+
+
+def test_circuit_opens_after_consecutive_failures_and_fails_fast(api, breaker):
+    api.responses.extend([(503, {}, {}), (503, {}, {})])
+    orders = make_orders(3)
+
+    results = [scrap_zyda._sync_single_order(idx, 3, order)[0] for idx, order in enumerate(orders, 1)]
+
+    assert results == ["failed", "failed", "failed"]
+    assert len(api.requests) == 2
+    assert breaker.state == "open"
+    assert scrap_zyda.api_client.breaker.describe() == "open/1"
+
+
+def test_429_opens_the_circuit_for_retry_after(api, breaker):
+    api.responses.append((429, {"Retry-After": "30"}, {}))
+
+    scrap_zyda.api_client.post(api.endpoint, json={})
+
+    assert breaker.state == "open"
+    assert 25 < breaker.retry_at - time.time() <= 30
+
+
+def test_half_open_probe_closes_the_circuit(api, breaker):
+    api.responses.extend([(503, {}, {}), (503, {}, {})])
+    scrap_zyda.api_client.post(api.endpoint, json={})
+    scrap_zyda.api_client.post(api.endpoint, json={})
+    assert breaker.state == "open"
+
+    time.sleep(0.25)
+    response = scrap_zyda.api_client.post(api.endpoint, json={"zyda_order_key": "#P"})
+
+    assert response.status_code == 200
+    assert breaker.state == "closed"
+
+
+def test_unexpected_error_does_not_leave_a_probe_in_flight(api, breaker, monkeypatch):
+    breaker.state = "open"
+    breaker.retry_at = time.time() - 1
+
+    def explode(*args, **kwargs):
+        raise ValueError("boom")
+
+    monkeypatch.setattr(scrap_zyda.api_client.session, "request", explode)
+    with pytest.raises(ValueError):
+        scrap_zyda.api_client.post(api.endpoint, json={})
+
+    assert breaker.state == "open"
+    assert breaker._probing is False
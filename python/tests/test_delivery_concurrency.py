@@ -0,0 +1,41 @@
+import scrap_zyda
+from conftest import make_orders
+
+
+def _deliver_through_pipeline(orders):
+    order_stats = {"created": 0, "updated": 0, "skipped": 0, "failed": 0, "suppressed": 0}
+    pipeline = scrap_zyda._open_delivery_pipeline()
+    assert pipeline is not None
+    try:
+        for idx, order in enumerate(orders, 1):
+            pipeline.submit(order, idx, len(orders), order_stats)
+    finally:
+        pipeline.close()
+    return order_stats
+
+
+def test_scraped_orders_are_sent_with_up_to_sync_concurrency_in_flight(api, monkeypatch):
+    monkeypatch.setattr(scrap_zyda, "SYNC_CONCURRENCY", 3)
+    api.delay = 0.2
+    orders = [dict(order, items=[]) for order in make_orders(6)]
+
+    order_stats = _deliver_through_pipeline(orders)
+    stats = scrap_zyda.sync_orders(orders)
+
+    assert api.max_in_flight == 3
+    assert len(api.calls("POST")) == 6
+    assert order_stats["created"] == 6
+    assert (stats["created"], stats["failed"]) == (6, 0)
+
+
+def test_concurrent_senders_deliver_bulk_chunks(api, monkeypatch):
+    monkeypatch.setattr(scrap_zyda, "SYNC_CONCURRENCY", 2)
+    monkeypatch.setattr(scrap_zyda, "BATCH_SIZE", 2)
+    api.delay = 0.2
+    orders = [dict(order, items=[]) for order in make_orders(4)]
+
+    order_stats = _deliver_through_pipeline(orders)
+
+    assert api.max_in_flight == 2
+    assert [len(body["orders"]) for body in api.calls("POST", "/batch")] == [2, 2]
+    assert order_stats["created"] == 4
@@ -0,0 +1,13 @@
+import scrap_zyda
+from conftest import make_orders
+
+
+def test_orders_sent_during_scraping_are_not_posted_again(api):
+    orders = make_orders(3)
+    scrap_zyda.delivery_coordinator.record("#K0", "created")
+    scrap_zyda.delivery_coordinator.record("#K1", "failed")
+
+    stats = scrap_zyda.sync_orders(orders)
+
+    assert [body["zyda_order_key"] for body in api.calls("POST", "/orders")] == ["#K2"]
+    assert (stats["created"], stats["failed"]) == (2, 1)
@@ -0,0 +1,87 @@
+import json
+import os
+import shutil
+import subprocess
+import sys
+
+import pytest
+
+pytest.importorskip("lxml")
+pytest.importorskip("cssselect")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import scrap_zyda  # noqa: E402
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+
+def _fixture(name: str) -> str:
+    with open(os.path.join(FIXTURES, name), "r", encoding="utf-8") as fp:
+        return fp.read()
+
+
+def _js_fingerprints(texts):
+    """Run CARD_LIST_SCRIPT in node over fake cards whose innerText is each of ``texts``."""
+    cards = [
+        {"innerText": text, "id": "", "parentElement": None}
+        for text in texts
+    ]
+    program = (
+        "var cards = JSON.parse(process.argv[1]).map(function (card) {"
+        "  card.querySelector = function () { return null; };"
+        "  card.querySelectorAll = function () { return []; };"
+        "  card.getAttribute = function () { return null; };"
+        "  return card;"
+        "});"
+        "function run() {" + scrap_zyda.CARD_LIST_SCRIPT + "}"
+        "console.log(JSON.stringify(run(cards).map(function (row) { return row.fingerprint; })));"
+    )
+    output = subprocess.run(
+        ["node", "-e", program, json.dumps(cards)], check=True, capture_output=True, text=True
+    ).stdout
+    return json.loads(output)
+
+
+def test_cards_are_parsed_with_label_and_key():
+    cards = scrap_zyda.parse_order_cards_html(_fixture("order_cards.html"))
+
+    assert [(card["index"], card["label"], card["key"]) for card in cards] == [
+        (0, "Ahmed Ali", "#A1B2C3"),
+        (1, "Sara", "ORD-77"),
+    ]
+
+
+def test_card_fingerprint_ignores_elapsed_time():
+    page = _fixture("order_cards.html")
+    later = page.replace("5 mins ago", "12 mins ago").replace("1 hour", "2 hours")
+
+    before = [card["fingerprint"] for card in scrap_zyda.parse_order_cards_html(page)]
+    after = [card["fingerprint"] for card in scrap_zyda.parse_order_cards_html(later)]
+
+    assert before == after
+    assert before == ["059ec122", "02ef722c"]
+
+
+@pytest.mark.skipif(shutil.which("node") is None, reason="node is required to run CARD_LIST_SCRIPT")
+def test_card_fingerprint_matches_card_list_script():
+    texts = [
+        "Ahmed Ali\n#A1B2C3\n5 mins ago\nDelivery\n86.50 SAR",
+        "سارة\nمنذ 3 دقائق\nاستلام",
+        "Sara\nPickup\njust now",
+    ]
+    stable = [" ".join(scrap_zyda.VOLATILE_TEXT_PATTERN.sub("", text).split()) for text in texts]
+
+    assert [scrap_zyda._html_fingerprint(text) for text in stable] == _js_fingerprints(texts)
+
+
+def test_order_details_are_parsed():
+    details = scrap_zyda.parse_order_details_html(_fixture("order_details.html"))
+
+    assert details["phone"] == "+966500000001"
+    assert details["address"] == "King Fahd Rd, Riyadh"
+    assert details["total"] == "96.50 SAR"
+    assert details["items"] == [
+        {"quantity": "2x", "name": "Chicken Shawarma", "price": 37.0},
+        {"quantity": "1x", "name": "Fries", "price": 12.5},
+    ]
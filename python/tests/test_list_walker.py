@@ -0,0 +1,55 @@
+import scrap_zyda
+
+
+class FakeListDriver:
+    """Orders list of ``cards`` (key or None, fingerprint) with a viewport of ``view`` cards."""
+
+    def __init__(self, cards, view):
+        self.cards = cards
+        self.view = view
+        self.top = 0
+
+    def execute_script(self, script, *args):
+        if script is scrap_zyda.LIST_SCROLL_SCRIPT:
+            before = self.top
+            self.top = min(self.top + self.view, max(len(self.cards) - self.view, 0))
+            return self.top > before
+        rendered = self.cards[self.top:self.top + self.view]
+        return [
+            {"index": index, "label": f"Card {index}", "key": key, "fingerprint": fingerprint, "element": None}
+            for index, (key, fingerprint) in enumerate(rendered)
+        ]
+
+
+def _walk(driver, steps=100, reload_after=None):
+    walker = scrap_zyda.OrderListWalker(driver)
+    keys = []
+    for step in range(steps):
+        row = walker.next_card()
+        if row is None:
+            break
+        keys.append(row["key"])
+        walker.invalidate()
+        if step + 1 == reload_after:
+            driver.top = 0
+    return walker, keys
+
+
+def test_walker_returns_to_unvisited_cards_after_a_reload(monkeypatch):
+    monkeypatch.setattr(scrap_zyda, "_wait_for_dom", lambda *args, **kwargs: None)
+    driver = FakeListDriver([(f"#K{i}", f"f{i}") for i in range(20)], view=3)
+
+    walker, keys = _walk(driver, reload_after=8)
+
+    assert len(set(keys)) == 20
+    assert walker.exhausted
+
+
+def test_keyless_cards_are_visited_once(monkeypatch):
+    monkeypatch.setattr(scrap_zyda, "_wait_for_dom", lambda *args, **kwargs: None)
+    driver = FakeListDriver([("#AAAA-1111", "f0"), (None, "f1"), (None, "f1"), ("#BBBB-2222", "f3")], view=4)
+
+    walker, keys = _walk(driver, steps=10)
+
+    assert keys == ["#AAAA-1111", "zyda_f1_1", "zyda_f1_2", "#BBBB-2222"]
+    assert walker.exhausted
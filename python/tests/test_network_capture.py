@@ -0,0 +1,20 @@
+import scrap_zyda
+
+
+class FakeDriver:
+    def get_log(self, name):
+        return []
+
+
+def test_new_cycle_forgets_captured_orders(monkeypatch):
+    monkeypatch.setattr(scrap_zyda, "EXTRACTION_MODE", "network")
+    driver = FakeDriver()
+    capture = scrap_zyda.NetworkCapture()
+    capture.drain(driver)
+    capture.index({"data": [{"number": "#AB12-CD34", "phone": "0500000000"}]})
+    assert capture.orders
+
+    scrap_zyda._start_capture_cycle(driver)
+
+    assert capture.orders == {}
+    assert scrap_zyda._captured_details(driver, "#AB12-CD34") is None
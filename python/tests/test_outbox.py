@@ -0,0 +1,100 @@
+import sqlite3
+
+import requests
+
+import scrap_zyda
+from conftest import make_orders
+
+
+def _response(status):
+    response = requests.Response()
+    response.status_code = status
+    return response
+
+
+def test_newer_payload_supersedes_pending_one(tmp_path):
+    outbox = scrap_zyda.OrderOutbox(str(tmp_path / "outbox.sqlite3"))
+    v1 = {"zyda_order_key": "#K1", "phone": "0500000000", "total_amount": 10}
+    v2 = dict(v1, total_amount=12)
+
+    key1 = outbox.enqueue(v1)
+    outbox.mark_failed(key1, "HTTP 503")
+    key2 = outbox.enqueue(v2)
+    outbox.record_response(key2, _response(200))
+
+    assert outbox.due(force=True) == []
+    assert outbox.pending_count() == 0
+    outbox.close()
+
+
+def test_reverted_payload_is_pending_again(tmp_path):
+    outbox = scrap_zyda.OrderOutbox(str(tmp_path / "outbox.sqlite3"))
+    v1 = {"zyda_order_key": "#K1", "phone": "0500000000", "total_amount": 10}
+    v2 = dict(v1, total_amount=12)
+
+    key1 = outbox.enqueue(v1)
+    outbox.enqueue(v2)
+    outbox.enqueue(v1)
+
+    assert [key for key, _ in outbox.due(force=True)] == [key1]
+    outbox.close()
+
+
+def _open_outbox(tmp_path, monkeypatch):
+    box = scrap_zyda.OrderOutbox(str(tmp_path / "outbox.sqlite3"))
+    monkeypatch.setattr(scrap_zyda, "outbox", box)
+    return box
+
+
+def test_drained_order_is_not_sent_again_by_the_scrape(api, tmp_path, monkeypatch):
+    monkeypatch.setattr(scrap_zyda, "SEEN_ORDERS_FILE", str(tmp_path / "seen.json"))
+    monkeypatch.setattr(scrap_zyda, "seen_orders", scrap_zyda.SeenOrderIndex.load())
+    box = _open_outbox(tmp_path, monkeypatch)
+    order = dict(scrap_zyda._build_api_payload(make_orders(1)[0]))
+    key = box.enqueue(order)
+    box.mark_failed(key, "HTTP 503")
+
+    box.drain(force=True)
+    order_stats = {"created": 0, "updated": 0, "skipped": 0, "failed": 0, "suppressed": 0}
+    scrap_zyda._deliver_scraped_order(order, 1, 1, order_stats)
+    stats = scrap_zyda.sync_orders([order])
+
+    assert len(api.calls("POST", "/orders")) == 1
+    assert order_stats["created"] == 1
+    assert stats["created"] == 1
+    assert scrap_zyda.seen_orders.snapshot("#K0") == order
+    box.close()
+
+
+def test_order_backing_off_in_the_outbox_is_left_alone(api, tmp_path, monkeypatch):
+    box = _open_outbox(tmp_path, monkeypatch)
+    order = dict(scrap_zyda._build_api_payload(make_orders(1)[0]))
+    box.mark_failed(box.enqueue(order), "HTTP 503")
+
+    order_stats = {"created": 0, "updated": 0, "skipped": 0, "failed": 0, "suppressed": 0}
+    scrap_zyda._deliver_scraped_order(order, 1, 1, order_stats)
+
+    assert api.calls("POST") == []
+    assert order_stats["failed"] == 1
+    box.close()
+
+
+def test_outbox_key_column_is_migrated(tmp_path):
+    path = str(tmp_path / "outbox.sqlite3")
+    db = sqlite3.connect(path)
+    db.execute(
+        "CREATE TABLE outbox (idempotency_key TEXT PRIMARY KEY, zyda_order_key TEXT, payload TEXT NOT NULL, "
+        "status TEXT NOT NULL DEFAULT 'pending', attempts INTEGER NOT NULL DEFAULT 0, next_attempt_at REAL NOT NULL, "
+        "last_error TEXT, created_at REAL NOT NULL, updated_at REAL NOT NULL)"
+    )
+    db.execute(
+        "INSERT INTO outbox (idempotency_key, zyda_order_key, payload, next_attempt_at, created_at, updated_at) "
+        "VALUES ('abc', '#K1', '{}', 0, 0, 0)"
+    )
+    db.commit()
+    db.close()
+
+    box = scrap_zyda.OrderOutbox(path)
+
+    assert box.due(force=True) == [("abc", "{}")]
+    box.close()
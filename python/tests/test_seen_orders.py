@@ -0,0 +1,36 @@
+import json
+import os
+import time
+
+import scrap_zyda
+from conftest import make_orders
+
+
+def test_prune_evicts_expired_entries_and_old_snapshots(tmp_path):
+    digest_ttl = scrap_zyda.DIGEST_TTL_SECONDS
+    index = scrap_zyda.SeenOrderIndex(str(tmp_path / "seen.json"), ttl_seconds=digest_ttl * 2)
+    now = time.time()
+    index.entries = {
+        "#OLD": {"payload_hash": "a", "payload": {}, "synced_at": now - digest_ttl * 3},
+        "#AGED": {"payload_hash": "b", "payload": {}, "synced_at": now - digest_ttl - 1},
+        "#NEW": {"payload_hash": "c", "payload": {}, "synced_at": now},
+    }
+
+    assert index.prune() == 1
+    assert sorted(index.entries) == ["#AGED", "#NEW"]
+    assert "payload" not in index.entries["#AGED"]
+    assert "payload" in index.entries["#NEW"]
+
+
+def test_deliveries_are_written_at_most_once_per_interval(tmp_path, monkeypatch):
+    monkeypatch.setattr(scrap_zyda, "SEEN_ORDERS_SAVE_INTERVAL_SECONDS", 3600)
+    path = str(tmp_path / "seen.json")
+    index = scrap_zyda.SeenOrderIndex(path)
+
+    for order in make_orders(3):
+        index.mark_synced(order["zyda_order_key"], order)
+    assert not os.path.exists(path)
+
+    index.flush()
+    with open(path, encoding="utf-8") as fp:
+        assert sorted(json.load(fp)) == ["#K0", "#K1", "#K2"]
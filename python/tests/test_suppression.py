@@ -0,0 +1,48 @@
+import scrap_zyda
+from conftest import make_orders
+
+
+def _index(tmp_path, monkeypatch):
+    monkeypatch.setattr(scrap_zyda, "SEEN_ORDERS_FILE", str(tmp_path / "seen.json"))
+    index = scrap_zyda.SeenOrderIndex.load()
+    monkeypatch.setattr(scrap_zyda, "seen_orders", index)
+    return index
+
+
+def test_converted_unchanged_order_is_suppressed(api, tmp_path, monkeypatch):
+    index = _index(tmp_path, monkeypatch)
+    order = make_orders(1)[0]
+    index.note_response(order["zyda_order_key"], {"pending_location": False})
+    index.mark_synced(order["zyda_order_key"], order)
+
+    assert scrap_zyda._sync_single_order(1, 1, order) == ("suppressed", False)
+    assert api.calls("POST", "/orders") == []
+
+
+def test_order_pending_a_location_is_posted_again(api, tmp_path, monkeypatch):
+    index = _index(tmp_path, monkeypatch)
+    order = make_orders(1)[0]
+    index.note_response(order["zyda_order_key"], {"pending_location": True})
+    index.mark_synced(order["zyda_order_key"], order)
+
+    operation, responded = scrap_zyda._sync_single_order(1, 1, order)
+
+    assert responded
+    assert len(api.calls("POST", "/orders")) == 1
+
+
+def test_suppressed_order_keeps_the_new_card_fingerprint(api, tmp_path, monkeypatch):
+    index = _index(tmp_path, monkeypatch)
+    order = make_orders(1)[0]
+    key = order["zyda_order_key"]
+    index.observe(key, "old")
+    index.note_response(key, {"pending_location": False})
+    index.mark_synced(key, order)
+    synced_at = index.entries[key]["synced_at"]
+
+    index.observe(key, "new")
+    assert scrap_zyda._sync_single_order(1, 1, order)[0] == "suppressed"
+
+    assert index.entries[key]["fingerprint"] == "new"
+    assert index.entries[key]["synced_at"] == synced_at
+    assert index.is_unchanged(key, "new")
@@ -155,7 +155,9 @@
 Route::post('/mobile/payment/checkout-url', [MobileAppController::class, 'getPaymentCheckoutUrl']);
 Route::get('/mobile/orders', [MobileAppController::class, 'getUserOrders']);
 Route::post('/zyda/orders', [ZydaOrderController::class, 'store']);
+Route::post('/zyda/orders/batch', [ZydaOrderController::class, 'storeBatch']);
 Route::patch('/zyda/orders/{id}/location', [ZydaOrderController::class, 'updateLocation']);
+Route::patch('/zyda/orders/{zydaOrderKey}', [ZydaOrderController::class, 'updateDelta']);
 Route::post('/zyda/orders/calculate-nearest-branch', [ZydaOrderController::class, 'calculateNearestBranch']);
 Route::delete('/zyda/orders/{id}', [ZydaOrderController::class, 'destroy']);
 
@@ -0,0 +1,79 @@
+<?php
+
+namespace Tests\Feature;
+
+use App\Services\OrderSyncService;
+use Illuminate\Foundation\Testing\RefreshDatabase;
+use Mockery\MockInterface;
+use Tests\TestCase;
+
+class ZydaOrderBatchTest extends TestCase
+{
+    use RefreshDatabase;
+
+    protected function order(string $key, array $overrides = []): array
+    {
+        return array_merge([
+            'name' => 'Customer',
+            'phone' => '0500000000',
+            'address' => 'Riyadh',
+            'total_amount' => 25,
+            'items' => [['quantity' => '1x', 'name' => 'Shawarma', 'price' => 25]],
+            'zyda_order_key' => $key,
+        ], $overrides);
+    }
+
+    public function test_batch_returns_one_result_per_order_in_request_order()
+    {
+        $this->mock(OrderSyncService::class, function (MockInterface $mock) {
+            $mock->shouldReceive('saveScrapedOrder')->twice()->andReturn(true);
+        });
+
+        $response = $this->postJson('/api/zyda/orders/batch', [
+            'orders' => [$this->order('#A1'), $this->order('#B2')],
+        ]);
+
+        $response->assertOk()
+            ->assertJsonPath('success', true)
+            ->assertJsonCount(2, 'results')
+            ->assertJsonPath('results.0.zyda_order_key', '#A1')
+            ->assertJsonPath('results.0.operation', 'created')
+            ->assertJsonPath('results.0.pending_location', true)
+            ->assertJsonPath('results.1.zyda_order_key', '#B2')
+            ->assertJsonPath('results.1.operation', 'created');
+    }
+
+    public function test_invalid_order_fails_without_failing_the_batch()
+    {
+        $this->mock(OrderSyncService::class, function (MockInterface $mock) {
+            $mock->shouldReceive('saveScrapedOrder')->once()->andReturn(true);
+        });
+
+        $response = $this->postJson('/api/zyda/orders/batch', [
+            'orders' => [$this->order('#A1', ['phone' => null]), $this->order('#B2')],
+        ]);
+
+        $response->assertOk()
+            ->assertJsonPath('results.0.operation', 'failed')
+            ->assertJsonPath('results.1.operation', 'created');
+    }
+
+    public function test_failed_save_is_reported_as_failed()
+    {
+        $this->mock(OrderSyncService::class, function (MockInterface $mock) {
+            $mock->shouldReceive('saveScrapedOrder')->once()->andReturn(false);
+        });
+
+        $response = $this->postJson('/api/zyda/orders/batch', [
+            'orders' => [$this->order('#A1')],
+        ]);
+
+        $response->assertOk()->assertJsonPath('results.0.operation', 'failed');
+    }
+
+    public function test_empty_batch_is_rejected()
+    {
+        $this->postJson('/api/zyda/orders/batch', ['orders' => []])
+            ->assertStatus(422);
+    }
+}
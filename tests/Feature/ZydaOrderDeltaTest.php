@@ -0,0 +1,86 @@
+<?php
+
+namespace Tests\Feature;
+
+use App\Services\OrderSyncService;
+use Illuminate\Foundation\Testing\RefreshDatabase;
+use Illuminate\Support\Facades\DB;
+use Mockery;
+use Mockery\MockInterface;
+use Tests\TestCase;
+
+class ZydaOrderDeltaTest extends TestCase
+{
+    use RefreshDatabase;
+
+    protected function createZydaOrder(string $key): int
+    {
+        return DB::table('zyda_orders')->insertGetId([
+            'zyda_order_key' => $key,
+            'name' => 'Customer',
+            'phone' => '0500000000',
+            'address' => 'Riyadh',
+            'total_amount' => 25,
+            'items' => json_encode([['quantity' => '1x', 'name' => 'Shawarma', 'price' => 25]]),
+            'created_at' => now(),
+            'updated_at' => now(),
+        ]);
+    }
+
+    public function test_unknown_order_answers_not_found()
+    {
+        $this->mock(OrderSyncService::class, function (MockInterface $mock) {
+            $mock->shouldNotReceive('updateScrapedOrder');
+        });
+
+        $this->patchJson('/api/zyda/orders/UNKNOWN', ['total_amount' => 30])
+            ->assertNotFound()
+            ->assertJsonPath('operation', 'failed');
+    }
+
+    public function test_delta_is_applied_through_the_order_sync_service()
+    {
+        $this->createZydaOrder('A1');
+        $this->mock(OrderSyncService::class, function (MockInterface $mock) {
+            $mock->shouldReceive('updateScrapedOrder')
+                ->once()
+                ->with('A1', ['total_amount' => 30])
+                ->andReturn(true);
+        });
+
+        $this->patchJson('/api/zyda/orders/' . rawurlencode('#A1'), ['total_amount' => 30])
+            ->assertOk()
+            ->assertJsonPath('operation', 'updated')
+            ->assertJsonPath('pending_location', true);
+    }
+
+    public function test_service_writes_only_changed_columns_and_runs_the_location_flow()
+    {
+        $this->createZydaOrder('A1');
+        $service = $this->partialMock(OrderSyncService::class, function (MockInterface $mock) {
+            $mock->shouldReceive('saveScrapedOrder')
+                ->once()
+                ->with(Mockery::on(function (array $order) {
+                    return $order['zyda_order_key'] === 'A1'
+                        && $order['phone'] === '0500000000'
+                        && $order['name'] === 'Customer';
+                }))
+                ->andReturn(true);
+        });
+
+        $this->assertTrue($service->updateScrapedOrder('#A1', [
+            'total_amount' => 30,
+            'items' => [['quantity' => '2x', 'name' => 'Shawarma', 'price' => 15]],
+        ]));
+
+        $row = DB::table('zyda_orders')->where('zyda_order_key', 'A1')->first();
+        $this->assertEquals(30, (float) $row->total_amount);
+        $this->assertSame('2x', json_decode($row->items, true)[0]['quantity']);
+        $this->assertSame('Riyadh', $row->address);
+    }
+
+    public function test_service_reports_missing_order()
+    {
+        $this->assertFalse(app(OrderSyncService::class)->updateScrapedOrder('MISSING', ['name' => 'X']));
+    }
+}